@@ -17,8 +17,15 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
 
-from .models import City, Person, PersonsAdresses, PersonsContacts, PersonType
-from .utils import validate_cpf
+from .models import (
+    City,
+    Person,
+    PersonsAdresses,
+    PersonsContacts,
+    PersonType,
+    person_type_by_name,
+)
+from .utils import clean_cpf, validate_cpf
 from .serializers import (
     ClientListSerializer,
     ClientRegisterSerializer,
@@ -830,7 +837,7 @@ class ClientRegisterAPIView(APIView):
 
             validated_data = serializer.validated_data
             nome = validated_data.get("nome")
-            cpf = validated_data.get("cpf", "").replace(".", "").replace("-", "")
+            cpf = clean_cpf(validated_data.get("cpf"))
             email = validated_data.get("email", "")
             telefone = validated_data.get("telefone")
 
@@ -842,7 +849,7 @@ class ClientRegisterAPIView(APIView):
                 )
 
             # Verificar se cliente já existe
-            client_type, _ = PersonType.objects.get_or_create(type="CLIENTE")
+            client_type = person_type_by_name("CLIENTE")
             person, created = Person.objects.get_or_create(
                 cpf=cpf,
                 defaults={
@@ -975,7 +982,7 @@ class ClientSearchAPIView(APIView):
 
     def get(self, request):
         """Busca cliente por CPF"""
-        cpf = request.GET.get("cpf", "").replace(".", "").replace("-", "")
+        cpf = clean_cpf(request.GET.get("cpf"))
 
         if not cpf:
             return Response(
@@ -1505,7 +1512,7 @@ class ClientUpdateCPFAPIView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            new_cpf = (request.data.get("cpf", "") or "").replace(".", "").replace("-", "").strip()
+            new_cpf = clean_cpf(request.data.get("cpf"))
             if not validate_cpf(new_cpf):
                 return Response(
                     {"error": "CPF inválido. Verifique os dígitos."},
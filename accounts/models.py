@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.timezone import now
 
 
@@ -69,6 +71,30 @@ class PersonType(BaseModel):
         return self.type
 
 
+# Cache em processo type -> PersonType (tabela praticamente imutável)
+_person_type_cache = {}
+
+
+def person_type_by_name(type_name):
+    """PersonType pelo nome, criado se ainda não existir e cacheado no processo.
+
+    Só linhas lidas do banco entram no cache: uma criada aqui pode sumir se a
+    transação em volta der rollback, e o cache apontaria para um pk inexistente.
+    """
+    person_type = _person_type_cache.get(type_name)
+    if person_type is None:
+        person_type, created = PersonType.objects.get_or_create(type=type_name)
+        if not created:
+            _person_type_cache[type_name] = person_type
+    return person_type
+
+
+@receiver(post_save, sender=PersonType)
+@receiver(post_delete, sender=PersonType)
+def clear_person_type_cache(**kwargs):
+    _person_type_cache.clear()
+
+
 class Person(BaseModel):
     user = models.OneToOneField(User, on_delete=models.CASCADE, null=True, blank=True)
     name = models.CharField(max_length=255)
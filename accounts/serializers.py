@@ -38,6 +38,14 @@ class PersonSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 
+class PersonSummarySerializer(serializers.ModelSerializer):
+    """Pessoa resumida (sem contatos) para listagens."""
+
+    class Meta:
+        model = Person
+        fields = ["id", "name", "cpf"]
+
+
 @extend_schema_serializer(
     examples=[
         OpenApiExample(
@@ -1,3 +1,15 @@
+# Pontuação da máscara de CPF (000.000.000-00), removida numa única passada
+_CPF_PUNCTUATION = str.maketrans("", "", ".-")
+
+
+def clean_cpf(cpf) -> str:
+    """
+    Strips the CPF mask punctuation ('.' and '-') and surrounding whitespace.
+    None becomes an empty string.
+    """
+    return (cpf or "").translate(_CPF_PUNCTUATION).strip()
+
+
 def validate_cpf(cpf: str) -> bool:
     """
     Validates a Brazilian CPF using the check digit algorithm.
@@ -45,6 +45,20 @@ ON service_orders (devolucao_date, service_order_phase_id, data_devolvido);
 CREATE INDEX IF NOT EXISTS idx_so_event_phase
 ON service_orders (event_id, service_order_phase_id);
 
+-- Event detail: OS of one event ordered by -order_date
+CREATE INDEX IF NOT EXISTS idx_so_event_order_date
+ON service_orders (event_id, order_date DESC);
+
+-- Event detail: last update among the event's OS
+-- (MAX(COALESCE(date_updated, date_created)) per event)
+CREATE INDEX IF NOT EXISTS idx_so_event_last_update
+ON service_orders (event_id, (COALESCE(date_updated, date_created)) DESC);
+
+-- Open events list (EXISTS per event over non-canceled OS)
+CREATE INDEX IF NOT EXISTS idx_so_event_phase_active
+ON service_orders (event_id, service_order_phase_id)
+WHERE date_canceled IS NULL;
+
 -- ============================================================================
 -- TIER 3: SERVICE_ORDERS — Single field indexes (high-frequency lookups)
 -- ============================================================================
@@ -161,6 +175,41 @@ ON events (event_date);
 CREATE INDEX IF NOT EXISTS idx_phase_name
 ON service_control_serviceorderphase (name);
 
+-- ============================================================================
+-- TIER 11: TEXT SEARCH — `search` param of the phase listing (V2)
+-- Every icontains target gets a trigram index so ILIKE '%term%' can use an
+-- index probe instead of a sequential scan. person.name (renter, employee,
+-- attendant) and products.nome_produto are already covered above.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_person_cpf_trgm
+ON person USING gin (cpf gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_event_name_trgm
+ON events USING gin (name gin_trgm_ops);
+
+-- `search` of the event status list also matches the description
+CREATE INDEX IF NOT EXISTS idx_event_description_trgm
+ON events USING gin (description gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_contacts_phone_trgm
+ON persons_contacts USING gin (phone gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_contacts_email_trgm
+ON persons_contacts USING gin (email gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_temp_product_description_trgm
+ON temporary_products USING gin (description gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_temp_product_extras_trgm
+ON temporary_products USING gin (extras gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_temp_product_brand_trgm
+ON temporary_products USING gin (brand gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_product_marca_trgm
+ON products USING gin (marca gin_trgm_ops);
+
 -- ============================================================================
 -- IMPORTANT: Trigram indexes (gin_trgm_ops) require the pg_trgm extension.
 -- Uncomment and run the line below FIRST if you want text search indexes:
@@ -168,7 +217,8 @@ ON service_control_serviceorderphase (name);
 -- CREATE EXTENSION IF NOT EXISTS pg_trgm;
 --
 -- Then uncomment the trigram indexes above (idx_person_name_trgm,
--- idx_product_nome_trgm) for faster LIKE/ILIKE text searches.
+-- idx_product_nome_trgm and the TIER 11 *_trgm indexes) for faster
+-- LIKE/ILIKE text searches.
 -- If you don't need those, the rest of the file works without pg_trgm.
 -- ============================================================================
 
@@ -182,6 +232,7 @@ ON service_control_serviceorderphase (name);
 --   PersonsAdresses      -> persons_adresses
 --   Product              -> products
 --   Event                -> events
+--   TemporaryProduct     -> temporary_products
 --   City                 -> city
 --   PersonType           -> person_type
 -- ============================================================================
@@ -1,3 +1,6 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
@@ -32,3 +35,27 @@ class StandardResultsSetPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator do Django que guarda o total (count) no cache por
+    `count_timeout` segundos sob `cache_key`.
+
+    Evita repetir o COUNT(*) a cada navegação entre páginas com os mesmos
+    filtros. A chave deve identificar a consulta (fase + filtros); quem
+    chama é responsável por versioná-la quando os dados mudam.
+    """
+
+    def __init__(self, object_list, per_page, cache_key, count_timeout=60, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.count_timeout = count_timeout
+
+    @cached_property
+    def count(self):
+        count = cache.get(self.cache_key)
+        if count is None:
+            count = super().count
+            cache.set(self.cache_key, count, self.count_timeout)
+        return count
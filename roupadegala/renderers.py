@@ -0,0 +1,35 @@
+from decimal import Decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+
+# UTC como "Z" (igual ao DRF) e chaves não-string aceitas como no json padrão
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj):
+    """
+    Fallback do orjson para tipos que ele não serializa nativamente.
+
+    Decimal vira float, igual ao JSONEncoder do DRF, para que respostas
+    serializadas com orjson tenham o mesmo formato das demais.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderer JSON baseado em orjson, para endpoints com respostas grandes
+    (muitas datas/Decimal aninhados). Mesmo formato do JSONRenderer do DRF.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
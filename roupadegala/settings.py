@@ -122,6 +122,16 @@ DATABASES = {
     }
 }
 
+# Cache compartilhado entre os workers do gunicorn: tokens de versão das
+# listagens, respostas/contagens cacheadas e locks de throttle precisam ser
+# vistos por todos os processos (LocMemCache é por processo)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://redis:6379/1"),  # container do Redis
+    }
+}
+
 
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
@@ -26,6 +26,13 @@ class DisableMigrations:
 
 MIGRATION_MODULES = DisableMigrations()
 
+# Cache em memória: os testes rodam num único processo e sem Redis
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 # Speed up tests
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.MD5PasswordHasher",
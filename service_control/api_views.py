@@ -2,14 +2,20 @@
 Views API para o app service_control
 """
 
+import hashlib
+import heapq
 import logging
 import uuid
-from datetime import date, timedelta
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from decimal import Decimal
+from itertools import chain
 
 logger = logging.getLogger(__name__)
 
+from django.core.cache import cache
 from django.db import models, transaction
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf, Round
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
@@ -20,16 +26,29 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from accounts.models import City, Person, PersonsAdresses, PersonsContacts, PersonType
-from accounts.utils import validate_cpf
+from accounts.models import (
+    City,
+    Person,
+    PersonsAdresses,
+    PersonsContacts,
+    PersonType,
+    person_type_by_name,
+)
+from accounts.utils import clean_cpf, validate_cpf
 from products.models import TemporaryProduct
+from roupadegala.pagination import CachedCountPaginator
+from roupadegala.renderers import ORJSONRenderer
 
 from .models import (
+    DASHBOARD_FILTERS_KEY,
     Event,
     EventParticipant,
     ServiceOrder,
     ServiceOrderItem,
     ServiceOrderPhase,
+    event_list_version,
+    phase_by_name,
+    service_order_list_version,
 )
 from .serializers import (
     EventAddParticipantsSerializer,
@@ -44,6 +63,7 @@ from .serializers import (
     ServiceOrderClientSerializer,
     ServiceOrderDashboardResponseSerializer,
     ServiceOrderListByPhaseSerializer,
+    ServiceOrderListSerializer,
     ServiceOrderMarkPaidSerializer,
     ServiceOrderMarkRetrievedSerializer,
     ServiceOrderRefuseSerializer,
@@ -51,12 +71,13 @@ from .serializers import (
     ServiceOrderFinanceSummarySerializer,
     VirtualServiceOrderCreateSerializer,
 )
-from django.core.paginator import Paginator, EmptyPage
+from django.core.paginator import EmptyPage
 
 
 def _build_payment_entry(amount, forma_pagamento, tipo, data=None, motivo=None):
     """Build a payment_details entry with a stable UUID id and normalized timestamp.
 
+    `amount` may be a Decimal; it is stored as a JSON number (float) once, here.
     `data` accepts date, datetime, or ISO-format string; None defaults to now.
     Date-only inputs are anchored at 12:00 UTC so the day is unambiguous in any timezone.
     """
@@ -64,11 +85,10 @@ def _build_payment_entry(amount, forma_pagamento, tipo, data=None, motivo=None):
         ts = timezone.now().isoformat()
     elif isinstance(data, str):
         ts = data
-    elif hasattr(data, "isoformat"):
-        if hasattr(data, "hour"):
-            ts = data.isoformat()
-        else:
-            ts = f"{data.isoformat()}T12:00:00+00:00"
+    elif isinstance(data, datetime):
+        ts = data.isoformat()
+    elif isinstance(data, date):
+        ts = f"{data.isoformat()}T12:00:00+00:00"
     else:
         ts = str(data)
     entry = {
@@ -83,11 +103,47 @@ def _build_payment_entry(amount, forma_pagamento, tipo, data=None, motivo=None):
     return entry
 
 
+_ZERO = Decimal("0")
+_TWO_PLACES = Decimal("0.01")
+
+# Lançamentos aceitos pela OS virtual, na ordem em que entram em payment_details
+_VIRTUAL_PAYMENT_TYPES = ("sinal", "restante", "indenizacao", "estorno")
+
+
+def _as_date_iso(value):
+    """YYYY-MM-DD prefix of a date, datetime or ISO date string."""
+    return str(value)[:10]
+
+
+# Cidades quase não mudam: nome normalizado -> id fica no cache por 1h
+CITY_CACHE_TIMEOUT = 3600
+
+
+def _city_id_by_name(name):
+    """Id of the City matching `name` (case-insensitive), cached per normalized name.
+
+    Misses are not cached, so a city added later is found on the next call.
+    """
+    normalized = name.strip().upper()
+    # md5 do nome: chave sem espaços/acentos, válida em qualquer backend
+    key = "city:%s" % hashlib.md5(normalized.encode()).hexdigest()
+    city_id = cache.get(key)
+    if city_id is None:
+        city_id = (
+            City.objects.filter(name__iexact=normalized)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if city_id is not None:
+            cache.set(key, city_id, timeout=CITY_CACHE_TIMEOUT)
+    return city_id
+
+
 def _recompute_advance_payment(payment_details):
     """Return the net advance_payment from payment_details, treating estorno as negative."""
     if not isinstance(payment_details, list):
-        return Decimal("0")
-    total = Decimal("0")
+        return _ZERO
+    total = _ZERO
     for entry in payment_details:
         if not isinstance(entry, dict):
             continue
@@ -99,6 +155,216 @@ def _recompute_advance_payment(payment_details):
     return total
 
 
+def _temp_paleto_camisa_item(temp_product, item):
+    return {
+        "tipo": temp_product.product_type,
+        "cor": temp_product.color or "",
+        "extras": temp_product.extras or temp_product.description or "",
+        "venda": temp_product.venda or False,
+        "extensor": False,  # Extensor só para passante
+        "numero": temp_product.size or "",
+        "manga": temp_product.sleeve_length or "",
+        "marca": temp_product.brand or "",
+        "ajuste": item.adjustment_notes or "",
+    }
+
+
+def _temp_calca_item(temp_product, item):
+    return {
+        "tipo": temp_product.product_type,
+        "cor": temp_product.color or "",
+        "extras": temp_product.extras or temp_product.description or "",
+        "venda": temp_product.venda or False,
+        "extensor": False,
+        "numero": temp_product.size,
+        "cintura": temp_product.waist_size or "",
+        "perna": temp_product.leg_length or "",
+        "marca": temp_product.brand or "",
+        "ajuste_cintura": temp_product.ajuste_cintura or "",
+        "ajuste_comprimento": temp_product.ajuste_comprimento or "",
+    }
+
+
+def _temp_colete_item(temp_product, item):
+    return {
+        "tipo": temp_product.product_type,
+        "cor": temp_product.color or "",
+        "extras": temp_product.extras or temp_product.description or "",
+        "venda": temp_product.venda or False,
+        "extensor": False,
+        "marca": temp_product.brand or "",
+    }
+
+
+def _temp_accessory(temp_product):
+    return {
+        "tipo": temp_product.product_type,
+        "numero": temp_product.size or "",
+        "cor": temp_product.color or "",
+        "descricao": temp_product.description or "",
+        "marca": temp_product.brand or "",
+        "extensor": temp_product.extensor or False,
+        "venda": temp_product.venda or False,
+    }
+
+
+def _stock_paleto_camisa_item(product, item, tipo):
+    return {
+        "tipo": tipo,
+        "cor": product.cor or "",
+        "extras": product.nome_produto or "",
+        "venda": False,  # Produtos do estoque não são vendidos
+        "extensor": False,
+        "numero": str(product.tamanho) if product.tamanho else "",
+        "manga": "",
+        "marca": product.marca or "",
+        "ajuste": item.adjustment_notes or "",
+    }
+
+
+def _stock_calca_item(product, item, tipo):
+    return {
+        "tipo": tipo,
+        "cor": product.cor or "",
+        "extras": product.nome_produto or "",
+        "venda": False,
+        "extensor": False,
+        "numero": str(product.tamanho) if product.tamanho else "",
+        "cintura": "",
+        "perna": "",
+        "marca": product.marca or "",
+        "ajuste_cintura": "",
+        "ajuste_comprimento": "",
+    }
+
+
+def _stock_colete_item(product, item, tipo):
+    return {
+        "tipo": tipo,
+        "cor": product.cor or "",
+        "extras": product.nome_produto or "",
+        "venda": False,
+        "extensor": False,
+        "marca": product.marca or "",
+    }
+
+
+def _stock_accessory(product, tipo):
+    return {
+        "tipo": tipo,
+        "numero": str(product.tamanho) if product.tamanho else "",
+        "cor": product.cor or "",
+        "descricao": product.nome_produto or "",
+        "marca": product.marca or "",
+        "extensor": False,  # Produtos do estoque não têm extensor
+        "venda": False,
+    }
+
+
+# Roupas (itens) por tipo; qualquer outro tipo é acessório (lookup O(1)).
+# TemporaryProduct usa "calca", Product.tipo (lower) usa "calça"; o tipo do
+# estoque é normalizado uma vez no dispatch e repassado aos builders.
+_TEMP_ITEM_BUILDERS = {
+    "paleto": _temp_paleto_camisa_item,
+    "camisa": _temp_paleto_camisa_item,
+    "calca": _temp_calca_item,
+    "colete": _temp_colete_item,
+}
+_STOCK_ITEM_BUILDERS = {
+    "paleto": _stock_paleto_camisa_item,
+    "camisa": _stock_paleto_camisa_item,
+    "calça": _stock_calca_item,
+    "colete": _stock_colete_item,
+}
+
+
+def _serialize_item(item):
+    """("item" | "accessory", dict) of an order item; (None, None) without product."""
+    temp_product = item.temporary_product
+    if temp_product:
+        builder = _TEMP_ITEM_BUILDERS.get(temp_product.product_type)
+        if builder:
+            return "item", builder(temp_product, item)
+        return "accessory", _temp_accessory(temp_product)
+    product = item.product
+    if product:
+        tipo = product.tipo.lower()
+        builder = _STOCK_ITEM_BUILDERS.get(tipo)
+        if builder:
+            return "item", builder(product, item, tipo)
+        return "accessory", _stock_accessory(product, tipo)
+    return None, None
+
+
+def _split_order_items(items):
+    """Serialize the items of an order into the (itens, acessorios) lists."""
+    pairs = [_serialize_item(item) for item in items]
+    itens = [data for kind, data in pairs if kind == "item"]
+    acessorios = [data for kind, data in pairs if kind == "accessory"]
+    return itens, acessorios
+
+
+def _money(value):
+    """float of a Decimal amount, 0 when empty."""
+    return float(value) if value else 0
+
+
+def _build_ordem_servico(order, event_date):
+    """`ordem_servico` block of an order payload (V2 phase listing, by-client)."""
+    itens, acessorios = _split_order_items(order.items.all())
+    return {
+        "data_pedido": order.order_date,
+        "data_evento": event_date,
+        "data_retirada": order.retirada_date,
+        "data_devolucao": order.devolucao_date,
+        "modalidade": order.service_type or "Aluguel",
+        "itens": itens,
+        "acessorios": acessorios,
+        "pagamento": {
+            "total": _money(order.total_value),
+            "sinal": _money(order.advance_payment),
+            "restante": _money(order.remaining_payment),
+            "forma_pagamento": order.payment_method or "",
+        },
+    }
+
+
+# Colunas de ServiceOrderItem/TemporaryProduct/Product lidas pelos builders
+_ORDER_ITEM_FIELDS = (
+    "id",
+    "service_order_id",
+    "adjustment_notes",
+    "temporary_product__product_type",
+    "temporary_product__size",
+    "temporary_product__sleeve_length",
+    "temporary_product__leg_length",
+    "temporary_product__waist_size",
+    "temporary_product__color",
+    "temporary_product__brand",
+    "temporary_product__description",
+    "temporary_product__extras",
+    "temporary_product__extensor",
+    "temporary_product__venda",
+    "temporary_product__ajuste_cintura",
+    "temporary_product__ajuste_comprimento",
+    "product__tipo",
+    "product__cor",
+    "product__nome_produto",
+    "product__tamanho",
+    "product__marca",
+)
+
+
+def _order_items_prefetch():
+    """Prefetch of `items` loading only the columns the item builders read."""
+    return models.Prefetch(
+        "items",
+        queryset=ServiceOrderItem.objects.select_related(
+            "temporary_product", "product"
+        ).only(*_ORDER_ITEM_FIELDS),
+    )
+
+
 @extend_schema(
     tags=["service-orders"],
     summary="Criar ordem de serviço",
@@ -183,7 +449,7 @@ class ServiceOrderCreateAPIView(APIView):
                 "cliente": request.data.get("cliente_nome"),
                 "telefone": request.data.get("telefone"),
                 "email": request.data.get("email", ""),
-                "cpf": request.data.get("cpf", "").replace(".", "").replace("-", ""),
+                "cpf": clean_cpf(request.data.get("cpf")),
                 "atendente": request.data.get("atendente"),
                 "origem": request.data.get("origem"),
                 "data_evento": request.data.get("data_evento"),
@@ -228,7 +494,7 @@ class ServiceOrderCreateAPIView(APIView):
                     )
 
             # Buscar ou criar cliente
-            pt, _ = PersonType.objects.get_or_create(type="CLIENTE")
+            pt = person_type_by_name("CLIENTE")
             person, _ = Person.objects.get_or_create(
                 cpf=order_data["cpf"],
                 defaults={
@@ -292,9 +558,7 @@ class ServiceOrderCreateAPIView(APIView):
                     )
 
             # Buscar fase pendente
-            service_order_phase = ServiceOrderPhase.objects.filter(
-                name="PENDENTE"
-            ).first()
+            service_order_phase = phase_by_name("PENDENTE")
 
             # Criar ordem de serviço
             service_order = ServiceOrder.objects.create(
@@ -509,8 +773,7 @@ class ServiceOrderUpdateAPIView(APIView):
                 client_is_infant = is_infant or (current_renter and current_renter.is_infant)
 
                 # CPF é obrigatório no update da OS, exceto para clientes infant
-                cpf_raw = cliente_data.get("cpf", "") or ""
-                cpf_limpo = cpf_raw.replace(".", "").replace("-", "").strip()
+                cpf_limpo = clean_cpf(cliente_data.get("cpf"))
 
                 if not client_is_infant and (not cpf_limpo or not validate_cpf(cpf_limpo)):
                     return Response(
@@ -620,7 +883,7 @@ class ServiceOrderUpdateAPIView(APIView):
                         person = Person.objects.create(
                             cpf=cpf_limpo,
                             name=cliente_data.get("nome", "").upper(),
-                            person_type=PersonType.objects.get_or_create(type="CLIENTE")[0],
+                            person_type=person_type_by_name("CLIENTE"),
                             is_infant=is_infant,
                             created_by=request.user,
                         )
@@ -1010,8 +1273,7 @@ class ServiceOrderUpdateAPIView(APIView):
                 if cliente_data.get("nome"):
                     renter.name = cliente_data["nome"].upper()
                 # CPF — salvar sem validação algorítmica
-                cpf_raw = cliente_data.get("cpf", "") or ""
-                cpf_limpo = cpf_raw.replace(".", "").replace("-", "").strip()
+                cpf_limpo = clean_cpf(cliente_data.get("cpf"))
                 if cpf_limpo and not renter.cpf:
                     renter.cpf = cpf_limpo
                 if cliente_data.get("is_infant"):
@@ -1044,14 +1306,14 @@ class ServiceOrderUpdateAPIView(APIView):
                     cidade_nome = endereco.get("cidade", "").strip()
                     if cidade_nome:
                         try:
-                            city_obj = City.objects.filter(name__iexact=cidade_nome.upper()).first()
-                            if city_obj:
+                            city_id = _city_id_by_name(cidade_nome)
+                            if city_id:
                                 existing_addr = PersonsAdresses.objects.filter(
                                     person=renter,
                                     street=endereco.get("rua") or "",
                                     number=endereco.get("numero") or "",
                                     cep=endereco.get("cep") or "",
-                                    city=city_obj,
+                                    city_id=city_id,
                                 ).first()
                                 if not existing_addr:
                                     PersonsAdresses.objects.create(
@@ -1061,7 +1323,7 @@ class ServiceOrderUpdateAPIView(APIView):
                                         cep=endereco.get("cep") or "",
                                         neighborhood=endereco.get("bairro") or "",
                                         complemento=endereco.get("complemento") or "",
-                                        city=city_obj,
+                                        city_id=city_id,
                                         created_by=request.user,
                                     )
                         except Exception:
@@ -1095,16 +1357,16 @@ class ServiceOrderUpdateAPIView(APIView):
             required=False,
         )
     ],
-    responses={200: ServiceOrderSerializer(many=True)},
+    responses={200: ServiceOrderListSerializer(many=True)},
 )
 class ServiceOrderListAPIView(ListAPIView):
     permission_classes = [IsAuthenticated]
-    serializer_class = ServiceOrderSerializer
+    serializer_class = ServiceOrderListSerializer
 
     def get_queryset(self):
-        queryset = ServiceOrder.objects.select_related(
-            "renter", "employee", "attendant", "service_order_phase", "event"
-        ).prefetch_related("items")
+        queryset = ServiceOrderListSerializer.setup_eager_loading(
+            ServiceOrder.objects.all()
+        )
 
         # Filtros
         phase = self.request.GET.get("phase")
@@ -1139,7 +1401,7 @@ class ServiceOrderDetailAPIView(APIView):
                     "renter__person_type",
                     "event",
                 )
-                .prefetch_related("items__temporary_product", "items__product")
+                .prefetch_related(_order_items_prefetch())
                 .get(id=order_id)
             )
 
@@ -1181,12 +1443,17 @@ class ServiceOrderDetailAPIView(APIView):
             # Endereços do cliente (apenas o mais recente)
             address = (
                 order.renter.personsadresses_set.filter(date_created__isnull=False)
+                .select_related("city")
                 .order_by("-date_created", "-id")
                 .first()
             )
             if not address:
                 # Se não houver endereço com date_created, buscar o mais recente por ID
-                address = order.renter.personsadresses_set.order_by("-id").first()
+                address = (
+                    order.renter.personsadresses_set.select_related("city")
+                    .order_by("-id")
+                    .first()
+                )
             client_data["addresses"] = []
             if address:
                 city_data = None
@@ -1209,6 +1476,8 @@ class ServiceOrderDetailAPIView(APIView):
                     }
                 )
 
+            event_date = order.event.event_date if order.event else None
+
             # Dados da OS
             order_data = {
                 "id": order.id,
@@ -1226,152 +1495,17 @@ class ServiceOrderDetailAPIView(APIView):
                 "data_finalizado": order.data_finalizado,
                 "client": client_data,
                 "justification_refusal": order.justification_refusal,
-                "event_date": (
-                    order.event.event_date.date()
-                    if order.event
-                    and order.event.event_date
-                    and hasattr(order.event.event_date, "date")
-                    else order.event.event_date if order.event else None
-                ),
+                "event_date": event_date,
                 "event_name": order.event.name if order.event else None,
             }
 
             # Processar itens da OS (mesma lógica do ServiceOrderListByPhaseAPIView)
-            itens = []
-            acessorios = []
-
-            for item in order.items.all():
-                # Determinar se é produto temporário ou produto real
-                temp_product = item.temporary_product
-                product = item.product
-
-                if temp_product:
-                    # Produto temporário
-                    if temp_product.product_type in [
-                        "paleto",
-                        "camisa",
-                        "calca",
-                        "colete",
-                    ]:
-                        # Item de roupa
-                        item_data = {
-                            "tipo": temp_product.product_type,
-                            "cor": temp_product.color or "",
-                            "extras": temp_product.extras
-                            or temp_product.description
-                            or "",
-                            "venda": temp_product.venda or False,
-                            "extensor": False,  # Extensor só para passante
-                        }
-
-                        # Campos específicos por tipo
-                        if temp_product.product_type in ["paleto", "camisa"]:
-                            item_data.update(
-                                {
-                                    "numero": temp_product.size or "",
-                                    "manga": temp_product.sleeve_length or "",
-                                    "marca": temp_product.brand or "",
-                                    "ajuste": item.adjustment_notes or "",
-                                }
-                            )
-                        elif temp_product.product_type == "calca":
-                            item_data.update(
-                                {
-                                    "numero": temp_product.size,
-                                    "cintura": temp_product.waist_size or "",
-                                    "perna": temp_product.leg_length or "",
-                                    "marca": temp_product.brand or "",
-                                    "ajuste_cintura": temp_product.ajuste_cintura or "",
-                                    "ajuste_comprimento": temp_product.ajuste_comprimento
-                                    or "",
-                                }
-                            )
-                        elif temp_product.product_type == "colete":
-                            item_data.update({"marca": temp_product.brand or ""})
-
-                        itens.append(item_data)
-                    else:
-                        # Acessório
-                        acessorio_data = {
-                            "tipo": temp_product.product_type,
-                            "numero": temp_product.size or "",
-                            "cor": temp_product.color or "",
-                            "descricao": temp_product.description or "",
-                            "marca": temp_product.brand or "",
-                            "extensor": temp_product.extensor or False,
-                            "venda": temp_product.venda or False,
-                        }
-                        acessorios.append(acessorio_data)
-
-                elif product:
-                    # Produto real do estoque
-                    if product.tipo.lower() in [
-                        "paleto",
-                        "camisa",
-                        "calça",
-                        "colete",
-                    ]:
-                        # Item de roupa
-                        item_data = {
-                            "tipo": product.tipo.lower(),
-                            "cor": product.cor or "",
-                            "extras": product.nome_produto or "",
-                            "venda": False,  # Produtos do estoque não são vendidos
-                            "extensor": False,
-                        }
-
-                        # Campos específicos por tipo
-                        if product.tipo.lower() in ["paleto", "camisa"]:
-                            item_data.update(
-                                {
-                                    "numero": (
-                                        str(product.tamanho) if product.tamanho else ""
-                                    ),
-                                    "manga": "",
-                                    "marca": product.marca or "",
-                                    "ajuste": item.adjustment_notes or "",
-                                }
-                            )
-                        elif product.tipo.lower() == "calça":
-                            item_data.update(
-                                {
-                                    "numero": (
-                                        str(product.tamanho) if product.tamanho else ""
-                                    ),
-                                    "cintura": "",
-                                    "perna": "",
-                                    "marca": product.marca or "",
-                                    "ajuste_cintura": "",
-                                    "ajuste_comprimento": "",
-                                }
-                            )
-                        elif product.tipo.lower() == "colete":
-                            item_data.update({"marca": product.marca or ""})
-
-                        itens.append(item_data)
-                    else:
-                        # Acessório
-                        acessorio_data = {
-                            "tipo": product.tipo.lower(),
-                            "numero": (str(product.tamanho) if product.tamanho else ""),
-                            "cor": product.cor or "",
-                            "descricao": product.nome_produto or "",
-                            "marca": product.marca or "",
-                            "extensor": False,  # Produtos do estoque não têm extensor
-                            "venda": False,
-                        }
-                        acessorios.append(acessorio_data)
+            itens, acessorios = _split_order_items(order.items.all())
 
             # Dados da ordem de serviço no formato esperado pelo frontend
             ordem_servico_data = {
                 "data_pedido": order.order_date,
-                "data_evento": (
-                    order.event.event_date.date()
-                    if order.event
-                    and order.event.event_date
-                    and hasattr(order.event.event_date, "date")
-                    else order.event.event_date if order.event else None
-                ),
+                "data_evento": event_date,
                 "data_retirada": order.retirada_date,
                 "data_devolucao": order.devolucao_date,
                 "data_prova": order.prova_date,
@@ -1387,13 +1521,9 @@ class ServiceOrderDetailAPIView(APIView):
                 "itens": itens,
                 "acessorios": acessorios,
                 "pagamento": {
-                    "total": float(order.total_value) if order.total_value else 0,
-                    "sinal": (
-                        float(order.advance_payment) if order.advance_payment else 0
-                    ),
-                    "restante": (
-                        float(order.remaining_payment) if order.remaining_payment else 0
-                    ),
+                    "total": _money(order.total_value),
+                    "sinal": _money(order.advance_payment),
+                    "restante": _money(order.remaining_payment),
                     "forma_pagamento": order.payment_method or "",
                     "payment_details": order.payment_details or [],
                 },
@@ -1403,7 +1533,7 @@ class ServiceOrderDetailAPIView(APIView):
             client_data["is_infant"] = order.renter.is_infant if order.renter else False
 
             # Adicionar dados completos ao response
-            order_data.update({"ordem_servico": ordem_servico_data})
+            order_data["ordem_servico"] = ordem_servico_data
 
             return Response(order_data)
 
@@ -1779,7 +1909,7 @@ class ServiceOrderMarkRetrievedAPIView(APIView):
             data = serializer.validated_data
 
             if data.get("receive_remaining_payment"):
-                remaining_amount = data.get("remaining_amount") or service_order.remaining_payment or Decimal("0")
+                remaining_amount = data.get("remaining_amount") or service_order.remaining_payment or _ZERO
                 payment_forms = data.get("payment_forms", [])
 
                 if not payment_forms:
@@ -1795,7 +1925,7 @@ class ServiceOrderMarkRetrievedAPIView(APIView):
                         status=status.HTTP_400_BAD_REQUEST,
                     )
 
-                service_order.advance_payment = (service_order.advance_payment or Decimal("0")) + total_paid
+                service_order.advance_payment = (service_order.advance_payment or _ZERO) + total_paid
 
                 current_details = service_order.payment_details or []
                 formas_pagamento = []
@@ -2079,6 +2209,11 @@ class ServiceOrderReturnToPendingAPIView(APIView):
             )
 
 
+# Opções de filtro do dashboard (DISTINCTs sobre todas as OS) ficam no cache
+# compartilhado até alguma OS ou pessoa mudar; o TTL é só uma rede de segurança
+DASHBOARD_FILTERS_CACHE_TIMEOUT = 300
+
+
 @extend_schema(
     tags=["service-orders"],
     summary="Dashboard de ordens de serviço - Relatório de Atendimentos",
@@ -2159,6 +2294,7 @@ class ServiceOrderDashboardAPIView(APIView):
     - Gráficos por tipo de cliente e canal de origem
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
 
     def get(self, request):
         """Dashboard analítico completo com métricas de ordens de serviço"""
@@ -2493,22 +2629,20 @@ class ServiceOrderDashboardAPIView(APIView):
         ]
         
         # Agrupar por renter_role
-        tipo_counts = {}
+        tipo_counts = defaultdict(
+            lambda: {"atendimentos_fechados": 0, "total_vendido": Decimal("0.00")}
+        )
         
         for order in queryset:
             tipo = order.renter_role.upper() if order.renter_role else "NÃO INFORMADO"
-            
-            if tipo not in tipo_counts:
-                tipo_counts[tipo] = {
-                    "atendimentos_fechados": 0,
-                    "total_vendido": Decimal("0.00"),
-                }
+            # Acessar a chave já cria a entrada (tipos sem OS fechada aparecem com 0)
+            dados = tipo_counts[tipo]
             
             # Verificar se está fechado
             if order.service_order_phase and order.service_order_phase.name in fases_fechadas:
-                tipo_counts[tipo]["atendimentos_fechados"] += 1
+                dados["atendimentos_fechados"] += 1
                 if order.total_value:
-                    tipo_counts[tipo]["total_vendido"] += order.total_value
+                    dados["total_vendido"] += order.total_value
         
         # Converter para lista ordenada
         result = []
@@ -2537,22 +2671,19 @@ class ServiceOrderDashboardAPIView(APIView):
         ]
         
         # Agrupar por canal
-        canal_counts = {}
+        canal_counts = defaultdict(
+            lambda: {"atendimentos": 0, "atendimentos_fechados": 0}
+        )
         
         for order in queryset:
             canal = order.came_from.upper() if order.came_from else "NÃO INFORMADO"
             
-            if canal not in canal_counts:
-                canal_counts[canal] = {
-                    "atendimentos": 0,
-                    "atendimentos_fechados": 0,
-                }
-            
-            canal_counts[canal]["atendimentos"] += 1
+            dados = canal_counts[canal]
+            dados["atendimentos"] += 1
             
             # Verificar se está fechado
             if order.service_order_phase and order.service_order_phase.name in fases_fechadas:
-                canal_counts[canal]["atendimentos_fechados"] += 1
+                dados["atendimentos_fechados"] += 1
         
         # Converter para lista ordenada
         result = []
@@ -2627,71 +2758,53 @@ class ServiceOrderDashboardAPIView(APIView):
         Retorna opções de filtros disponíveis para o frontend
         Busca atendentes a partir dos employees que têm OS, não pelo PersonType.
         """
+        version = service_order_list_version()
+        cached = cache.get(DASHBOARD_FILTERS_KEY)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        filtros = self._build_available_filters()
+        cache.set(DASHBOARD_FILTERS_KEY, (version, filtros), DASHBOARD_FILTERS_CACHE_TIMEOUT)
+        return filtros
+
+    def _build_available_filters(self):
         from accounts.models import Person
-        
-        # Atendentes - buscar todos os employees distintos que têm OS
-        employee_ids = ServiceOrder.objects.exclude(
-            employee__isnull=True
-        ).values_list("employee_id", flat=True).distinct()
-        
-        atendentes = []
-        for emp_id in employee_ids:
-            try:
-                p = Person.objects.get(id=emp_id)
-                atendentes.append({"id": p.id, "nome": p.name})
-            except Person.DoesNotExist:
-                continue
-        
-        # Ordenar atendentes por nome
-        atendentes.sort(key=lambda x: x["nome"])
-        
-        # Tipos de cliente (valores únicos de renter_role)
-        tipos_cliente = list(
-            ServiceOrder.objects.exclude(renter_role__isnull=True)
-            .exclude(renter_role="")
-            .values_list("renter_role", flat=True)
-            .distinct()
-        )
-        tipos_cliente = [t.upper() for t in tipos_cliente if t]
-        tipos_cliente = sorted(list(set(tipos_cliente)))
-        
-        # Formas de pagamento (valores únicos de payment_method)
-        formas_pagamento = list(
-            ServiceOrder.objects.exclude(payment_method__isnull=True)
-            .exclude(payment_method="")
-            .values_list("payment_method", flat=True)
-            .distinct()
-        )
-        formas_pagamento = [f.upper() for f in formas_pagamento if f]
-        formas_pagamento = sorted(list(set(formas_pagamento)))
-        
-        # Canais de origem (valores únicos de came_from)
-        canais_origem = list(
-            ServiceOrder.objects.exclude(came_from__isnull=True)
-            .exclude(came_from="")
-            .values_list("came_from", flat=True)
-            .distinct()
-        )
-        canais_origem = [c.upper() for c in canais_origem if c]
-        canais_origem = sorted(list(set(canais_origem)))
-        
+
+        # Atendentes - todos os employees distintos que têm OS, numa query só
+        atendentes = [
+            {"id": p["id"], "nome": p["name"]}
+            for p in Person.objects.filter(
+                id__in=ServiceOrder.objects.filter(employee__isnull=False).values(
+                    "employee_id"
+                )
+            )
+            .order_by("name")
+            .values("id", "name")
+        ]
+
+        def _distinct_upper(field):
+            valores = (
+                ServiceOrder.objects.exclude(**{f"{field}__isnull": True})
+                .exclude(**{field: ""})
+                .values_list(field, flat=True)
+                .distinct()
+            )
+            return sorted({v.upper() for v in valores if v})
+
         return {
             "atendentes": atendentes,
-            "tipos_cliente": tipos_cliente,
-            "formas_pagamento": formas_pagamento,
-            "canais_origem": canais_origem,
+            # Tipos de cliente (renter_role), formas de pagamento e canais de origem
+            "tipos_cliente": _distinct_upper("renter_role"),
+            "formas_pagamento": _distinct_upper("payment_method"),
+            "canais_origem": _distinct_upper("came_from"),
         }
 
     def _calculate_status_metrics(self, today, in_10_days):
-        """Calcula métricas de status e agenda (provas, retiradas, devoluções)"""
-        refused_phase = ServiceOrderPhase.objects.filter(name="RECUSADA").first()
-        atrasado_phase = ServiceOrderPhase.objects.filter(name="ATRASADO").first()
-
-        status = {
-            "em_atraso": {"provas": 0, "retiradas": 0, "devolucoes": 0},
-            "hoje": {"provas": 0, "retiradas": 0, "devolucoes": 0},
-            "proximos_10_dias": {"provas": 0, "retiradas": 0, "devolucoes": 0},
-        }
+        """Calcula métricas de status e agenda (provas, retiradas, devoluções)
+
+        Todas as contagens saem de um único aggregate com Count condicional,
+        em vez de uma query por contador.
+        """
+        Q = models.Q
 
         # Fases ativas para contagem
         active_phases = [
@@ -2700,67 +2813,67 @@ class ServiceOrderDashboardAPIView(APIView):
             "AGUARDANDO_RETIRADA",
             "AGUARDANDO_DEVOLUCAO",
         ]
-
+        ativa = Q(service_order_phase__name__in=active_phases)
         # OS em atraso (fase ATRASADO ou RECUSADA com datas)
-        atraso_phases = []
-        if refused_phase:
-            atraso_phases.append(refused_phase)
-        if atrasado_phase:
-            atraso_phases.append(atrasado_phase)
-            
-        if atraso_phases:
-            for phase in atraso_phases:
-                status["em_atraso"]["provas"] += ServiceOrder.objects.filter(
-                    service_order_phase=phase, prova_date__isnull=False
-                ).count()
-                status["em_atraso"]["retiradas"] += ServiceOrder.objects.filter(
-                    service_order_phase=phase, retirada_date__isnull=False
-                ).count()
-                status["em_atraso"]["devolucoes"] += ServiceOrder.objects.filter(
-                    service_order_phase=phase, devolucao_date__isnull=False
-                ).count()
-
-        # Também contar OS atrasadas pela flag esta_atrasada
-        status["em_atraso"]["retiradas"] += ServiceOrder.objects.filter(
-            esta_atrasada=True,
-            retirada_date__lt=today,
-            service_order_phase__name__in=active_phases,
-        ).count()
-        status["em_atraso"]["devolucoes"] += ServiceOrder.objects.filter(
-            esta_atrasada=True,
-            devolucao_date__lt=today,
-            service_order_phase__name__in=active_phases,
-        ).count()
-
-        # OS de hoje
-        status["hoje"]["provas"] = ServiceOrder.objects.filter(
-            prova_date=today, service_order_phase__name__in=active_phases
-        ).count()
-        status["hoje"]["retiradas"] = ServiceOrder.objects.filter(
-            retirada_date=today, service_order_phase__name__in=active_phases
-        ).count()
-        status["hoje"]["devolucoes"] = ServiceOrder.objects.filter(
-            devolucao_date=today, service_order_phase__name__in=active_phases
-        ).count()
+        fase_atraso = Q(service_order_phase__name__in=["RECUSADA", "ATRASADO"])
+        # OS atrasadas pela flag esta_atrasada
+        flag_atraso = Q(esta_atrasada=True) & ativa
 
-        # OS próximos 10 dias
-        status["proximos_10_dias"]["provas"] = ServiceOrder.objects.filter(
-            prova_date__gt=today,
-            prova_date__lte=in_10_days,
-            service_order_phase__name__in=active_phases,
-        ).count()
-        status["proximos_10_dias"]["retiradas"] = ServiceOrder.objects.filter(
-            retirada_date__gt=today,
-            retirada_date__lte=in_10_days,
-            service_order_phase__name__in=active_phases,
-        ).count()
-        status["proximos_10_dias"]["devolucoes"] = ServiceOrder.objects.filter(
-            devolucao_date__gt=today,
-            devolucao_date__lte=in_10_days,
-            service_order_phase__name__in=active_phases,
-        ).count()
+        counts = ServiceOrder.objects.aggregate(
+            atraso_provas=models.Count(
+                "id", filter=fase_atraso & Q(prova_date__isnull=False)
+            ),
+            atraso_retiradas=models.Count(
+                "id", filter=fase_atraso & Q(retirada_date__isnull=False)
+            ),
+            atraso_devolucoes=models.Count(
+                "id", filter=fase_atraso & Q(devolucao_date__isnull=False)
+            ),
+            flag_retiradas=models.Count(
+                "id", filter=flag_atraso & Q(retirada_date__lt=today)
+            ),
+            flag_devolucoes=models.Count(
+                "id", filter=flag_atraso & Q(devolucao_date__lt=today)
+            ),
+            hoje_provas=models.Count("id", filter=ativa & Q(prova_date=today)),
+            hoje_retiradas=models.Count("id", filter=ativa & Q(retirada_date=today)),
+            hoje_devolucoes=models.Count(
+                "id", filter=ativa & Q(devolucao_date=today)
+            ),
+            prox_provas=models.Count(
+                "id",
+                filter=ativa & Q(prova_date__gt=today, prova_date__lte=in_10_days),
+            ),
+            prox_retiradas=models.Count(
+                "id",
+                filter=ativa
+                & Q(retirada_date__gt=today, retirada_date__lte=in_10_days),
+            ),
+            prox_devolucoes=models.Count(
+                "id",
+                filter=ativa
+                & Q(devolucao_date__gt=today, devolucao_date__lte=in_10_days),
+            ),
+        )
 
-        return status
+        return {
+            "em_atraso": {
+                "provas": counts["atraso_provas"],
+                "retiradas": counts["atraso_retiradas"] + counts["flag_retiradas"],
+                "devolucoes": counts["atraso_devolucoes"]
+                + counts["flag_devolucoes"],
+            },
+            "hoje": {
+                "provas": counts["hoje_provas"],
+                "retiradas": counts["hoje_retiradas"],
+                "devolucoes": counts["hoje_devolucoes"],
+            },
+            "proximos_10_dias": {
+                "provas": counts["prox_provas"],
+                "retiradas": counts["prox_retiradas"],
+                "devolucoes": counts["prox_devolucoes"],
+            },
+        }
 
     def _calculate_os_do_dia(self, today):
         """Retorna resumo das OS do dia agrupadas por fase"""
@@ -2927,8 +3040,6 @@ class ServiceOrderAttendantMetricsAPIView(APIView):
     def get(self, request):
         """Métricas de performance por atendente"""
         try:
-            from accounts.models import Person, PersonType
-
             today = date.today()
             week_start = today - timedelta(days=today.weekday())
             month_start = today.replace(day=1)
@@ -2938,7 +3049,21 @@ class ServiceOrderAttendantMetricsAPIView(APIView):
             if not atendente_type:
                 return Response({"atendentes": []})
 
-            atendentes = Person.objects.filter(person_type=atendente_type)
+            # EXISTS por atendente sobre a janela mais ampla (semana ou mês):
+            # quem não tem nenhuma OS nela recebe zeros sem disparar as
+            # queries de métricas, itens e canais de cada período
+            janela_inicio = min(week_start, month_start)
+            atendentes = Person.objects.filter(
+                person_type=atendente_type
+            ).annotate(
+                tem_os=models.Exists(
+                    ServiceOrder.objects.filter(
+                        employee_id=models.OuterRef("pk"),
+                        order_date__gte=janela_inicio,
+                        order_date__lte=today,
+                    )
+                )
+            )
             result_data = []
 
             for atendente in atendentes:
@@ -2955,83 +3080,111 @@ class ServiceOrderAttendantMetricsAPIView(APIView):
                     ("semana", week_start),
                     ("mes", month_start),
                 ]:
-                    # OS do atendente no período
-                    orders = ServiceOrder.objects.filter(
-                        employee=atendente,
-                        order_date__gte=data_inicio,
-                        order_date__lte=today,
-                        is_virtual=False,
-                    )
-
-                    total_atendimentos = orders.count()
-                    finalizados = orders.filter(
-                        service_order_phase__name="FINALIZADO"
-                    ).count()
-                    cancelados = orders.filter(
-                        service_order_phase__name="RECUSADA"
-                    ).count()
-                    em_andamento = orders.filter(
-                        service_order_phase__name__in=[
-                            "PENDENTE",
-                            "EM_PRODUCAO",
-                            "AGUARDANDO_RETIRADA",
-                            "AGUARDANDO_DEVOLUCAO",
-                        ]
-                    ).count()
-
-                    # Taxa de conversão
-                    # Considera sucesso: OS que foram retiradas (AGUARDANDO_DEVOLUCAO),
-                    # aguardando retirada (confirmadas), em produção ou finalizadas
-                    sucesso = orders.filter(
-                        service_order_phase__name__in=[
-                            "FINALIZADO",
-                            "AGUARDANDO_DEVOLUCAO",
-                            "AGUARDANDO_RETIRADA",
-                            "EM_PRODUCAO",
-                        ]
-                    ).count()
-                    taxa_conversao = round(
-                        (
-                            (sucesso / total_atendimentos * 100)
-                            if total_atendimentos > 0
-                            else 0.0
-                        ),
-                        2,
-                    )
-
-                    # Valores financeiros
-                    total_vendido = sum(
-                        [
-                            float(order.total_value)
-                            for order in orders
-                            if order.total_value
-                        ]
-                    )
-                    total_recebido = sum(
-                        [float(order.advance_payment or 0) for order in orders]
-                    )
-
-                    # Vendas (itens marcados como venda)
-                    itens_venda = ServiceOrderItem.objects.filter(
-                        service_order__employee=atendente,
-                        service_order__order_date__gte=data_inicio,
-                        service_order__order_date__lte=today,
-                        temporary_product__isnull=False,
-                        temporary_product__venda=True,
-                    ).count()
-
-                    # Canais de aquisição do atendente
-                    canais = (
-                        ServiceOrder.objects.filter(
+                    if not atendente.tem_os:
+                        metricas = {
+                            "total_atendimentos": 0,
+                            "finalizados": 0,
+                            "cancelados": 0,
+                            "em_andamento": 0,
+                            "sucesso": 0,
+                            "taxa_conversao": 0.0,
+                            "total_vendido": 0.0,
+                            "total_recebido": 0.0,
+                        }
+                        total_atendimentos = 0
+                        itens_venda = 0
+                        canais = []
+                    else:
+                        # OS do atendente no período
+                        orders = ServiceOrder.objects.filter(
                             employee=atendente,
                             order_date__gte=data_inicio,
                             order_date__lte=today,
-                            came_from__isnull=False,
+                            is_virtual=False,
+                        )
+
+                        # Contagens, taxa de conversão e valores financeiros em um
+                        # único aggregate; arredondamento feito no próprio SQL.
+                        # Considera sucesso: OS que foram retiradas (AGUARDANDO_DEVOLUCAO),
+                        # aguardando retirada (confirmadas), em produção ou finalizadas
+                        q_sucesso = models.Q(
+                            service_order_phase__name__in=[
+                                "FINALIZADO",
+                                "AGUARDANDO_DEVOLUCAO",
+                                "AGUARDANDO_RETIRADA",
+                                "EM_PRODUCAO",
+                            ]
+                        )
+                        metricas = orders.aggregate(
+                            total_atendimentos=models.Count("id"),
+                            finalizados=models.Count(
+                                "id",
+                                filter=models.Q(service_order_phase__name="FINALIZADO"),
+                            ),
+                            cancelados=models.Count(
+                                "id",
+                                filter=models.Q(service_order_phase__name="RECUSADA"),
+                            ),
+                            em_andamento=models.Count(
+                                "id",
+                                filter=models.Q(
+                                    service_order_phase__name__in=[
+                                        "PENDENTE",
+                                        "EM_PRODUCAO",
+                                        "AGUARDANDO_RETIRADA",
+                                        "AGUARDANDO_DEVOLUCAO",
+                                    ]
+                                ),
+                            ),
+                            sucesso=models.Count("id", filter=q_sucesso),
+                            # NullIf evita divisão por zero; Coalesce devolve 0.0
+                            taxa_conversao=Coalesce(
+                                Round(
+                                    Cast(
+                                        models.Count("id", filter=q_sucesso),
+                                        models.FloatField(),
+                                    )
+                                    * 100.0
+                                    / NullIf(models.Count("id"), 0),
+                                    2,
+                                ),
+                                0.0,
+                            ),
+                            total_vendido=Coalesce(
+                                Round(Cast(models.Sum("total_value"), models.FloatField()), 2),
+                                0.0,
+                            ),
+                            total_recebido=Coalesce(
+                                Round(
+                                    Cast(models.Sum("advance_payment"), models.FloatField()),
+                                    2,
+                                ),
+                                0.0,
+                            ),
+                        )
+                        total_atendimentos = metricas["total_atendimentos"]
+
+                        # Vendas (itens marcados como venda)
+                        itens_venda = ServiceOrderItem.objects.filter(
+                            service_order__employee=atendente,
+                            service_order__order_date__gte=data_inicio,
+                            service_order__order_date__lte=today,
+                            temporary_product__isnull=False,
+                            temporary_product__venda=True,
+                        ).count()
+
+                        # Canais de aquisição do atendente
+                        canais = (
+                            ServiceOrder.objects.filter(
+                                employee=atendente,
+                                order_date__gte=data_inicio,
+                                order_date__lte=today,
+                                came_from__isnull=False,
+                            )
+                            .values("came_from")
+                            .annotate(total=models.Count("id"))
+                            .order_by("-total")
                         )
-                        .values("came_from")
-                        .annotate(total=models.Count("id"))
-                        .order_by("-total")
-                    )
 
                     canal_dict = {}
                     for canal_item in canais:
@@ -3050,18 +3203,18 @@ class ServiceOrderAttendantMetricsAPIView(APIView):
                     atendente_data[periodo] = {
                         "atendimentos": {
                             "total_atendimentos": total_atendimentos,
-                            "finalizados": finalizados,
-                            "cancelados": cancelados,
-                            "em_andamento": em_andamento,
+                            "finalizados": metricas["finalizados"],
+                            "cancelados": metricas["cancelados"],
+                            "em_andamento": metricas["em_andamento"],
                         },
                         "conversao": {
-                            "taxa_conversao": taxa_conversao,
+                            "taxa_conversao": metricas["taxa_conversao"],
                             "atendimentos_iniciados": total_atendimentos,
-                            "concluidos_sucesso": sucesso,
+                            "concluidos_sucesso": metricas["sucesso"],
                         },
                         "financeiro": {
-                            "total_vendido": round(total_vendido, 2),
-                            "total_recebido": round(total_recebido, 2),
+                            "total_vendido": metricas["total_vendido"],
+                            "total_recebido": metricas["total_recebido"],
                         },
                         "vendas": {"itens_vendidos": itens_venda},
                         "canais": canal_dict,
@@ -3090,6 +3243,7 @@ class ServiceOrderAttendantMetricsAPIView(APIView):
 )
 class ServiceOrderListByPhaseAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     serializer_class = ServiceOrderListByPhaseSerializer
 
     def get(self, request, phase_name):
@@ -3097,38 +3251,13 @@ class ServiceOrderListByPhaseAPIView(APIView):
         try:
             today = date.today()
 
-            # Função para mover automaticamente para RECUSADA quem passou da data do evento
-            def move_to_refused_if_event_passed():
-                refused_phase = ServiceOrderPhase.objects.filter(
-                    name="RECUSADA"
-                ).first()
-                if not refused_phase:
-                    return
-
-                # Buscar OS que passaram da data do evento e não foram retiradas
-                # Apenas recusar PENDENTE e EM_PRODUCAO — ordens já retiradas ou finalizadas não devem ser auto-recusadas
-                overdue_orders = ServiceOrder.objects.filter(
-                    event__event_date__lt=today,
-                    data_retirado__isnull=True,
-                    service_order_phase__name__in=[
-                        "PENDENTE",
-                        "EM_PRODUCAO",
-                    ],
-                    event__isnull=False,
-                ).exclude(service_order_phase__name="RECUSADA")
-
-                for order in overdue_orders:
-                    order.service_order_phase = refused_phase
-                    order.justification_refusal = "Cliente não retirou o produto"
-                    order.save()
-                    print(
-                        f"OS {order.id} movida automaticamente para RECUSADA - Cliente não retirou o produto"
-                    )
-
-            # Executar verificação automática
-            move_to_refused_if_event_passed()
+            # Recusa automática de quem passou da data do evento (throttled)
+            from .views import move_overdue_orders_to_refused_throttled
+            move_overdue_orders_to_refused_throttled(today)
 
-            phase = ServiceOrderPhase.objects.filter(name__icontains=phase_name).first()
+            phase = phase_by_name(
+                phase_name.upper()
+            ) or ServiceOrderPhase.objects.filter(name__icontains=phase_name).first()
             if not phase:
                 return Response(
                     {"error": "Fase não encontrada"}, status=status.HTTP_404_NOT_FOUND
@@ -3140,9 +3269,7 @@ class ServiceOrderListByPhaseAPIView(APIView):
             # Filtrar orders baseado na fase
             if phase.name == "ATRASADO":
                 # Apenas ordens atrasadas na DEVOLUÇÃO (roupas não devolvidas)
-                aguardando_devolucao_phase = ServiceOrderPhase.objects.filter(
-                    name="AGUARDANDO_DEVOLUCAO"
-                ).first()
+                aguardando_devolucao_phase = phase_by_name("AGUARDANDO_DEVOLUCAO")
 
                 q_devolucao_atrasada = models.Q(
                     service_order_phase=aguardando_devolucao_phase,
@@ -3156,213 +3283,188 @@ class ServiceOrderListByPhaseAPIView(APIView):
                     event__isnull=False,
                 )
 
-                orders = (
-                    base_qs.filter(
-                        q_devolucao_atrasada | q_evento_passado_devolucao
-                    )
-                    .distinct()
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
-
-            elif phase.name == "AGUARDANDO_DEVOLUCAO":
-                # Fase AGUARDANDO_DEVOLUCAO: todas as OS nesta fase
-                orders = (
-                    base_qs.filter(
-                        service_order_phase=phase,
-                    )
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
-
-            elif phase.name == "EM_PRODUCAO":
-                # Fase EM_PRODUCAO: todas as OS nesta fase
-                orders = (
-                    base_qs.filter(
-                        service_order_phase=phase,
-                    )
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
+                orders = base_qs.filter(
+                    q_devolucao_atrasada | q_evento_passado_devolucao
+                ).distinct()
 
             elif phase.name == "AGUARDANDO_RETIRADA":
                 # Fase AGUARDANDO_RETIRADA: todas as OS nesta fase
                 # Marcar com flag esta_atrasada=True as que estão atrasadas
-                orders = (
-                    base_qs.filter(
-                        service_order_phase=phase,
-                    )
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
-
-                # Atualizar flag de atraso para cada OS
-                for order in orders:
-                    esta_atrasada = False
+                orders = base_qs.filter(service_order_phase=phase)
 
-                    # Verifica se passou da data de retirada
-                    if order.retirada_date and order.retirada_date < today:
-                        esta_atrasada = True
+                # Atualizar flag de atraso das OS da fase
+                orders.sync_esta_atrasada(today)
 
-                    # Verifica se o evento já passou e ainda não foi retirada
-                    if (
-                        order.event
-                        and order.event.event_date
-                        and order.event.event_date < today
-                        and not order.data_retirado
-                    ):
-                        esta_atrasada = True
+            else:
+                # Demais fases (AGUARDANDO_DEVOLUCAO, EM_PRODUCAO, ...): todas as OS nesta fase
+                orders = base_qs.filter(service_order_phase=phase)
+
+            # Linhas das OS como dicts (values) para não instanciar modelos;
+            # itens vêm de uma segunda query agrupada por OS
+            rows = list(
+                orders.values(
+                    "id",
+                    "total_value",
+                    "advance_payment",
+                    "remaining_payment",
+                    "esta_atrasada",
+                    "order_date",
+                    "prova_date",
+                    "retirada_date",
+                    "devolucao_date",
+                    "production_date",
+                    "data_recusa",
+                    "data_finalizado",
+                    "data_devolvido",
+                    "service_type",
+                    "justification_refusal",
+                    "justification_reason__name",
+                    "employee__name",
+                    "attendant__name",
+                    "event__name",
+                    "event__event_date",
+                    "renter_id",
+                    "renter__name",
+                    "renter__cpf",
+                    "renter__person_type_id",
+                    "renter__person_type__type",
+                )
+            )
 
-                    # Atualiza a flag se mudou
-                    if order.esta_atrasada != esta_atrasada:
-                        order.esta_atrasada = esta_atrasada
-                        order.save()
+            # Uma única query com apenas as colunas usadas no payload
+            items_by_order = defaultdict(list)
+            items_qs = (
+                ServiceOrderItem.objects.filter(
+                    service_order_id__in=[row["id"] for row in rows]
+                )
+                .select_related("temporary_product", "product")
+                .only(*_ORDER_ITEM_FIELDS)
+            )
+            for item in items_qs:
+                items_by_order[item.service_order_id].append(item)
+
+            # Contato e endereço mais recentes de cada cliente em uma query
+            # cada (ordenadas do mais recente; o primeiro por pessoa vence)
+            renter_ids = {row["renter_id"] for row in rows if row["renter_id"]}
+            latest_contact = {}
+            for contact in (
+                PersonsContacts.objects.filter(person_id__in=renter_ids)
+                .order_by("-date_created", "-id")
+                .only("id", "email", "phone", "person_id")
+            ):
+                latest_contact.setdefault(contact.person_id, contact)
 
-            else:
-                # Outras fases: comportamento normal
-                orders = (
-                    base_qs.filter(service_order_phase=phase)
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
+            latest_address = {}
+            for address in (
+                PersonsAdresses.objects.filter(person_id__in=renter_ids)
+                .select_related("city")
+                .order_by("-date_created", "-id")
+                .only(
+                    "id",
+                    "cep",
+                    "street",
+                    "number",
+                    "neighborhood",
+                    "complemento",
+                    "person_id",
+                    "city__id",
+                    "city__name",
+                    "city__uf",
                 )
+            ):
+                latest_address.setdefault(address.person_id, address)
 
             data = []
-            for order in orders:
-                # Dados do cliente
-                client_data = {
-                    "id": order.renter.id,
-                    "name": order.renter.name,
-                    "cpf": order.renter.cpf,
-                    "person_type": (
-                        {
-                            "id": order.renter.person_type.id,
-                            "type": order.renter.person_type.type,
-                        }
-                        if order.renter.person_type
-                        else None
-                    ),
-                }
+            renter_cache = {}
+            for row in rows:
+                renter_id = row["renter_id"]
+
+                # Dados do cliente (montados uma vez por cliente na requisição)
+                client_data = renter_cache.get(renter_id)
+                if client_data is None:
+                    client_data = {
+                        "id": renter_id,
+                        "name": row["renter__name"],
+                        "cpf": row["renter__cpf"],
+                        "person_type": (
+                            {
+                                "id": row["renter__person_type_id"],
+                                "type": row["renter__person_type__type"],
+                            }
+                            if row["renter__person_type_id"]
+                            else None
+                        ),
+                    }
 
-                # Contatos do cliente (apenas o mais recente)
-                contact = order.renter.contacts.order_by("-date_created", "-id").first()
-                client_data["contacts"] = []
-                if contact:
-                    client_data["contacts"].append(
-                        {
-                            "id": contact.id,
-                            "email": contact.email,
-                            "phone": contact.phone,
-                        }
-                    )
+                    # Contatos do cliente (apenas o mais recente)
+                    contact = latest_contact.get(renter_id)
+                    client_data["contacts"] = []
+                    if contact:
+                        client_data["contacts"].append(
+                            {
+                                "id": contact.id,
+                                "email": contact.email,
+                                "phone": contact.phone,
+                            }
+                        )
 
-                # Endereços do cliente (apenas o mais recente)
-                address = order.renter.personsadresses_set.order_by(
-                    "-date_created", "-id"
-                ).first()
-                client_data["addresses"] = []
-                if address:
-                    city_data = None
-                    if address.city:
-                        city_data = {
-                            "id": address.city.id,
-                            "name": address.city.name,
-                            "uf": address.city.uf,
-                        }
+                    # Endereços do cliente (apenas o mais recente)
+                    address = latest_address.get(renter_id)
+                    client_data["addresses"] = []
+                    if address:
+                        city_data = None
+                        if address.city:
+                            city_data = {
+                                "id": address.city.id,
+                                "name": address.city.name,
+                                "uf": address.city.uf,
+                            }
 
-                    client_data["addresses"].append(
-                        {
-                            "id": address.id,
-                            "cep": address.cep,
-                            "rua": address.street,
-                            "numero": address.number,
-                            "bairro": address.neighborhood,
-                            "complemento": address.complemento or "",
-                            "cidade": city_data,
-                        }
-                    )
+                        client_data["addresses"].append(
+                            {
+                                "id": address.id,
+                                "cep": address.cep,
+                                "rua": address.street,
+                                "numero": address.number,
+                                "bairro": address.neighborhood,
+                                "complemento": address.complemento or "",
+                                "cidade": city_data,
+                            }
+                        )
+                    renter_cache[renter_id] = client_data
+
+                # Event.event_date é DateField: values() já devolve datetime.date
+                event_date = row["event__event_date"]
 
                 # Dados da OS
                 order_data = {
-                    "id": order.id,
-                    "total_value": order.total_value,
-                    "advance_payment": order.advance_payment,
-                    "remaining_payment": order.remaining_payment,
-                    "esta_atrasada": order.esta_atrasada,
-                    "employee_name": order.employee.name if order.employee else "",
-                    "attendant_name": order.attendant.name if order.attendant else "",
-                    "order_date": order.order_date,
-                    "prova_date": order.prova_date,
-                    "retirada_date": order.retirada_date,
-                    "devolucao_date": order.devolucao_date,
-                    "production_date": order.production_date,
-                    "data_recusa": order.data_recusa,
-                    "data_finalizado": order.data_finalizado,
+                    "id": row["id"],
+                    "total_value": row["total_value"],
+                    "advance_payment": row["advance_payment"],
+                    "remaining_payment": row["remaining_payment"],
+                    "esta_atrasada": row["esta_atrasada"],
+                    "employee_name": row["employee__name"] or "",
+                    "attendant_name": row["attendant__name"] or "",
+                    "order_date": row["order_date"],
+                    "prova_date": row["prova_date"],
+                    "retirada_date": row["retirada_date"],
+                    "devolucao_date": row["devolucao_date"],
+                    "production_date": row["production_date"],
+                    "data_recusa": row["data_recusa"],
+                    "data_finalizado": row["data_finalizado"],
                     "client": client_data,
-                    "justification_refusal": order.justification_refusal,
-                    "justification_reason": (
-                        order.justification_reason.name
-                        if order.justification_reason
-                        else None
-                    ),
-                    "event_date": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
-                    "event_name": order.event.name if order.event else None,
+                    "justification_refusal": row["justification_refusal"],
+                    "justification_reason": row["justification_reason__name"],
+                    "event_date": event_date,
+                    "event_name": row["event__name"],
                 }
 
                 # Calcular justificativa do atraso para fase ATRASADO
                 if phase.name == "ATRASADO":
                     # Para fase ATRASADO, determinar a justificativa baseada nas datas
-                    event_date = None
-                    if order.event and order.event.event_date:
-                        # Garantir que event_date seja datetime.date para comparação
-                        if hasattr(order.event.event_date, "date"):
-                            event_date = order.event.event_date.date()
-                        else:
-                            event_date = order.event.event_date
-
                     if (
-                        order.devolucao_date
-                        and order.devolucao_date < today
+                        row["devolucao_date"]
+                        and row["devolucao_date"] < today
                         and event_date
                         and event_date > today
                     ):
@@ -3370,14 +3472,14 @@ class ServiceOrderListByPhaseAPIView(APIView):
                             "Cliente ainda não devolveu"
                         )
                     elif (
-                        order.retirada_date
-                        and order.retirada_date < today
+                        row["retirada_date"]
+                        and row["retirada_date"] < today
                         and event_date
                         and event_date > today
                     ):
                         order_data["justificativa_atraso"] = "Cliente não retirou"
                     elif (
-                        order.data_devolvido is None
+                        row["data_devolvido"] is None
                         and event_date
                         and event_date < today
                     ):
@@ -3390,176 +3492,36 @@ class ServiceOrderListByPhaseAPIView(APIView):
                     order_data["justificativa_atraso"] = None
 
                 # Processar itens da OS
-                itens = []
-                acessorios = []
-
-                for item in order.items.all():
-                    # Determinar se é produto temporário ou produto real
-                    temp_product = item.temporary_product
-                    product = item.product
-
-                    if temp_product:
-                        # Produto temporário
-                        if temp_product.product_type in [
-                            "paleto",
-                            "camisa",
-                            "calca",
-                            "colete",
-                        ]:
-                            # Item de roupa
-                            item_data = {
-                                "tipo": temp_product.product_type,
-                                "cor": temp_product.color or "",
-                                "extras": temp_product.extras
-                                or temp_product.description
-                                or "",
-                                "venda": temp_product.venda or False,
-                                "extensor": False,  # Extensor só para passante
-                            }
-
-                            # Campos específicos por tipo
-                            if temp_product.product_type in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size
-                                        or "",  # ✅ Campo "numero" retorna o "size" do banco
-                                        "manga": temp_product.sleeve_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "calca":
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size,
-                                        "cintura": temp_product.waist_size or "",
-                                        "perna": temp_product.leg_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste_cintura": temp_product.ajuste_cintura
-                                        or "",
-                                        "ajuste_comprimento": temp_product.ajuste_comprimento
-                                        or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "colete":
-                                item_data.update({"marca": temp_product.brand or ""})
-
-                            print(
-                                f"DEBUG ITEM: Retornando item - tipo: {item_data['tipo']}, numero: '{item_data.get('numero', '')}'"
+                itens, acessorios = _split_order_items(items_by_order[row["id"]])
+                if logger.isEnabledFor(logging.DEBUG):
+                    for label, entries in (("Item", itens), ("Acessório", acessorios)):
+                        for entry in entries:
+                            logger.debug(
+                                "%s da OS %s - tipo: %s, numero: %r",
+                                label,
+                                row["id"],
+                                entry["tipo"],
+                                entry.get("numero", ""),
                             )
-                            itens.append(item_data)
-                        else:
-                            # Acessório
-                            acessorio_data = {
-                                "tipo": temp_product.product_type,
-                                "numero": temp_product.size
-                                or "",  # ✅ Campo "numero" retorna o "size" do banco
-                                "cor": temp_product.color or "",
-                                "descricao": temp_product.description or "",
-                                "marca": temp_product.brand or "",
-                                "extensor": temp_product.extensor or False,
-                                "venda": temp_product.venda or False,
-                            }
-                            print(
-                                f"DEBUG ACESSORIO: Retornando acessório - tipo: {acessorio_data['tipo']}, numero: '{acessorio_data['numero']}'"
-                            )
-                            acessorios.append(acessorio_data)
-
-                    elif product:
-                        # Produto real do estoque
-                        if product.tipo.lower() in [
-                            "paleto",
-                            "camisa",
-                            "calça",
-                            "colete",
-                        ]:
-                            # Item de roupa
-                            item_data = {
-                                "tipo": product.tipo.lower(),
-                                "cor": product.cor or "",
-                                "extras": product.nome_produto or "",
-                                "venda": False,  # Produtos do estoque não são vendidos
-                                "extensor": False,
-                            }
-
-                            # Campos específicos por tipo
-                            if product.tipo.lower() in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),  # ✅ Campo "numero" retorna o "tamanho" do produto do estoque
-                                        "manga": "",
-                                        "marca": product.marca or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "calça":
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),  # ✅ Campo "numero" retorna o "tamanho" do produto do estoque
-                                        "cintura": "",
-                                        "perna": "",
-                                        "marca": product.marca or "",
-                                        "ajuste_cintura": "",
-                                        "ajuste_comprimento": "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "colete":
-                                item_data.update({"marca": product.marca or ""})
-
-                            itens.append(item_data)
-                        else:
-                            # Acessório
-                            acessorio_data = {
-                                "tipo": product.tipo.lower(),
-                                "numero": (
-                                    str(product.tamanho) if product.tamanho else ""
-                                ),  # ✅ Campo "numero" retorna o "tamanho" do produto do estoque
-                                "cor": product.cor or "",
-                                "descricao": product.nome_produto or "",
-                                "marca": product.marca or "",
-                                "extensor": False,  # Produtos do estoque não têm extensor
-                                "venda": False,
-                            }
-                            acessorios.append(acessorio_data)
 
                 # Dados da ordem de serviço no formato esperado pelo frontend
                 ordem_servico_data = {
-                    "data_pedido": order.order_date,
-                    "data_evento": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
-                    "data_retirada": order.retirada_date,
-                    "data_devolucao": order.devolucao_date,
-                    "modalidade": order.service_type or "Aluguel",
+                    "data_pedido": row["order_date"],
+                    "data_evento": event_date,
+                    "data_retirada": row["retirada_date"],
+                    "data_devolucao": row["devolucao_date"],
+                    "modalidade": row["service_type"] or "Aluguel",
                     "itens": itens,
                     "acessorios": acessorios,
                     "pagamento": {
-                        "total": float(order.total_value) if order.total_value else 0,
-                        "sinal": (
-                            float(order.advance_payment) if order.advance_payment else 0
-                        ),
-                        "restante": (
-                            float(order.remaining_payment)
-                            if order.remaining_payment
-                            else 0
-                        ),
+                        "total": _money(row["total_value"]),
+                        "sinal": _money(row["advance_payment"]),
+                        "restante": _money(row["remaining_payment"]),
                     },
                 }
 
                 # Adicionar dados completos ao response
-                order_data.update({"ordem_servico": ordem_servico_data})
+                order_data["ordem_servico"] = ordem_servico_data
 
                 data.append(order_data)
 
@@ -3572,6 +3534,25 @@ class ServiceOrderListByPhaseAPIView(APIView):
             )
 
 
+# Ordenações aceitas pela listagem V2 (campo ou -campo), montadas uma vez
+_PHASE_LIST_ORDERING_FIELDS = (
+    "order_date",
+    "prova_date",
+    "retirada_date",
+    "devolucao_date",
+    "production_date",
+    "data_finalizado",
+    "total_value",
+    "remaining_payment",
+    "id",
+    "renter__name",
+    "event__event_date",
+)
+_PHASE_LIST_ORDERING = frozenset(_PHASE_LIST_ORDERING_FIELDS) | frozenset(
+    "-" + field for field in _PHASE_LIST_ORDERING_FIELDS
+)
+
+
 @extend_schema(
     tags=["service-orders"],
     summary="Listar ordens de serviço por fase (V2, paginado)",
@@ -3662,9 +3643,9 @@ class ServiceOrderListByPhaseAPIView(APIView):
                 "results": [
                     {
                         "id": 123,
-                        "total_value": "150.00",
-                        "advance_payment": "50.00",
-                        "remaining_payment": "100.00",
+                        "total_value": 150.0,
+                        "advance_payment": 50.0,
+                        "remaining_payment": 100.0,
                         "esta_atrasada": False,
                         "employee_name": "Fulano",
                         "attendant_name": "Beltrano",
@@ -3692,6 +3673,7 @@ class ServiceOrderListByPhaseV2APIView(APIView):
     """Versão V2 com paginação simples para a listagem por fase."""
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     serializer_class = ServiceOrderListByPhaseSerializer
 
     def get(self, request, phase_name):
@@ -3713,127 +3695,24 @@ class ServiceOrderListByPhaseV2APIView(APIView):
             today = date.today()
 
             # Reaplicar a mesma lógica automática de recusa por evento passado
-            def move_to_refused_if_event_passed():
-                refused_phase = ServiceOrderPhase.objects.filter(
-                    name="RECUSADA"
-                ).first()
-                if not refused_phase:
-                    return
+            from .views import move_overdue_orders_to_refused_throttled
+            move_overdue_orders_to_refused_throttled(today)
 
-                overdue_orders = ServiceOrder.objects.filter(
-                    event__event_date__lt=today,
-                    data_retirado__isnull=True,
-                    service_order_phase__name__in=[
-                        "PENDENTE",
-                        "EM_PRODUCAO",
-                    ],
-                    event__isnull=False,
-                ).exclude(service_order_phase__name="RECUSADA")
-
-                for order in overdue_orders:
-                    order.service_order_phase = refused_phase
-                    order.justification_refusal = "Cliente não retirou o produto"
-                    order.save()
-
-            move_to_refused_if_event_passed()
-
-            phase = ServiceOrderPhase.objects.filter(name__icontains=phase_name).first()
+            phase = phase_by_name(
+                phase_name.upper()
+            ) or ServiceOrderPhase.objects.filter(name__icontains=phase_name).first()
             if not phase:
                 return Response(
                     {"error": "Fase não encontrada"}, status=status.HTTP_404_NOT_FOUND
                 )
 
-            # Base queryset - exclui OSs virtuais
-            base_qs = ServiceOrder.objects.filter(is_virtual=False)
+            orders_qs = self._build_orders_qs(phase, today)
 
-            # Filtrar orders baseado na fase (mesma lógica que V1)
-            if phase.name == "ATRASADO":
-                aguardando_devolucao_phase = ServiceOrderPhase.objects.filter(
-                    name="AGUARDANDO_DEVOLUCAO"
-                ).first()
-
-                # Apenas ordens atrasadas na DEVOLUÇÃO (roupas não devolvidas)
-                q_devolucao_atrasada = models.Q(
-                    service_order_phase=aguardando_devolucao_phase,
-                    devolucao_date__lt=today,
-                    data_devolvido__isnull=True,
-                )
-                q_evento_passado_devolucao = models.Q(
-                    service_order_phase=aguardando_devolucao_phase,
-                    data_devolvido__isnull=True,
-                    event__event_date__lt=today,
-                    event__isnull=False,
-                )
-
-                orders_qs = (
-                    base_qs.filter(
-                        q_devolucao_atrasada | q_evento_passado_devolucao
-                    )
-                    .distinct()
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
-
-            elif phase.name in [
-                "AGUARDANDO_DEVOLUCAO",
-                "EM_PRODUCAO",
-                "AGUARDANDO_RETIRADA",
-            ]:
-                orders_qs = (
-                    base_qs.filter(
-                        service_order_phase=phase,
-                    )
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
-
-                # Para AGUARDANDO_RETIRADA atualizar flag de atraso globalmente
-                if phase.name == "AGUARDANDO_RETIRADA":
-                    for order in orders_qs:
-                        esta_atrasada = False
-
-                        if order.retirada_date and order.retirada_date < today:
-                            esta_atrasada = True
-
-                        if (
-                            order.event
-                            and order.event.event_date
-                            and order.event.event_date < today
-                            and not order.data_retirado
-                        ):
-                            esta_atrasada = True
-
-                        if order.esta_atrasada != esta_atrasada:
-                            order.esta_atrasada = esta_atrasada
-                            order.save()
-
-            else:
-                orders_qs = (
-                    base_qs.filter(service_order_phase=phase)
-                    .select_related(
-                        "renter",
-                        "employee",
-                        "attendant",
-                        "renter__person_type",
-                        "event",
-                        "justification_reason",
-                    )
-                    .prefetch_related("items__temporary_product", "items__product")
-                )
+            # Para AGUARDANDO_RETIRADA atualizar flag de atraso globalmente
+            if phase.name == "AGUARDANDO_RETIRADA":
+                ServiceOrder.objects.filter(
+                    is_virtual=False, service_order_phase=phase
+                ).sync_esta_atrasada(today)
 
             # Aplicar filtros opcionais de data e pesquisa livre antes da paginação
             start_date = request.GET.get("start_date")
@@ -3853,20 +3732,34 @@ class ServiceOrderListByPhaseV2APIView(APIView):
             search = request.GET.get("search")
             if search:
                 search = search.strip()
-                # Reuse Q and include contacts (phone/email) and product fields (temporary or real)
+                # Contatos (phone/email) e produtos dos itens (temporário ou
+                # real) via EXISTS: não multiplica as linhas da OS, então
+                # dispensa o distinct()
+                contact_match = models.Exists(
+                    PersonsContacts.objects.filter(
+                        models.Q(phone__icontains=search)
+                        | models.Q(email__icontains=search),
+                        person_id=models.OuterRef("renter_id"),
+                    )
+                )
+                item_match = models.Exists(
+                    ServiceOrderItem.objects.filter(
+                        models.Q(temporary_product__description__icontains=search)
+                        | models.Q(temporary_product__extras__icontains=search)
+                        | models.Q(temporary_product__brand__icontains=search)
+                        | models.Q(product__nome_produto__icontains=search)
+                        | models.Q(product__marca__icontains=search),
+                        service_order_id=models.OuterRef("pk"),
+                    )
+                )
                 q = (
                     models.Q(renter__name__icontains=search)
                     | models.Q(renter__cpf__icontains=search)
                     | models.Q(event__name__icontains=search)
                     | models.Q(employee__name__icontains=search)
                     | models.Q(attendant__name__icontains=search)
-                    | models.Q(renter__contacts__phone__icontains=search)
-                    | models.Q(renter__contacts__email__icontains=search)
-                    | models.Q(items__temporary_product__description__icontains=search)
-                    | models.Q(items__temporary_product__extras__icontains=search)
-                    | models.Q(items__temporary_product__brand__icontains=search)
-                    | models.Q(items__product__nome_produto__icontains=search)
-                    | models.Q(items__product__marca__icontains=search)
+                    | contact_match
+                    | item_match
                 )
                 if search.isdigit():
                     try:
@@ -3874,11 +3767,11 @@ class ServiceOrderListByPhaseV2APIView(APIView):
                     except Exception:
                         pass
 
-                # Use distinct to avoid duplicate ServiceOrder rows due to joins
-                orders_qs = orders_qs.filter(q).distinct()
+                orders_qs = orders_qs.filter(q)
 
             # Filtro por data especifica (campo depende da fase)
             filter_date = request.GET.get("filter_date")
+            date_field = None
             if filter_date:
                 date_field_map = {
                     'PENDENTE': 'order_date',
@@ -3895,312 +3788,66 @@ class ServiceOrderListByPhaseV2APIView(APIView):
 
             # Ordenacao
             ordering_param = request.GET.get("ordering", "-order_date")
-            ALLOWED_ORDERING_FIELDS = {
-                'order_date', 'prova_date', 'retirada_date', 'devolucao_date',
-                'production_date', 'data_finalizado', 'total_value',
-                'remaining_payment', 'id', 'renter__name', 'event__event_date',
-            }
-
-            ordering_fields = []
-            for field in ordering_param.split(','):
-                field = field.strip()
-                field_name = field.lstrip('-')
-                if field_name in ALLOWED_ORDERING_FIELDS:
-                    ordering_fields.append(field)
+            ordering_fields = [
+                field
+                for field in map(str.strip, ordering_param.split(","))
+                if field in _PHASE_LIST_ORDERING
+            ] or ["-order_date"]
+            orders_qs = orders_qs.order_by(*ordering_fields)
+
+            # Paginação: count cacheado por 60s para a mesma fase + filtros
+            # (a versão das listagens invalida quando alguma OS muda). A chave
+            # usa a fase resolvida e o campo de data efetivamente filtrado:
+            # "pendente" e "PENDENTE" resolvem a mesma fase mas não
+            # necessariamente o mesmo filtro de data
+            count_filters = (
+                phase.name,
+                date_field,
+                start_date,
+                end_date,
+                search,
+                filter_date,
+            )
+            count_key = "so_phase_count:%s:%s" % (
+                service_order_list_version(),
+                hashlib.md5(repr(count_filters).encode()).hexdigest(),
+            )
+            paginator = CachedCountPaginator(orders_qs, page_size, cache_key=count_key)
 
-            if ordering_fields:
-                orders_qs = orders_qs.order_by(*ordering_fields)
-            else:
-                orders_qs = orders_qs.order_by('-order_date')
+            # Nenhuma OS para a fase/filtros: o count (cacheado ou feito uma
+            # vez) já responde, sem buscar a página
+            if paginator.count == 0:
+                if page != 1:
+                    return Response({"error": "Página não encontrada"}, status=404)
+                return Response(
+                    {
+                        "count": 0,
+                        "page": page,
+                        "page_size": page_size,
+                        "total_pages": 1,
+                        "ordering": ordering_fields,
+                        "results": [],
+                    }
+                )
 
-            # Paginação
-            paginator = Paginator(orders_qs, page_size)
             try:
                 page_obj = paginator.page(page)
             except EmptyPage:
                 return Response({"error": "Página não encontrada"}, status=404)
 
-            results = []
-            for order in page_obj.object_list:
-                # Reaproveitar construção do payload igual ao V1
-                client_data = {
-                    "id": order.renter.id,
-                    "name": order.renter.name,
-                    "cpf": order.renter.cpf,
-                    "person_type": (
-                        {
-                            "id": order.renter.person_type.id,
-                            "type": order.renter.person_type.type,
-                        }
-                        if order.renter.person_type
-                        else None
-                    ),
-                }
-
-                contact = order.renter.contacts.order_by("-date_created", "-id").first()
-                client_data["contacts"] = []
-                if contact:
-                    client_data["contacts"].append(
-                        {
-                            "id": contact.id,
-                            "email": contact.email,
-                            "phone": contact.phone,
-                        }
-                    )
-
-                address = order.renter.personsadresses_set.order_by(
-                    "-date_created", "-id"
-                ).first()
-                client_data["addresses"] = []
-                if address:
-                    city_data = None
-                    if address.city:
-                        city_data = {
-                            "id": address.city.id,
-                            "name": address.city.name,
-                            "uf": address.city.uf,
-                        }
-
-                    client_data["addresses"].append(
-                        {
-                            "id": address.id,
-                            "cep": address.cep,
-                            "rua": address.street,
-                            "numero": address.number,
-                            "bairro": address.neighborhood,
-                            "complemento": address.complemento or "",
-                            "cidade": city_data,
-                        }
-                    )
-
-                order_data = {
-                    "id": order.id,
-                    "total_value": order.total_value,
-                    "advance_payment": order.advance_payment,
-                    "remaining_payment": order.remaining_payment,
-                    "esta_atrasada": order.esta_atrasada,
-                    "renter_role": order.renter_role,
-                    "employee_name": order.employee.name if order.employee else "",
-                    "order_date": order.order_date,
-                    "prova_date": order.prova_date,
-                    "retirada_date": order.retirada_date,
-                    "devolucao_date": order.devolucao_date,
-                    "production_date": order.production_date,
-                    "data_recusa": order.data_recusa,
-                    "data_finalizado": order.data_finalizado,
-                    "client": client_data,
-                    "justification_refusal": order.justification_refusal,
-                    "justification_reason": (
-                        order.justification_reason.name
-                        if order.justification_reason
-                        else None
-                    ),
-                    "event_date": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
-                    "event_name": order.event.name if order.event else None,
-                }
-
-                # Calcular justificativa do atraso como no V1
-                if phase.name == "ATRASADO":
-                    event_date = None
-                    if order.event and order.event.event_date:
-                        if hasattr(order.event.event_date, "date"):
-                            event_date = order.event.event_date.date()
-                        else:
-                            event_date = order.event.event_date
-
-                    if (
-                        order.devolucao_date
-                        and order.devolucao_date < today
-                        and event_date
-                        and event_date > today
-                    ):
-                        order_data["justificativa_atraso"] = (
-                            "Cliente ainda não devolveu"
-                        )
-                    elif (
-                        order.retirada_date
-                        and order.retirada_date < today
-                        and event_date
-                        and event_date > today
-                    ):
-                        order_data["justificativa_atraso"] = "Cliente não retirou"
-                    elif (
-                        order.data_devolvido is None
-                        and event_date
-                        and event_date < today
-                    ):
-                        order_data["justificativa_atraso"] = (
-                            "Cliente ainda não devolveu (evento passou)"
-                        )
-                    else:
-                        order_data["justificativa_atraso"] = None
-                else:
-                    order_data["justificativa_atraso"] = None
-
-                # Itens e acessórios (mesma lógica resumida)
-                itens = []
-                acessorios = []
-                for item in order.items.all():
-                    temp_product = item.temporary_product
-                    product = item.product
-
-                    if temp_product:
-                        if temp_product.product_type in [
-                            "paleto",
-                            "camisa",
-                            "calca",
-                            "colete",
-                        ]:
-                            item_data = {
-                                "tipo": temp_product.product_type,
-                                "cor": temp_product.color or "",
-                                "extras": temp_product.extras
-                                or temp_product.description
-                                or "",
-                                "venda": temp_product.venda or False,
-                                "extensor": False,
-                            }
-                            if temp_product.product_type in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size or "",
-                                        "manga": temp_product.sleeve_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "calca":
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size,
-                                        "cintura": temp_product.waist_size or "",
-                                        "perna": temp_product.leg_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste_cintura": temp_product.ajuste_cintura
-                                        or "",
-                                        "ajuste_comprimento": temp_product.ajuste_comprimento
-                                        or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "colete":
-                                item_data.update({"marca": temp_product.brand or ""})
-                            itens.append(item_data)
-                        else:
-                            acessorio_data = {
-                                "tipo": temp_product.product_type,
-                                "numero": temp_product.size or "",
-                                "cor": temp_product.color or "",
-                                "descricao": temp_product.description or "",
-                                "marca": temp_product.brand or "",
-                                "extensor": temp_product.extensor or False,
-                                "venda": temp_product.venda or False,
-                            }
-                            acessorios.append(acessorio_data)
-                    elif product:
-                        if product.tipo.lower() in [
-                            "paleto",
-                            "camisa",
-                            "calça",
-                            "colete",
-                        ]:
-                            item_data = {
-                                "tipo": product.tipo.lower(),
-                                "cor": product.cor or "",
-                                "extras": product.nome_produto or "",
-                                "venda": False,
-                                "extensor": False,
-                            }
-                            if product.tipo.lower() in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),
-                                        "manga": "",
-                                        "marca": product.marca or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "calça":
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),
-                                        "cintura": "",
-                                        "perna": "",
-                                        "marca": product.marca or "",
-                                        "ajuste_cintura": "",
-                                        "ajuste_comprimento": "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "colete":
-                                item_data.update({"marca": product.marca or ""})
-                            itens.append(item_data)
-                        else:
-                            acessorio_data = {
-                                "tipo": product.tipo.lower(),
-                                "numero": (
-                                    str(product.tamanho) if product.tamanho else ""
-                                ),
-                                "cor": product.cor or "",
-                                "descricao": product.nome_produto or "",
-                                "marca": product.marca or "",
-                                "extensor": False,
-                                "venda": False,
-                            }
-                            acessorios.append(acessorio_data)
-
-                ordem_servico_data = {
-                    "data_pedido": order.order_date,
-                    "data_evento": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
-                    "data_retirada": order.retirada_date,
-                    "data_devolucao": order.devolucao_date,
-                    "modalidade": order.service_type or "Aluguel",
-                    "itens": itens,
-                    "acessorios": acessorios,
-                    "pagamento": {
-                        "total": float(order.total_value) if order.total_value else 0,
-                        "sinal": (
-                            float(order.advance_payment) if order.advance_payment else 0
-                        ),
-                        "restante": (
-                            float(order.remaining_payment)
-                            if order.remaining_payment
-                            else 0
-                        ),
-                        "forma_pagamento": order.payment_method or "",
-                    },
-                }
-
-                order_data.update({"ordem_servico": ordem_servico_data})
-                results.append(order_data)
-
             response = {
                 "count": paginator.count,
                 "page": page,
                 "page_size": page_size,
                 "total_pages": paginator.num_pages,
-                "ordering": ordering_fields if ordering_fields else ['-order_date'],
-                "results": results,
+                "ordering": ordering_fields,
             }
 
+            renter_cache = {}
+            response["results"] = [
+                self._build_order_payload(order, phase, today, renter_cache)
+                for order in page_obj.object_list
+            ]
             return Response(response)
 
         except Exception as e:
@@ -4209,6 +3856,207 @@ class ServiceOrderListByPhaseV2APIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    def _build_order_payload(self, order, phase, today, renter_cache):
+        """Payload de uma OS da listagem (mesmo formato do V1)."""
+        # Dados do cliente (montados uma vez por cliente na página)
+        client_data = renter_cache.get(order.renter_id)
+        if client_data is None:
+            # Reaproveitar construção do payload igual ao V1
+            client_data = {
+                "id": order.renter.id,
+                "name": order.renter.name,
+                "cpf": order.renter.cpf,
+                "person_type": (
+                    {
+                        "id": order.renter.person_type.id,
+                        "type": order.renter.person_type.type,
+                    }
+                    if order.renter.person_type
+                    else None
+                ),
+            }
+
+            contact = next(iter(order.renter.prefetched_contacts), None)
+            client_data["contacts"] = []
+            if contact:
+                client_data["contacts"].append(
+                    {
+                        "id": contact.id,
+                        "email": contact.email,
+                        "phone": contact.phone,
+                    }
+                )
+
+            address = next(iter(order.renter.prefetched_addresses), None)
+            client_data["addresses"] = []
+            if address:
+                city_data = None
+                if address.city:
+                    city_data = {
+                        "id": address.city.id,
+                        "name": address.city.name,
+                        "uf": address.city.uf,
+                    }
+
+                client_data["addresses"].append(
+                    {
+                        "id": address.id,
+                        "cep": address.cep,
+                        "rua": address.street,
+                        "numero": address.number,
+                        "bairro": address.neighborhood,
+                        "complemento": address.complemento or "",
+                        "cidade": city_data,
+                    }
+                )
+            renter_cache[order.renter_id] = client_data
+
+        # Event.event_date é DateField: já chega como date
+        event_date = order.event.event_date if order.event else None
+
+        order_data = {
+            "id": order.id,
+            "total_value": order.total_value,
+            "advance_payment": order.advance_payment,
+            "remaining_payment": order.remaining_payment,
+            "esta_atrasada": order.esta_atrasada,
+            "renter_role": order.renter_role,
+            "employee_name": order.employee.name if order.employee else "",
+            "order_date": order.order_date,
+            "prova_date": order.prova_date,
+            "retirada_date": order.retirada_date,
+            "devolucao_date": order.devolucao_date,
+            "production_date": order.production_date,
+            "data_recusa": order.data_recusa,
+            "data_finalizado": order.data_finalizado,
+            "client": client_data,
+            "justification_refusal": order.justification_refusal,
+            "justification_reason": (
+                order.justification_reason.name
+                if order.justification_reason
+                else None
+            ),
+            "event_date": event_date,
+            "event_name": order.event.name if order.event else None,
+        }
+
+        # Calcular justificativa do atraso como no V1
+        if phase.name == "ATRASADO":
+            if (
+                order.devolucao_date
+                and order.devolucao_date < today
+                and event_date
+                and event_date > today
+            ):
+                order_data["justificativa_atraso"] = (
+                    "Cliente ainda não devolveu"
+                )
+            elif (
+                order.retirada_date
+                and order.retirada_date < today
+                and event_date
+                and event_date > today
+            ):
+                order_data["justificativa_atraso"] = "Cliente não retirou"
+            elif (
+                order.data_devolvido is None
+                and event_date
+                and event_date < today
+            ):
+                order_data["justificativa_atraso"] = (
+                    "Cliente ainda não devolveu (evento passou)"
+                )
+            else:
+                order_data["justificativa_atraso"] = None
+        else:
+            order_data["justificativa_atraso"] = None
+
+        # Itens, acessórios e pagamento (mesmo bloco da listagem por cliente)
+        order_data["ordem_servico"] = _build_ordem_servico(order, event_date)
+        return order_data
+
+    def _build_orders_qs(self, phase, today):
+        """Queryset da fase com todos os select_related/prefetch do payload.
+
+        Ponto único de montagem para que as fases não divirjam entre si.
+        """
+        base_qs = ServiceOrder.objects.filter(is_virtual=False)
+
+        if phase.name == "ATRASADO":
+            aguardando_devolucao_phase = phase_by_name("AGUARDANDO_DEVOLUCAO")
+
+            # Apenas ordens atrasadas na DEVOLUÇÃO (roupas não devolvidas)
+            q_devolucao_atrasada = models.Q(
+                service_order_phase=aguardando_devolucao_phase,
+                devolucao_date__lt=today,
+                data_devolvido__isnull=True,
+            )
+            q_evento_passado_devolucao = models.Q(
+                service_order_phase=aguardando_devolucao_phase,
+                data_devolvido__isnull=True,
+                event__event_date__lt=today,
+                event__isnull=False,
+            )
+            orders_qs = base_qs.filter(
+                q_devolucao_atrasada | q_evento_passado_devolucao
+            ).distinct()
+        else:
+            orders_qs = base_qs.filter(service_order_phase=phase)
+
+        # Contato e endereço mais recentes do cliente: uma query cada para
+        # toda a página, lidos no loop via to_attr (ordenados desc).
+        # only(): carregar apenas as colunas lidas no payload
+        return orders_qs.select_related(
+            "renter",
+            "employee",
+            "attendant",
+            "renter__person_type",
+            "event",
+            "justification_reason",
+        ).only(
+            "id",
+            "total_value",
+            "advance_payment",
+            "remaining_payment",
+            "esta_atrasada",
+            "renter_role",
+            "order_date",
+            "prova_date",
+            "retirada_date",
+            "devolucao_date",
+            "production_date",
+            "data_recusa",
+            "data_finalizado",
+            "data_devolvido",
+            "justification_refusal",
+            "service_type",
+            "payment_method",
+            "renter__id",
+            "renter__name",
+            "renter__cpf",
+            "renter__person_type__id",
+            "renter__person_type__type",
+            "employee__name",
+            "attendant__name",
+            "event__name",
+            "event__event_date",
+            "justification_reason__name",
+        ).prefetch_related(
+            _order_items_prefetch(),
+            models.Prefetch(
+                "renter__contacts",
+                queryset=PersonsContacts.objects.order_by("-date_created", "-id"),
+                to_attr="prefetched_contacts",
+            ),
+            models.Prefetch(
+                "renter__personsadresses_set",
+                queryset=PersonsAdresses.objects.select_related("city").order_by(
+                    "-date_created", "-id"
+                ),
+                to_attr="prefetched_addresses",
+            ),
+        )
+
 
 @extend_schema(
     tags=["service-orders"],
@@ -4281,51 +4129,25 @@ class VirtualServiceOrderCreateAPIView(APIView):
                     )
 
             payment_details = []
-            advance_payment = Decimal("0")
+            advance_payment = _ZERO
             payment_methods = []
 
-            if data.get("sinal"):
-                sinal = data["sinal"]
-                sinal_amount = Decimal(str(sinal["amount"]))
-                payment_details.append(_build_payment_entry(
-                    float(sinal_amount), sinal["forma_pagamento"], "sinal", data=sinal.get("data"),
-                ))
-                advance_payment += sinal_amount
-                if sinal["forma_pagamento"] not in payment_methods:
-                    payment_methods.append(sinal["forma_pagamento"])
-
-            if data.get("restante"):
-                restante = data["restante"]
-                restante_amount = Decimal(str(restante["amount"]))
-                payment_details.append(_build_payment_entry(
-                    float(restante_amount), restante["forma_pagamento"], "restante", data=restante.get("data"),
-                ))
-                advance_payment += restante_amount
-                if restante["forma_pagamento"] not in payment_methods:
-                    payment_methods.append(restante["forma_pagamento"])
-
-            if data.get("indenizacao"):
-                indenizacao = data["indenizacao"]
-                indenizacao_amount = Decimal(str(indenizacao["amount"]))
-                payment_details.append(_build_payment_entry(
-                    float(indenizacao_amount), indenizacao["forma_pagamento"], "indenizacao", data=indenizacao.get("data"),
-                ))
-                advance_payment += indenizacao_amount
-                if indenizacao["forma_pagamento"] not in payment_methods:
-                    payment_methods.append(indenizacao["forma_pagamento"])
-
-            if data.get("estorno"):
-                # Estorno = dinheiro saindo. Amount is stored positively in
-                # payment_details (tipo="estorno") but advance_payment is DECREASED
-                # so finance aggregations show negative value (item #5).
-                estorno = data["estorno"]
-                estorno_amount = Decimal(str(estorno["amount"]))
+            for tipo in _VIRTUAL_PAYMENT_TYPES:
+                lancamento = data.get(tipo)
+                if not lancamento:
+                    continue
+                amount = Decimal(str(lancamento["amount"]))
                 payment_details.append(_build_payment_entry(
-                    float(estorno_amount), estorno["forma_pagamento"], "estorno", data=estorno.get("data"),
+                    amount, lancamento["forma_pagamento"], tipo, data=lancamento.get("data"),
                 ))
-                advance_payment -= estorno_amount
-                if estorno["forma_pagamento"] not in payment_methods:
-                    payment_methods.append(estorno["forma_pagamento"])
+                if tipo == "estorno":
+                    # Estorno = dinheiro saindo. Amount is stored positively in
+                    # payment_details (tipo="estorno") but advance_payment is DECREASED
+                    # so finance aggregations show negative value (item #5).
+                    advance_payment -= amount
+                else:
+                    advance_payment += amount
+                payment_methods.append(lancamento["forma_pagamento"])
 
             service_order = ServiceOrder.objects.create(
                 renter=renter,
@@ -4334,7 +4156,8 @@ class VirtualServiceOrderCreateAPIView(APIView):
                 total_value=data["total_value"],
                 advance_payment=advance_payment,
                 payment_details=payment_details,
-                payment_method=", ".join(payment_methods) if payment_methods else None,
+                # dict.fromkeys: remove repetidas mantendo a ordem de lançamento
+                payment_method=", ".join(dict.fromkeys(payment_methods)) or None,
                 observations=data.get("observations", ""),
                 is_virtual=True,
                 created_by=request.user,
@@ -4417,31 +4240,31 @@ class VirtualServiceOrderDeleteAPIView(APIView):
             "Exemplo de resposta",
             value={
                 "total_transactions": 3,
-                "total_amount": "450.00",
+                "total_amount": 450.0,
                 "transactions": [
                     {
                         "order_id": 123,
                         "transaction_type": "sinal",
-                        "amount": "150.00",
+                        "amount": 150.0,
                         "payment_method": "debito",
                         "date": "2025-11-10",
                     },
                     {
                         "order_id": 123,
                         "transaction_type": "sinal",
-                        "amount": "150.00",
+                        "amount": 150.0,
                         "payment_method": "pix",
                         "date": "2025-11-10",
                     },
                     {
                         "order_id": 123,
                         "transaction_type": "restante",
-                        "amount": "150.00",
+                        "amount": 150.0,
                         "payment_method": "pix",
                         "date": "2025-11-12",
                     },
                 ],
-                "totals_by_method": {"debito": "150.00", "pix": "300.00"},
+                "totals_by_method": {"debito": 150.0, "pix": 300.0},
             },
             response_only=True,
             status_codes=["200"],
@@ -4450,8 +4273,26 @@ class VirtualServiceOrderDeleteAPIView(APIView):
 )
 class ServiceOrderFinanceSummaryAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     serializer_class = ServiceOrderFinanceSummarySerializer
 
+    # Colunas de cada OS usadas para montar as transações
+    ROW_FIELDS = (
+        "id",
+        "order_date",
+        "advance_payment",
+        "remaining_payment",
+        "payment_details",
+        "payment_method",
+        "is_virtual",
+        "data_devolvido",
+        "client_name",
+        "observations",
+        "is_finalized",
+        "renter_id",
+        "renter__name",
+    )
+
     def get(self, request):
         """Retorna total de transações e forma de pagamento de cada uma"""
 
@@ -4473,50 +4314,180 @@ class ServiceOrderFinanceSummaryAPIView(APIView):
         if page_size <= 0:
             page_size = 50
 
-        orders = ServiceOrder.objects.select_related("service_order_phase", "renter")
+        # Linhas como dicts (values): só as colunas lidas, sem instanciar modelos;
+        # a fase vira um booleano calculado no banco
+        orders = ServiceOrder.objects.annotate(
+            is_finalized=models.Case(
+                models.When(service_order_phase__name="FINALIZADO", then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+        ).values(*self.ROW_FIELDS)
 
-        # Don't filter by order_date here - we'll filter individual transactions by payment date
+        # Datas inválidas são ignoradas (mesmo comportamento nos dois caminhos abaixo)
+        start_date = self._iso_date_or_none(start_date)
+        end_date = self._iso_date_or_none(end_date)
 
-        transactions = []
-        total_amount = Decimal("0")
+        # Don't filter by order_date here - we'll filter individual transactions by payment date
 
         # Cancelamento preserva caixa (item #12): we INTENTIONALLY do NOT exclude
         # RECUSADA orders here — the money was collected and must show in Financeiro.
         # Only the planilha's total_vendido/total_os metrics exclude RECUSADA.
 
+        # Totais sobre TODAS as transações (não paginados), acumulados enquanto
+        # as OS são lidas em blocos; só as transações até o fim da página
+        # pedida ficam em memória (nlargest = sorted(reverse=True)[:n])
+        total_transactions = 0
+        total_amount = _ZERO
+        totals_by_method = defaultdict(Decimal)
+
+        def _counted(transactions):
+            nonlocal total_transactions, total_amount
+            for t in transactions:
+                total_transactions += 1
+                total_amount += t["amount"]
+                totals_by_method[t.get("payment_method") or "NÃO INFORMADO"] += t["amount"]
+                yield t
+
+        # Sort transactions by date and time (most recent first).
+        # Some "date" values are strings (from payment_details), others are
+        # date/datetime objects (fallback to order_date / data_devolvido).
+        # Coerce everything to string to avoid TypeError on mixed-type compare.
+        def _sort_key(t):
+            d = t.get("date")
+            tm = t.get("time")
+            return (str(d) if d is not None else "", str(tm) if tm is not None else "")
+
+        # Aplicar paginação às transações
+        start_idx = (page - 1) * page_size
+        end_idx = start_idx + page_size
+
+        # OS legadas (sem payment_details): o sinal é um único valor por OS com
+        # data = order_date, então os totais saem de um GROUP BY no banco e
+        # só as end_idx OS mais recentes entram na disputa pela página
+        legacy = models.Q(payment_details__isnull=True) | models.Q(payment_details=[])
+        legacy_advance = legacy & models.Q(advance_payment__gt=0)
+        if start_date:
+            legacy_advance &= models.Q(order_date__gte=start_date)
+        if end_date:
+            legacy_advance &= models.Q(order_date__lte=end_date)
+        # Sem o annotate da fase: o GROUP BY não precisa do JOIN
+        for row in (
+            ServiceOrder.objects.filter(legacy_advance)
+            .values("payment_method")
+            .annotate(total=models.Sum("advance_payment"), n=models.Count("id"))
+        ):
+            total_transactions += row["n"]
+            total_amount += row["total"]
+            totals_by_method[row["payment_method"] or "NÃO INFORMADO"] += row["total"]
+
+        paginated_transactions = heapq.nlargest(
+            end_idx,
+            chain(
+                _counted(
+                    self._iter_transactions(
+                        orders.exclude(legacy).iterator(chunk_size=500),
+                        start_date,
+                        end_date,
+                    )
+                ),
+                # Restante das OS legadas FINALIZADO continua em Python
+                _counted(
+                    self._iter_transactions(
+                        orders.filter(
+                            legacy,
+                            service_order_phase__name="FINALIZADO",
+                            remaining_payment__gt=0,
+                        ).iterator(chunk_size=500),
+                        start_date,
+                        end_date,
+                        include_advance=False,
+                    )
+                ),
+                map(
+                    self._advance_transaction,
+                    orders.filter(legacy_advance).order_by("-order_date", "-id")[:end_idx],
+                ),
+            ),
+            key=_sort_key,
+        )[start_idx:]
+
+        total_pages = (total_transactions + page_size - 1) // page_size if page_size > 0 else 1
+
+        summary = {
+            "count": total_transactions,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "total_transactions": total_transactions,
+            "total_amount": total_amount.quantize(_TWO_PLACES),
+            "transactions": paginated_transactions,
+            "totals_by_method": {
+                method: total.quantize(_TWO_PLACES)
+                for method, total in totals_by_method.items()
+            },
+        }
+
+        return Response(summary)
+
+    @staticmethod
+    def _iso_date_or_none(value):
+        """A string YYYY-MM-DD recebida, ou None se ausente/inválida"""
+        if not value:
+            return None
+        try:
+            date.fromisoformat(value)
+        except ValueError:
+            return None
+        return value
+
+    @staticmethod
+    def _advance_transaction(order):
+        """Transação de sinal de uma OS sem payment_details (data = order_date)"""
+        return {
+            "order_id": order["id"],
+            "transaction_type": "sinal",
+            "amount": order["advance_payment"],
+            "payment_method": order["payment_method"] or "NÃO INFORMADO",
+            "date": order["order_date"],
+            "time": None,
+            "is_virtual": order["is_virtual"],
+            "client_name": order["renter__name"] if order["renter_id"] else order["client_name"],
+            "description": order["observations"],
+        }
+
+    def _iter_transactions(self, orders, start_date, end_date, include_advance=True):
+        """Gera as transações (sinal/restante/estorno...) de cada OS, filtradas pela data do pagamento"""
         for order in orders:
+            adv = order["advance_payment"]
+            payment_details = order["payment_details"]
+            if not isinstance(payment_details, list):
+                payment_details = None
 
-            try:
-                adv = order.advance_payment if order.advance_payment is not None else 0
-            except Exception:
-                adv = 0
+            # Sem sinal, sem pagamentos e não finalizada: nada a gerar
+            if not (payment_details or (adv and adv > 0) or order["is_finalized"]):
+                continue
 
-            has_payment_details = order.payment_details and isinstance(order.payment_details, list)
-            if (adv and float(adv) > 0) or has_payment_details:
-                if has_payment_details:
+            if include_advance and (payment_details or (adv and adv > 0)):
+                if payment_details:
                     # Get client name
-                    client_name = order.renter.name if order.renter else order.client_name
+                    client_name = order["renter__name"] if order["renter_id"] else order["client_name"]
+                    # Data usada pelas entradas sem "data" (comum a todas da OS)
+                    default_pag_date = _as_date_iso(order["order_date"])
 
-                    for pag in order.payment_details:
+                    for pag in payment_details:
                         amt = Decimal(str(pag.get("amount", 0)))
                         pm = pag.get("forma_pagamento", "NÃO INFORMADO")
                         tipo = pag.get("tipo", "sinal")
-                        pag_data = pag.get("data")
-                        pag_date = None
-                        pag_time = None
-                        if pag_data:
-                            if isinstance(pag_data, str):
-                                pag_date = pag_data[:10]
-                                # Extract time from ISO format (HH:MM:SS)
-                                # Treat midnight (00:00:00) as no time recorded
-                                if len(pag_data) > 10:
-                                    extracted_time = pag_data[11:19]
-                                    if extracted_time and extracted_time != "00:00:00":
-                                        pag_time = extracted_time
-                            else:
-                                pag_date = str(pag_data)[:10]
-                        else:
-                            pag_date = str(order.order_date)
+                        # "data" é sempre string ISO (JSONField sem encoder de datas;
+                        # gravada por _build_payment_entry)
+                        pag_data = pag.get("data") or ""
+                        pag_date = pag_data[:10] or default_pag_date
+                        # Extract time from ISO format (HH:MM:SS)
+                        # Treat midnight (00:00:00) as no time recorded
+                        pag_time = pag_data[11:19]
+                        if pag_time in ("", "00:00:00"):
+                            pag_time = None
 
                         # Filter by actual payment date
                         if start_date and pag_date and pag_date < start_date:
@@ -4527,133 +4498,65 @@ class ServiceOrderFinanceSummaryAPIView(APIView):
                         if amt > 0 or tipo == "estorno":
                             # Apenas estornos são subtraídos (indenização é pagamento do cliente)
                             effective_amt = -abs(amt) if tipo == "estorno" else amt
-                            transactions.append({
-                                "order_id": order.id,
+                            yield {
+                                "order_id": order["id"],
                                 "entry_id": pag.get("id"),
                                 "transaction_type": tipo,
                                 "amount": effective_amt,
                                 "payment_method": pm,
                                 "date": pag_date,
                                 "time": pag_time,
-                                "is_virtual": order.is_virtual,
+                                "is_virtual": order["is_virtual"],
                                 "client_name": client_name,
-                                "description": order.observations,
-                            })
-                            total_amount += effective_amt
+                                "description": order["observations"],
+                            }
                 else:
                     # Fallback: use order_date as the payment date
-                    fallback_date = str(order.order_date)
+                    fallback_date = _as_date_iso(order["order_date"])
                     # Filter by date
                     if start_date and fallback_date < start_date:
                         pass  # skip this transaction
                     elif end_date and fallback_date > end_date:
                         pass  # skip this transaction
                     else:
-                        amt = Decimal(str(float(adv)))
-                        pm = order.payment_method or "NÃO INFORMADO"
-                        client_name = order.renter.name if order.renter else order.client_name
-                        transactions.append({
-                            "order_id": order.id,
-                            "transaction_type": "sinal",
-                            "amount": amt,
-                            "payment_method": pm,
-                            "date": order.order_date,
-                            "time": None,
-                            "is_virtual": order.is_virtual,
-                            "client_name": client_name,
-                            "description": order.observations,
-                        })
-                        total_amount += amt
+                        yield self._advance_transaction(order)
 
             # Fallback for legacy orders: remaining_payment without payment_details entry
             # Check if order is FINALIZADO and has remaining_payment not in payment_details
-            if (
-                order.service_order_phase
-                and order.service_order_phase.name == "FINALIZADO"
-            ):
-                try:
-                    rem = (
-                        order.remaining_payment
-                        if order.remaining_payment is not None
-                        else 0
-                    )
-                except Exception:
-                    rem = 0
+            if order["is_finalized"]:
+                rem = order["remaining_payment"]
 
-                if rem and float(rem) > 0:
+                if rem and rem > 0:
                     # Check if remaining payment is already in payment_details
-                    has_restante_in_details = False
-                    if order.payment_details and isinstance(order.payment_details, list):
-                        has_restante_in_details = any(
-                            pag.get("tipo") == "restante" for pag in order.payment_details
-                        )
+                    has_restante_in_details = bool(payment_details) and any(
+                        pag.get("tipo") == "restante" for pag in payment_details
+                    )
 
                     if not has_restante_in_details:
                         # Use data_devolvido or order_date as fallback
-                        rem_date = str(order.data_devolvido or order.order_date)
+                        # Só a parte da data: data_devolvido é DateTime e o str()
+                        # completo ficava "maior" que um end_date do mesmo dia
+                        rem_date = _as_date_iso(order["data_devolvido"] or order["order_date"])
                         # Filter by date
                         if start_date and rem_date < start_date:
                             pass  # skip
                         elif end_date and rem_date > end_date:
                             pass  # skip
                         else:
-                            amt = Decimal(str(float(rem)))
-                            pm = order.payment_method or "NÃO INFORMADO"
-                            client_name = order.renter.name if order.renter else None
-                            transactions.append(
-                                {
-                                    "order_id": order.id,
-                                    "transaction_type": "restante",
-                                    "amount": amt,
-                                    "payment_method": pm,
-                                    "date": order.data_devolvido or order.order_date,
-                                    "time": None,
-                                    "is_virtual": order.is_virtual,
-                                    "client_name": client_name,
-                                    "description": order.observations,
-                                }
-                            )
-                            total_amount += amt
-
-        # build totals_by_method (sobre TODAS as transações, não paginado)
-        totals_by_method = {}
-        for t in transactions:
-            key = t.get("payment_method") or "NÃO INFORMADO"
-            if key not in totals_by_method:
-                totals_by_method[key] = Decimal("0")
-            totals_by_method[key] += Decimal(str(t.get("amount")))
-
-        # Sort transactions by date and time (most recent first).
-        # Some "date" values are strings (from payment_details), others are
-        # date/datetime objects (fallback to order_date / data_devolvido).
-        # Coerce everything to string to avoid TypeError on mixed-type compare.
-        def _sort_key(t):
-            d = t.get("date")
-            tm = t.get("time")
-            return (str(d) if d is not None else "", str(tm) if tm is not None else "")
-
-        transactions.sort(key=_sort_key, reverse=True)
-
-        # Aplicar paginação às transações
-        total_transactions = len(transactions)
-        total_pages = (total_transactions + page_size - 1) // page_size if page_size > 0 else 1
-
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_transactions = transactions[start_idx:end_idx]
-
-        summary = {
-            "count": total_transactions,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": total_pages,
-            "total_transactions": total_transactions,
-            "total_amount": total_amount,
-            "transactions": paginated_transactions,
-            "totals_by_method": totals_by_method,
-        }
-
-        return Response(summary)
+                            amt = rem
+                            pm = order["payment_method"] or "NÃO INFORMADO"
+                            client_name = order["renter__name"] if order["renter_id"] else None
+                            yield {
+                                "order_id": order["id"],
+                                "transaction_type": "restante",
+                                "amount": amt,
+                                "payment_method": pm,
+                                "date": order["data_devolvido"] or order["order_date"],
+                                "time": None,
+                                "is_virtual": order["is_virtual"],
+                                "client_name": client_name,
+                                "description": order["observations"],
+                            }
 
 
 class ServiceOrderRefundAPIView(APIView):
@@ -4688,7 +4591,7 @@ class ServiceOrderRefundAPIView(APIView):
 
             current_details = service_order.payment_details or []
             current_details.append(_build_payment_entry(
-                float(refund_amount),
+                refund_amount,
                 forma_pagamento,
                 "estorno",
                 data=data_pagamento,
@@ -4696,7 +4599,7 @@ class ServiceOrderRefundAPIView(APIView):
             ))
             service_order.payment_details = current_details
             service_order.advance_payment = (
-                service_order.advance_payment or Decimal("0")
+                service_order.advance_payment or _ZERO
             ) - refund_amount
             service_order.save()
 
@@ -4734,7 +4637,7 @@ class ServiceOrderAddPaymentAPIView(APIView):
                 )
 
             current_details = service_order.payment_details or []
-            total_added = Decimal("0")
+            total_added = _ZERO
             formas = []
 
             for pag in payments:
@@ -4752,7 +4655,7 @@ class ServiceOrderAddPaymentAPIView(APIView):
                 total_added += pag_amount
 
                 current_details.append(_build_payment_entry(
-                    float(pag_amount),
+                    pag_amount,
                     forma,
                     "parcial",
                     data=data_pagamento,
@@ -4762,7 +4665,7 @@ class ServiceOrderAddPaymentAPIView(APIView):
 
             service_order.payment_details = current_details
             service_order.advance_payment = (
-                service_order.advance_payment or Decimal("0")
+                service_order.advance_payment or _ZERO
             ) + total_added
 
             # Atualizar payment_method
@@ -4997,6 +4900,7 @@ class ServiceOrderChangePhaseAPIView(APIView):
 )
 class ServiceOrderListByClientAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     serializer_class = ServiceOrderListByPhaseSerializer
 
     def get(self, request, renter_id):
@@ -5022,12 +4926,14 @@ class ServiceOrderListByClientAPIView(APIView):
                     "service_order_phase",
                     "event",
                 )
-                .prefetch_related("items__temporary_product", "items__product")
+                .prefetch_related(_order_items_prefetch())
                 .order_by("-order_date")
             )
 
             data = []
             for order in orders:
+                event_date = order.event.event_date if order.event else None
+
                 # Dados da OS
                 order_data = {
                     "id": order.id,
@@ -5053,180 +4959,12 @@ class ServiceOrderListByClientAPIView(APIView):
                         if order.service_order_phase
                         else None
                     ),
-                    "event_date": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
+                    "event_date": event_date,
                     "event_name": order.event.name if order.event else None,
                 }
 
-                # Processar itens da OS
-                itens = []
-                acessorios = []
-
-                for item in order.items.all():
-                    # Determinar se é produto temporário ou produto real
-                    temp_product = item.temporary_product
-                    product = item.product
-
-                    if temp_product:
-                        # Produto temporário
-                        if temp_product.product_type in [
-                            "paleto",
-                            "camisa",
-                            "calca",
-                            "colete",
-                        ]:
-                            # Item de roupa
-                            item_data = {
-                                "tipo": temp_product.product_type,
-                                "cor": temp_product.color or "",
-                                "extras": temp_product.extras
-                                or temp_product.description
-                                or "",
-                                "venda": temp_product.venda or False,
-                                "extensor": False,
-                            }
-
-                            # Campos específicos por tipo
-                            if temp_product.product_type in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size or "",
-                                        "manga": temp_product.sleeve_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "calca":
-                                item_data.update(
-                                    {
-                                        "numero": temp_product.size,
-                                        "cintura": temp_product.waist_size or "",
-                                        "perna": temp_product.leg_length or "",
-                                        "marca": temp_product.brand or "",
-                                        "ajuste_cintura": temp_product.ajuste_cintura
-                                        or "",
-                                        "ajuste_comprimento": temp_product.ajuste_comprimento
-                                        or "",
-                                    }
-                                )
-                            elif temp_product.product_type == "colete":
-                                item_data.update({"marca": temp_product.brand or ""})
-
-                            itens.append(item_data)
-                        else:
-                            # Acessório
-                            acessorio_data = {
-                                "tipo": temp_product.product_type,
-                                "numero": temp_product.size or "",
-                                "cor": temp_product.color or "",
-                                "descricao": temp_product.description or "",
-                                "marca": temp_product.brand or "",
-                                "extensor": temp_product.extensor or False,
-                                "venda": temp_product.venda or False,
-                            }
-                            acessorios.append(acessorio_data)
-
-                    elif product:
-                        # Produto real do estoque
-                        if product.tipo.lower() in [
-                            "paleto",
-                            "camisa",
-                            "calça",
-                            "colete",
-                        ]:
-                            # Item de roupa
-                            item_data = {
-                                "tipo": product.tipo.lower(),
-                                "cor": product.cor or "",
-                                "extras": product.nome_produto or "",
-                                "venda": False,
-                                "extensor": False,
-                            }
-
-                            # Campos específicos por tipo
-                            if product.tipo.lower() in ["paleto", "camisa"]:
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),
-                                        "manga": "",
-                                        "marca": product.marca or "",
-                                        "ajuste": item.adjustment_notes or "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "calça":
-                                item_data.update(
-                                    {
-                                        "numero": (
-                                            str(product.tamanho)
-                                            if product.tamanho
-                                            else ""
-                                        ),
-                                        "cintura": "",
-                                        "perna": "",
-                                        "marca": product.marca or "",
-                                        "ajuste_cintura": "",
-                                        "ajuste_comprimento": "",
-                                    }
-                                )
-                            elif product.tipo.lower() == "colete":
-                                item_data.update({"marca": product.marca or ""})
-
-                            itens.append(item_data)
-                        else:
-                            # Acessório
-                            acessorio_data = {
-                                "tipo": product.tipo.lower(),
-                                "numero": (
-                                    str(product.tamanho) if product.tamanho else ""
-                                ),
-                                "cor": product.cor or "",
-                                "descricao": product.nome_produto or "",
-                                "marca": product.marca or "",
-                                "extensor": False,
-                                "venda": False,
-                            }
-                            acessorios.append(acessorio_data)
-
                 # Dados da ordem de serviço no formato esperado pelo frontend
-                ordem_servico_data = {
-                    "data_pedido": order.order_date,
-                    "data_evento": (
-                        order.event.event_date.date()
-                        if order.event
-                        and order.event.event_date
-                        and hasattr(order.event.event_date, "date")
-                        else order.event.event_date if order.event else None
-                    ),
-                    "data_retirada": order.retirada_date,
-                    "data_devolucao": order.devolucao_date,
-                    "modalidade": order.service_type or "Aluguel",
-                    "itens": itens,
-                    "acessorios": acessorios,
-                    "pagamento": {
-                        "total": float(order.total_value) if order.total_value else 0,
-                        "sinal": (
-                            float(order.advance_payment) if order.advance_payment else 0
-                        ),
-                        "restante": (
-                            float(order.remaining_payment)
-                            if order.remaining_payment
-                            else 0
-                        ),
-                        "forma_pagamento": order.payment_method or "",
-                    },
-                }
-
-                # Adicionar dados completos ao response
-                order_data.update({"ordem_servico": ordem_servico_data})
+                order_data["ordem_servico"] = _build_ordem_servico(order, event_date)
 
                 data.append(order_data)
 
@@ -5262,7 +5000,11 @@ class ServiceOrderClientAPIView(APIView):
             contact = person.contacts.order_by("-date_created", "-id").first()
 
             # Buscar endereço mais recente baseado em date_created
-            address = person.personsadresses_set.order_by("-date_created", "-id").first()
+            address = (
+                person.personsadresses_set.select_related("city")
+                .order_by("-date_created", "-id")
+                .first()
+            )
 
             data = {
                 "id": person.id,
@@ -5483,7 +5225,7 @@ class ServiceOrderPlanilhaAPIView(APIView):
             # Build payment-level rows (one row per payment entry)
             rows = []
             seen_os_ids = set()
-            total_recebido = Decimal("0")
+            total_recebido = _ZERO
 
             for order in qs.iterator():
                 if order.payment_details and isinstance(order.payment_details, list):
@@ -5561,7 +5303,7 @@ class ServiceOrderPlanilhaAPIView(APIView):
                 vendido_qs = vendido_qs.filter(order_date__lte=end_date)
             total_vendido = vendido_qs.aggregate(
                 s=models.Sum("total_value")
-            )["s"] or Decimal("0")
+            )["s"] or _ZERO
 
             totals = {
                 "total_os": total_os_count,
@@ -5619,8 +5361,7 @@ class ServiceOrderPreTriageAPIView(APIView):
         """Criação de pré-ordem de serviço pela recepção ou administrador"""
         try:
             data = request.data
-            cpf_raw = data.get("cpf", "") or ""
-            cpf = cpf_raw.replace(".", "").replace("-", "").strip()
+            cpf = clean_cpf(data.get("cpf"))
             is_infant = data.get("is_infant", False)
 
             # CPF é opcional na triagem - se fornecido, deve ser válido
@@ -5631,74 +5372,6 @@ class ServiceOrderPreTriageAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            pt, _ = PersonType.objects.get_or_create(type="CLIENTE")
-
-            # Se is_infant=True, gerar UUID placeholder para CPF
-            if is_infant:
-                cpf = f"CRIANCA-{uuid.uuid4().hex[:12].upper()}"
-                person = Person.objects.create(
-                    name=data.get("cliente_nome", "").upper(),
-                    cpf=cpf,
-                    person_type=pt,
-                    is_infant=True,
-                    created_by=request.user,
-                )
-            # Se CPF foi fornecido, buscar ou criar pessoa por CPF
-            elif cpf:
-                person, _ = Person.objects.get_or_create(
-                    cpf=cpf,
-                    defaults={
-                        "name": data.get("cliente_nome", "").upper(),
-                        "person_type": pt,
-                        "created_by": request.user,
-                    },
-                )
-            else:
-                # Criar pessoa temporária sem CPF
-                person = Person.objects.create(
-                    name=data.get("cliente_nome", "").upper(),
-                    cpf=None,  # Será preenchido no update da OS
-                    person_type=pt,
-                    created_by=request.user,
-                )
-
-            # Processar contatos apenas se fornecidos
-            email = data.get("email") or ""
-            telefone = data.get("telefone") or ""
-
-            email = email.strip() if email else None
-            telefone = telefone.strip() if telefone else None
-
-            # Criar contato apenas se pelo menos um (email ou telefone) foi fornecido
-            if email or telefone:
-                contact_exists = PersonsContacts.objects.filter(
-                    phone=telefone, person=person
-                ).exists()
-                if not contact_exists:
-                    PersonsContacts.objects.create(
-                        phone=telefone,
-                        person=person,
-                        email=email,
-                        created_by=request.user,
-                    )
-            endereco = data.get("endereco", {})
-            cidade_nome = endereco.get("cidade")
-            if cidade_nome:
-                city_obj = City.objects.filter(name__iexact=cidade_nome.upper()).first()
-                if city_obj:
-                    address_lookup = dict(
-                        person=person,
-                        street=endereco.get("rua") or "",
-                        number=endereco.get("numero") or "",
-                        cep=endereco.get("cep") or "",
-                        complemento=endereco.get("complemento") or "",
-                        neighborhood=endereco.get("bairro") or "",
-                        city=city_obj,
-                    )
-                    if not PersonsAdresses.objects.filter(**address_lookup).exists():
-                        PersonsAdresses.objects.create(
-                            **address_lookup, created_by=request.user
-                        )
             # Atendente é opcional - será vinculado depois na criação da OS
             atendente_id = data.get("atendente_id")
             atendente = None
@@ -5725,25 +5398,114 @@ class ServiceOrderPreTriageAPIView(APIView):
                         status=status.HTTP_400_BAD_REQUEST,
                     )
 
-            service_order_phase = ServiceOrderPhase.objects.filter(
-                name="PENDENTE"
-            ).first()
+            nome = (data.get("cliente_nome") or "").upper()
 
-            # tipo_servico é opcional na triagem - será definido posteriormente via modalidade
-            tipo_servico = data.get("tipo_servico")
-            purchase = tipo_servico == "Venda" if tipo_servico else False
+            # Pessoa, contato, endereço e OS são gravados juntos (um único commit)
+            with transaction.atomic():
+                pt = person_type_by_name("CLIENTE")
 
-            service_order = ServiceOrder.objects.create(
-                renter=person,
-                employee=atendente,
-                attendant=request.user.person,
-                order_date=date.today(),
-                renter_role=data.get("papel_evento", "").upper(),
-                purchase=purchase,
-                service_type=tipo_servico,  # Pode ser None
-                came_from=data.get("origem", "").upper(),
-                service_order_phase=service_order_phase,
-                event=event_obj,
+                # Se is_infant=True, gerar UUID placeholder para CPF
+                if is_infant:
+                    cpf = f"CRIANCA-{uuid.uuid4().hex[:12].upper()}"
+                    person = Person.objects.create(
+                        name=nome,
+                        cpf=cpf,
+                        person_type=pt,
+                        is_infant=True,
+                        created_by=request.user,
+                    )
+                    person_created = True
+                # Se CPF foi fornecido, buscar ou criar pessoa por CPF
+                elif cpf:
+                    # Lock na pessoa: triagens simultâneas do mesmo CPF não duplicam
+                    # contato/endereço nas checagens abaixo
+                    person, person_created = Person.objects.select_for_update().get_or_create(
+                        cpf=cpf,
+                        defaults={
+                            "name": nome,
+                            "person_type": pt,
+                            "created_by": request.user,
+                        },
+                    )
+                else:
+                    # Criar pessoa temporária sem CPF
+                    person = Person.objects.create(
+                        name=nome,
+                        cpf=None,  # Será preenchido no update da OS
+                        person_type=pt,
+                        created_by=request.user,
+                    )
+                    person_created = True
+
+                # Processar contatos apenas se fornecidos
+                email = data.get("email") or ""
+                telefone = data.get("telefone") or ""
+
+                email = email.strip() if email else None
+                telefone = telefone.strip() if telefone else None
+
+                # Criar contato apenas se pelo menos um (email ou telefone) foi fornecido
+                # (pessoa recém-criada não tem contatos nem endereços: sem checagem)
+                if email or telefone:
+                    contact_exists = (
+                        not person_created
+                        and PersonsContacts.objects.filter(
+                            phone=telefone, person=person
+                        ).exists()
+                    )
+                    if not contact_exists:
+                        PersonsContacts.objects.create(
+                            phone=telefone,
+                            person=person,
+                            email=email,
+                            created_by=request.user,
+                        )
+                endereco = data.get("endereco", {})
+                cidade_nome = endereco.get("cidade")
+                if cidade_nome:
+                    city_id = _city_id_by_name(cidade_nome)
+                    if city_id:
+                        address_lookup = dict(
+                            person=person,
+                            street=endereco.get("rua") or "",
+                            number=endereco.get("numero") or "",
+                            cep=endereco.get("cep") or "",
+                            complemento=endereco.get("complemento") or "",
+                            neighborhood=endereco.get("bairro") or "",
+                            city_id=city_id,
+                        )
+                        if (
+                            person_created
+                            or not PersonsAdresses.objects.filter(**address_lookup).exists()
+                        ):
+                            PersonsAdresses.objects.create(
+                                **address_lookup, created_by=request.user
+                            )
+
+                service_order_phase = phase_by_name("PENDENTE")
+
+                # tipo_servico é opcional na triagem - será definido posteriormente via modalidade
+                tipo_servico = data.get("tipo_servico")
+                purchase = tipo_servico == "Venda" if tipo_servico else False
+
+                service_order = ServiceOrder.objects.create(
+                    renter=person,
+                    employee=atendente,
+                    attendant=request.user.person,
+                    order_date=date.today(),
+                    renter_role=data.get("papel_evento", "").upper(),
+                    purchase=purchase,
+                    service_type=tipo_servico,  # Pode ser None
+                    came_from=data.get("origem", "").upper(),
+                    service_order_phase=service_order_phase,
+                    event=event_obj,
+                )
+            # renter/employee/attendant/fase/evento já estão em memória desde o
+            # create(); só os contatos aninhados pelo PersonSerializer iriam ao
+            # banco, um por pessoa: buscar todos numa query só
+            models.prefetch_related_objects(
+                [p for p in (person, atendente, service_order.attendant) if p],
+                "contacts",
             )
             return Response(
                 {
@@ -5811,25 +5573,27 @@ class EventUpdateAPIView(APIView):
             serializer.is_valid(raise_exception=True)
 
             # Atualizar apenas os campos fornecidos
-            updated = False
+            changed_fields = []
 
             if "name" in serializer.validated_data:
                 event.name = serializer.validated_data["name"].upper()
-                updated = True
+                changed_fields.append("name")
 
             if "description" in serializer.validated_data:
                 event.description = serializer.validated_data["description"]
-                updated = True
+                changed_fields.append("description")
 
             if "event_date" in serializer.validated_data:
                 event.event_date = serializer.validated_data["event_date"]
-                updated = True
+                changed_fields.append("event_date")
 
             # Atualizar date_updated se algum campo foi modificado
-            if updated:
+            # (UPDATE só com as colunas alteradas)
+            if changed_fields:
                 event.date_updated = timezone.now()
-                event.save()
+                event.save(update_fields=changed_fields + ["date_updated"])
 
+            models.prefetch_related_objects([event], EventSerializer.participants_prefetch())
             return Response(EventSerializer(event).data, status=status.HTTP_200_OK)
 
         except Event.DoesNotExist:
@@ -5859,20 +5623,20 @@ class EventAddParticipantsAPIView(APIView):
         serializer.is_valid(raise_exception=True)
         participant_ids = serializer.validated_data["participant_ids"]
 
-        existing_person_ids = set(
-            EventParticipant.objects.filter(event=event).values_list(
-                "person_id", flat=True
-            )
-        )
-
-        people = Person.objects.filter(id__in=participant_ids).exclude(
-            id__in=existing_person_ids
+        # Só os ids existentes (sem carregar as pessoas); quem já participa
+        # é descartado pelo banco via unique_event_person
+        person_ids = Person.objects.filter(id__in=participant_ids).values_list(
+            "id", flat=True
         )
         EventParticipant.objects.bulk_create(
-            [EventParticipant(event=event, person=p) for p in people]
+            [EventParticipant(event=event, person_id=pid) for pid in person_ids],
+            ignore_conflicts=True,
+            batch_size=1000,
         )
 
-        event.refresh_from_db()
+        # Campos do evento não mudaram: sem refresh_from_db; só os
+        # participantes (com pessoa e contatos) são lidos para a resposta
+        models.prefetch_related_objects([event], EventSerializer.participants_prefetch())
         return Response(EventSerializer(event).data, status=status.HTTP_200_OK)
 
 
@@ -5886,17 +5650,16 @@ class EventOpenListAPIView(APIView):
     )
     def get(self, request):
         finalizadas = ["FINALIZADO", "RECUSADA"]
-        eventos_ids = (
-            ServiceOrder.objects.filter(
-                event__isnull=False,
-                service_order_phase__isnull=False,
-                date_canceled__isnull=True,
+        # EXISTS correlacionado: uma única query, sem DISTINCT sobre o JOIN
+        eventos = EventSerializer.setup_eager_loading(Event.objects.all()).filter(
+            models.Exists(
+                ServiceOrder.objects.filter(
+                    event_id=models.OuterRef("pk"),
+                    service_order_phase__isnull=False,
+                    date_canceled__isnull=True,
+                ).exclude(service_order_phase__name__in=finalizadas)
             )
-            .exclude(service_order_phase__name__in=finalizadas)
-            .values_list("event_id", flat=True)
-            .distinct()
         )
-        eventos = Event.objects.filter(id__in=eventos_ids)
         return Response(EventSerializer(eventos, many=True).data)
 
 
@@ -5958,6 +5721,47 @@ class EventLinkServiceOrderAPIView(APIView):
             )
 
 
+# Fases de OS que deixam um evento já passado com pendências
+_EVENT_OPEN_PHASES = (
+    "PENDENTE",
+    "EM_PRODUCAO",
+    "AGUARDANDO_RETIRADA",
+    "AGUARDANDO_DEVOLUCAO",
+)
+
+# Respostas da listagem de eventos com status ficam 60s no cache; os tokens
+# de versão de eventos e OS invalidam antes disso quando algo muda
+EVENT_LIST_CACHE_TIMEOUT = 60
+
+
+def _calculate_event_status(event, os_total, os_finalizadas, os_em_andamento, today):
+    """Calcula o status do evento a partir das contagens de OS vinculadas"""
+
+    # Se não tem data do evento definida, não podemos calcular status
+    if not event.event_date:
+        return "N/A"
+
+    # Event.event_date é DateField: compara direto com today (date)
+    if event.event_date >= today:
+        return "AGENDADO"
+
+    # Evento já passou da data
+    if os_total == 0:
+        # Evento passou da data e não possui nenhuma OS vinculada
+        return "CANCELADO"
+
+    # Se todas as OS foram finalizadas
+    if os_finalizadas == os_total:
+        return "FINALIZADO"
+
+    # Se ainda há OS em andamento após a data do evento
+    if os_em_andamento > 0:
+        return "POSSUI PENDÊNCIAS"
+
+    # Caso geral - evento passou e tem OS mas não finalizadas corretamente
+    return "CANCELADO"
+
+
 class EventListWithStatusAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -6007,8 +5811,6 @@ class EventListWithStatusAPIView(APIView):
     def get(self, request):
         """Listar eventos com contagem de OS e status"""
         try:
-            from datetime import date
-
             today = date.today()
 
             # Paginação
@@ -6026,67 +5828,97 @@ class EventListWithStatusAPIView(APIView):
             if page_size <= 0:
                 page_size = 50
 
+            # Datas convertidas uma vez; formato inválido é erro do cliente
+            dates = {}
+            for param in ("start_date", "end_date"):
+                value = request.GET.get(param)
+                try:
+                    dates[param] = date.fromisoformat(value) if value else None
+                except ValueError:
+                    return Response(
+                        {"error": f"{param} inválido. Use o formato YYYY-MM-DD."},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+            start_date = dates["start_date"]
+            end_date = dates["end_date"]
+            search = (request.GET.get("search") or "").strip()
+
+            # Mesma página + filtros no mesmo dia: resposta vem do cache
+            cache_params = (page, page_size, start_date, end_date, search, today)
+            cache_key = "events_status:%s:%s:%s" % (
+                event_list_version(),
+                service_order_list_version(),
+                hashlib.md5(repr(cache_params).encode()).hexdigest(),
+            )
+            summary = cache.get(cache_key)
+            if summary is not None:
+                return Response(summary)
+
             # Buscar todos os eventos
-            events = Event.objects.all().order_by("-date_created")
+            events = Event.objects.order_by("-date_created", "-id")
 
             # Aplicar filtros opcionais
-            start_date = request.GET.get("start_date")
-            end_date = request.GET.get("end_date")
             if start_date:
-                try:
-                    events = events.filter(event_date__gte=start_date)
-                except Exception:
-                    pass
+                events = events.filter(event_date__gte=start_date)
             if end_date:
-                try:
-                    events = events.filter(event_date__lte=end_date)
-                except Exception:
-                    pass
+                events = events.filter(event_date__lte=end_date)
 
-            # Pesquisa livre
-            search = request.GET.get("search")
+            # Pesquisa livre (ILIKE coberto pelos índices trigram de events)
             if search:
-                search = search.strip()
                 events = events.filter(
                     models.Q(name__icontains=search) | models.Q(description__icontains=search)
                 )
 
-            result_data = []
+            # Paginação no banco: COUNT + LIMIT/OFFSET, só a página é lida
+            total_events = events.count()
+            total_pages = (total_events + page_size - 1) // page_size if page_size > 0 else 1
+
+            start_idx = (page - 1) * page_size
+            end_idx = start_idx + page_size
+
+            # Contagens de OS usadas no status, só para os eventos da página
+            # (agregados condicionais: uma única query em vez de 3 por evento);
+            # only(): apenas as colunas devolvidas entram no SELECT/GROUP BY
+            page_events = events.only(
+                "id", "name", "description", "event_date", "date_created", "date_updated"
+            ).annotate(
+                so_total=models.Count("service_orders"),
+                so_finalizadas=models.Count(
+                    "service_orders",
+                    filter=models.Q(service_orders__service_order_phase__name="FINALIZADO"),
+                ),
+                so_em_andamento=models.Count(
+                    "service_orders",
+                    filter=models.Q(
+                        service_orders__service_order_phase__name__in=_EVENT_OPEN_PHASES
+                    ),
+                ),
+            )[start_idx:end_idx]
 
-            for event in events:
-                # Contar ordens de serviço vinculadas ao evento
-                service_orders = ServiceOrder.objects.filter(event=event)
-                service_orders_count = service_orders.count()
+            paginated_events = []
 
+            for event in page_events:
                 # Calcular status do evento
-                status_evento = self._calculate_event_status(
-                    event, service_orders, today
+                status_evento = _calculate_event_status(
+                    event,
+                    event.so_total,
+                    event.so_finalizadas,
+                    event.so_em_andamento,
+                    today,
                 )
 
                 event_data = {
                     "id": event.id,
                     "name": event.name,
                     "description": event.description or "",
-                    "event_date": (
-                        event.event_date.date()
-                        if event.event_date and hasattr(event.event_date, "date")
-                        else event.event_date
-                    ),
-                    "service_orders_count": service_orders_count,
+                    "event_date": event.event_date,
+                    "service_orders_count": event.so_total,
                     "status": status_evento,
                     "date_created": event.date_created,
                     "date_updated": event.date_updated,
                 }
 
-                result_data.append(event_data)
-
-            # Aplicar paginação
-            total_events = len(result_data)
-            total_pages = (total_events + page_size - 1) // page_size if page_size > 0 else 1
-
-            start_idx = (page - 1) * page_size
-            end_idx = start_idx + page_size
-            paginated_events = result_data[start_idx:end_idx]
+                paginated_events.append(event_data)
 
             summary = {
                 "count": total_events,
@@ -6095,6 +5927,7 @@ class EventListWithStatusAPIView(APIView):
                 "total_pages": total_pages,
                 "events": paginated_events,
             }
+            cache.set(cache_key, summary, EVENT_LIST_CACHE_TIMEOUT)
 
             return Response(summary)
 
@@ -6104,103 +5937,6 @@ class EventListWithStatusAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def _calculate_event_status(self, event, service_orders, today):
-        """Calcula o status do evento baseado nas ordens de serviço"""
-
-        # Se não tem data do evento definida, não podemos calcular status
-        if not event.event_date:
-            return "N/A"
-
-        # Garantir que event_date seja datetime.date para comparação
-        event_date = event.event_date
-        if hasattr(event.event_date, "date"):
-            event_date = event.event_date.date()
-
-        # Se o evento ainda não passou da data
-        if event_date >= today:
-            return "AGENDADO"
-
-        # Evento já passou da data
-        if service_orders.count() == 0:
-            # Evento passou da data e não possui nenhuma OS vinculada
-            return "CANCELADO"
-
-        # Verificar status das OS vinculadas
-        os_finalizadas = service_orders.filter(
-            service_order_phase__name="FINALIZADO"
-        ).count()
-
-        os_em_andamento = service_orders.filter(
-            service_order_phase__name__in=[
-                "PENDENTE",
-                "EM_PRODUCAO",
-                "AGUARDANDO_RETIRADA",
-                "AGUARDANDO_DEVOLUCAO",
-            ]
-        ).count()
-
-        # Se todas as OS foram finalizadas
-        if os_finalizadas == service_orders.count():
-            return "FINALIZADO"
-
-        # Se ainda há OS em andamento após a data do evento
-        if os_em_andamento > 0:
-            return "POSSUI PENDÊNCIAS"
-
-        # Caso geral - evento passou e tem OS mas não finalizadas corretamente
-        return "CANCELADO"
-
-    def _get_most_recent_update_date(self, event, service_orders):
-        """Calcula a data de atualização mais recente entre evento e suas OS"""
-        from datetime import datetime, time
-
-        from django.utils import timezone as django_timezone
-
-        dates_to_compare = []
-
-        # Função auxiliar para normalizar datas para timezone-aware
-        def normalize_date(date_value):
-            if date_value is None:
-                return None
-
-            # Se é um datetime já timezone-aware, usar como está
-            if hasattr(date_value, "tzinfo") and date_value.tzinfo is not None:
-                return date_value
-
-            # Se é um datetime naive, converter para timezone-aware
-            if hasattr(date_value, "date") and hasattr(date_value, "time"):
-                return django_timezone.make_aware(date_value)
-
-            # Se é um date, converter para datetime timezone-aware
-            if hasattr(date_value, "year") and not hasattr(date_value, "time"):
-                naive_datetime = datetime.combine(date_value, time.min)
-                return django_timezone.make_aware(naive_datetime)
-
-            return date_value
-
-        # Adicionar date_updated do evento se existir, senão date_created
-        if event.date_updated:
-            dates_to_compare.append(normalize_date(event.date_updated))
-        else:
-            dates_to_compare.append(normalize_date(event.date_created))
-
-        # Adicionar date_updated de cada OS se existir, senão date_created (order_date)
-        for order in service_orders:
-            if hasattr(order, "date_updated") and order.date_updated:
-                dates_to_compare.append(normalize_date(order.date_updated))
-            else:
-                # Se não tem date_updated, usar date_created (data e hora de criação da OS)
-                dates_to_compare.append(normalize_date(order.date_created))
-
-        # Filtrar valores None
-        dates_to_compare = [d for d in dates_to_compare if d is not None]
-
-        # Retornar a data mais recente, ou date_created do evento se não houver nada
-        if dates_to_compare:
-            return max(dates_to_compare)
-        else:
-            return normalize_date(event.date_created)
-
 
 class EventDetailAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -6218,23 +5954,58 @@ class EventDetailAPIView(APIView):
     def get(self, request, event_id):
         """Detalhar evento específico com contagem de OS, status e dados das OS vinculadas"""
         try:
-            from datetime import date
-
             today = date.today()
 
-            # Buscar o evento específico
-            event = get_object_or_404(Event, id=event_id)
+            # Buscar o evento específico, já com a atualização mais recente
+            # entre ele e suas OS (date_updated, senão date_created) calculada
+            # no banco
+            own_update = Coalesce("date_updated", "date_created")
+            event = get_object_or_404(
+                Event.objects.annotate(
+                    last_update=Greatest(
+                        own_update,
+                        Coalesce(
+                            models.Max(
+                                Coalesce(
+                                    "service_orders__date_updated",
+                                    "service_orders__date_created",
+                                )
+                            ),
+                            own_update,
+                        ),
+                    )
+                ),
+                id=event_id,
+            )
 
             # Buscar ordens de serviço vinculadas ao evento com dados relacionados
-            service_orders = (
+            # (uma query; contagens do status saem da própria lista)
+            service_orders = list(
                 ServiceOrder.objects.filter(event=event)
                 .select_related("service_order_phase", "renter")
+                .only(
+                    "id",
+                    "date_created",
+                    "total_value",
+                    "service_order_phase__name",
+                    "renter__name",
+                )
                 .order_by("-order_date")
             )
-            service_orders_count = service_orders.count()
+            service_orders_count = len(service_orders)
+            phase_names = [
+                order.service_order_phase.name if order.service_order_phase else None
+                for order in service_orders
+            ]
 
             # Calcular status do evento usando o mesmo método da listagem
-            status_evento = self._calculate_event_status(event, service_orders, today)
+            status_evento = _calculate_event_status(
+                event,
+                service_orders_count,
+                phase_names.count("FINALIZADO"),
+                sum(1 for name in phase_names if name in _EVENT_OPEN_PHASES),
+                today,
+            )
 
             # Preparar dados das ordens de serviço
             service_orders_data = []
@@ -6254,9 +6025,6 @@ class EventDetailAPIView(APIView):
                 }
                 service_orders_data.append(order_data)
 
-            # Calcular date_updated mais recente
-            most_recent_date = self._get_most_recent_update_date(event, service_orders)
-
             event_data = {
                 "id": event.id,
                 "name": event.name,
@@ -6265,7 +6033,7 @@ class EventDetailAPIView(APIView):
                 "service_orders_count": service_orders_count,
                 "status": status_evento,
                 "date_created": event.date_created,
-                "date_updated": most_recent_date,
+                "date_updated": event.last_update,
                 "service_orders": service_orders_data,
             }
 
@@ -6276,100 +6044,3 @@ class EventDetailAPIView(APIView):
                 {"error": f"Erro ao buscar evento: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-
-    def _calculate_event_status(self, event, service_orders, today):
-        """Calcula o status do evento baseado nas ordens de serviço"""
-
-        # Se não tem data do evento definida, não podemos calcular status
-        if not event.event_date:
-            return "N/A"
-
-        # Garantir que event_date seja datetime.date para comparação
-        event_date = event.event_date
-        if hasattr(event.event_date, "date"):
-            event_date = event.event_date.date()
-
-        # Se o evento ainda não passou da data
-        if event_date >= today:
-            return "AGENDADO"
-
-        # Evento já passou da data
-        if service_orders.count() == 0:
-            # Evento passou da data e não possui nenhuma OS vinculada
-            return "CANCELADO"
-
-        # Verificar status das OS vinculadas
-        os_finalizadas = service_orders.filter(
-            service_order_phase__name="FINALIZADO"
-        ).count()
-
-        os_em_andamento = service_orders.filter(
-            service_order_phase__name__in=[
-                "PENDENTE",
-                "EM_PRODUCAO",
-                "AGUARDANDO_RETIRADA",
-                "AGUARDANDO_DEVOLUCAO",
-            ]
-        ).count()
-
-        # Se todas as OS foram finalizadas
-        if os_finalizadas == service_orders.count():
-            return "FINALIZADO"
-
-        # Se ainda há OS em andamento após a data do evento
-        if os_em_andamento > 0:
-            return "POSSUI PENDÊNCIAS"
-
-        # Caso geral - evento passou e tem OS mas não finalizadas corretamente
-        return "CANCELADO"
-
-    def _get_most_recent_update_date(self, event, service_orders):
-        """Calcula a data de atualização mais recente entre evento e suas OS"""
-        from datetime import datetime, time
-
-        from django.utils import timezone as django_timezone
-
-        dates_to_compare = []
-
-        # Função auxiliar para normalizar datas para timezone-aware
-        def normalize_date(date_value):
-            if date_value is None:
-                return None
-
-            # Se é um datetime já timezone-aware, usar como está
-            if hasattr(date_value, "tzinfo") and date_value.tzinfo is not None:
-                return date_value
-
-            # Se é um datetime naive, converter para timezone-aware
-            if hasattr(date_value, "date") and hasattr(date_value, "time"):
-                return django_timezone.make_aware(date_value)
-
-            # Se é um date, converter para datetime timezone-aware
-            if hasattr(date_value, "year") and not hasattr(date_value, "time"):
-                naive_datetime = datetime.combine(date_value, time.min)
-                return django_timezone.make_aware(naive_datetime)
-
-            return date_value
-
-        # Adicionar date_updated do evento se existir, senão date_created
-        if event.date_updated:
-            dates_to_compare.append(normalize_date(event.date_updated))
-        else:
-            dates_to_compare.append(normalize_date(event.date_created))
-
-        # Adicionar date_updated de cada OS se existir, senão date_created (order_date)
-        for order in service_orders:
-            if hasattr(order, "date_updated") and order.date_updated:
-                dates_to_compare.append(normalize_date(order.date_updated))
-            else:
-                # Se não tem date_updated, usar date_created (data e hora de criação da OS)
-                dates_to_compare.append(normalize_date(order.date_created))
-
-        # Filtrar valores None
-        dates_to_compare = [d for d in dates_to_compare if d is not None]
-
-        # Retornar a data mais recente, ou date_created do evento se não houver nada
-        if dates_to_compare:
-            return max(dates_to_compare)
-        else:
-            return normalize_date(event.date_created)
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.11 on 2026-10-15 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("service_control", "0033_backfill_payment_uuids"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="serviceorderitem",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    ("product__isnull", True),
+                    ("temporary_product__isnull", True),
+                    _connector="OR",
+                ),
+                name="service_order_item_single_product",
+            ),
+        ),
+    ]
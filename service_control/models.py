@@ -1,5 +1,11 @@
+import uuid
+from datetime import timedelta
+
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
 from accounts.models import BaseModel, Person
@@ -10,6 +16,30 @@ class ServiceOrderPhase(BaseModel):
     name = models.CharField(max_length=20)
 
 
+# Cache em processo nome -> ServiceOrderPhase (tabela praticamente imutável)
+_phase_cache = {}
+
+
+def phase_by_name(name):
+    """Fase pelo nome exato, cacheada no processo; None se não existir.
+
+    Ausências não são cacheadas, para que uma fase criada depois seja
+    encontrada na próxima chamada.
+    """
+    phase = _phase_cache.get(name)
+    if phase is None:
+        phase = ServiceOrderPhase.objects.filter(name=name).first()
+        if phase is not None:
+            _phase_cache[name] = phase
+    return phase
+
+
+@receiver(post_save, sender=ServiceOrderPhase)
+@receiver(post_delete, sender=ServiceOrderPhase)
+def clear_phase_cache(**kwargs):
+    _phase_cache.clear()
+
+
 class RefusalReason(BaseModel):
     """Motivos de recusa/cancelamento de ordens de serviço"""
 
@@ -26,6 +56,68 @@ class RefusalReason(BaseModel):
         return self.name
 
 
+# Fases em que a OS já está encerrada: não entra em atraso nem na agenda
+_TERMINAL_PHASES = frozenset(("FINALIZADO", "RECUSADA"))
+
+# Janela de "próximos dias" da agenda de devoluções
+_TEN_DAYS = timedelta(days=10)
+
+
+class ServiceOrderQuerySet(models.QuerySet):
+    def sync_esta_atrasada(self, today):
+        """Recalcula esta_atrasada das OS do queryset com dois UPDATEs em lote.
+
+        A OS está atrasada quando a retirada_date já passou, ou quando o evento
+        já aconteceu e ela não foi retirada. Só as linhas cuja flag muda são
+        gravadas (sem save() por OS).
+        """
+        atrasada = models.Q(retirada_date__lt=today) | models.Q(
+            event__event_date__lt=today, data_retirado__isnull=True
+        )
+        self.filter(atrasada, esta_atrasada=False).update(esta_atrasada=True)
+        self.filter(esta_atrasada=True).exclude(atrasada).update(esta_atrasada=False)
+
+    def with_status_flags(self, today=None):
+        """Anota em SQL os mesmos valores de is_atrasada, is_hoje,
+        is_proximos_10_dias e tipo_evento, que passam a usá-los quando
+        presentes em vez de recalcular por instância.
+        """
+        if today is None:
+            today = timezone.now().date()
+        aberta = models.Q(service_order_phase__isnull=False) & ~models.Q(
+            service_order_phase__name__in=_TERMINAL_PHASES
+        )
+
+        def flag(condition):
+            return models.Case(
+                models.When(condition & aberta, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            )
+
+        return self.annotate(
+            atrasada_flag=flag(models.Q(devolucao_date__lt=today)),
+            hoje_flag=flag(
+                models.Q(prova_date=today)
+                | models.Q(retirada_date=today)
+                | models.Q(devolucao_date=today)
+            ),
+            proximos_10_dias_flag=flag(
+                models.Q(
+                    devolucao_date__gt=today,
+                    devolucao_date__lte=today + _TEN_DAYS,
+                )
+            ),
+            tipo_evento_value=models.Case(
+                models.When(prova_date__isnull=False, then=models.Value("prova")),
+                models.When(retirada_date__isnull=False, then=models.Value("retirada")),
+                models.When(devolucao_date__isnull=False, then=models.Value("devolucao")),
+                default=models.Value("outro"),
+                output_field=models.CharField(),
+            ),
+        )
+
+
 class ServiceOrder(BaseModel):
     renter = models.ForeignKey(
         Person, on_delete=models.SET_NULL, related_name="service_orders", null=True, blank=True
@@ -150,52 +242,78 @@ class ServiceOrder(BaseModel):
         help_text="Administrador que autorizou a parceria",
     )
 
+    objects = ServiceOrderQuerySet.as_manager()
+
     class Meta:
         db_table = "service_orders"
 
     def __str__(self):
-        renter_name = self.renter.name if self.renter else "Sem cliente"
+        # Sem renter_id não há o que buscar; OS virtual usa client_name.
+        # Listagens que exibem muitas OS devem usar select_related("renter")
+        if self.renter_id is not None:
+            renter_name = self.renter.name
+        else:
+            renter_name = self.client_name or "Sem cliente"
         return f"OS {self.id} - {renter_name}"
 
     def save(self, *args, **kwargs):
-        # Calcula automaticamente o valor restante
+        # Calcula automaticamente o valor restante; com update_fields, só
+        # quando o total ou o sinal fazem parte do UPDATE (e aí o restante
+        # também precisa ser gravado)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if not update_fields & {"total_value", "advance_payment"}:
+                return super().save(*args, **kwargs)
+            kwargs["update_fields"] = update_fields | {"remaining_payment"}
         if self.total_value is not None and self.advance_payment is not None:
             self.remaining_payment = self.total_value - self.advance_payment
         super().save(*args, **kwargs)
 
-    def is_atrasada(self):
-        today = timezone.now().date()
-        # Considera atraso se devolução já passou e não está concluída
+    def _is_open(self):
+        # Sem fase não conta como aberta; o _id evita a query quando é nulo
         return (
-            self.devolucao_date
-            and self.devolucao_date < today
-            and self.service_order_phase
-            and self.service_order_phase.name not in ["FINALIZADO", "RECUSADA"]
+            self.service_order_phase_id is not None
+            and self.service_order_phase.name not in _TERMINAL_PHASES
         )
 
-    def is_hoje(self):
-        today = timezone.now().date()
+    def is_atrasada(self, today=None):
+        # Valor anotado por ServiceOrderQuerySet.with_status_flags, se houver;
+        # `today` permite reusar a data já calculada por quem percorre várias OS
+        annotated = getattr(self, "atrasada_flag", None)
+        if annotated is not None:
+            return annotated
+        today = today or timezone.now().date()
+        # Considera atraso se devolução já passou e não está concluída
+        return self.devolucao_date and self.devolucao_date < today and self._is_open()
+
+    def is_hoje(self, today=None):
+        annotated = getattr(self, "hoje_flag", None)
+        if annotated is not None:
+            return annotated
+        today = today or timezone.now().date()
         return (
-            (
-                self.prova_date == today
-                or self.retirada_date == today
-                or self.devolucao_date == today
-            )
-            and self.service_order_phase
-            and self.service_order_phase.name not in ["FINALIZADO", "RECUSADA"]
+            today in (self.prova_date, self.retirada_date, self.devolucao_date)
+            and self._is_open()
         )
 
-    def is_proximos_10_dias(self):
-        today = timezone.now().date()
-        in_10 = today + timezone.timedelta(days=10)
+    def is_proximos_10_dias(self, today=None):
+        annotated = getattr(self, "proximos_10_dias_flag", None)
+        if annotated is not None:
+            return annotated
+        today = today or timezone.now().date()
+        in_10 = today + _TEN_DAYS
         return (
-            (self.devolucao_date and today < self.devolucao_date <= in_10)
-            and self.service_order_phase
-            and self.service_order_phase.name not in ["FINALIZADO", "RECUSADA"]
+            self.devolucao_date
+            and today < self.devolucao_date <= in_10
+            and self._is_open()
         )
 
     def tipo_evento(self):
         # Retorna o tipo do evento para dashboard: prova, retirada, devolucao
+        annotated = getattr(self, "tipo_evento_value", None)
+        if annotated is not None:
+            return annotated
         if self.prova_date:
             return "prova"
         if self.retirada_date:
@@ -205,6 +323,35 @@ class ServiceOrder(BaseModel):
         return "outro"
 
 
+# Token de versão das listagens de OS: faz parte da chave dos counts
+# cacheados da paginação e é trocado sempre que uma OS muda
+SERVICE_ORDER_LIST_VERSION_KEY = "service_order_list_version"
+
+
+def service_order_list_version():
+    return cache.get_or_set(
+        SERVICE_ORDER_LIST_VERSION_KEY, lambda: uuid.uuid4().hex, None
+    )
+
+
+@receiver(post_save, sender=ServiceOrder)
+@receiver(post_delete, sender=ServiceOrder)
+def bump_service_order_list_version(**kwargs):
+    cache.set(SERVICE_ORDER_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+# Opções de filtro do dashboard: guardadas junto com o token de versão das
+# OS em que foram montadas; mudanças em pessoas (nome dos atendentes) as
+# descartam direto
+DASHBOARD_FILTERS_KEY = "dashboard_filters"
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def clear_dashboard_filters(**kwargs):
+    cache.delete(DASHBOARD_FILTERS_KEY)
+
+
 class ServiceOrderItem(BaseModel):
     service_order = models.ForeignKey(
         ServiceOrder, related_name="items", on_delete=models.CASCADE
@@ -243,6 +390,16 @@ class ServiceOrderItem(BaseModel):
 
     class Meta:
         db_table = "service_order_items"
+        constraints = [
+            # Metade "não ambos" do clean(), garantida pelo banco. A exigência
+            # de ao menos um produto fica só no clean(): as FKs são SET_NULL e
+            # apagar o produto deixaria o item sem nenhum dos dois
+            models.CheckConstraint(
+                check=models.Q(product__isnull=True)
+                | models.Q(temporary_product__isnull=True),
+                name="service_order_item_single_product",
+            )
+        ]
 
     def __str__(self):
         prod_desc = self.product if self.product else self.temporary_product
@@ -270,6 +427,21 @@ class Event(BaseModel):
         return f"Evento: {self.name} - {self.event_date}"
 
 
+# Token de versão da listagem de eventos com status: trocado sempre que um
+# evento muda (mudanças de OS já trocam o token das listagens de OS)
+EVENT_LIST_VERSION_KEY = "event_list_version"
+
+
+def event_list_version():
+    return cache.get_or_set(EVENT_LIST_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_event_list_version(**kwargs):
+    cache.set(EVENT_LIST_VERSION_KEY, uuid.uuid4().hex, None)
+
+
 class EventParticipant(BaseModel):
     event = models.ForeignKey(
         Event, related_name="participants", on_delete=models.CASCADE
@@ -1,7 +1,7 @@
+from django.db import models
 from rest_framework import serializers
-from drf_spectacular.utils import extend_schema_field, OpenApiTypes
 
-from accounts.serializers import PersonSerializer
+from accounts.serializers import PersonSerializer, PersonSummarySerializer
 from products.serializers import (
     ColorCatalogueSerializer,
     ProductSerializer,
@@ -21,7 +21,7 @@ from .models import (
 class ServiceOrderPhaseSerializer(serializers.ModelSerializer):
     class Meta:
         model = ServiceOrderPhase
-        fields = "__all__"
+        fields = ["id", "name"]
 
 
 class RefusalReasonSerializer(serializers.ModelSerializer):
@@ -41,6 +41,11 @@ class ServiceOrderItemSerializer(serializers.ModelSerializer):
         model = ServiceOrderItem
         fields = "__all__"
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Traz os produtos aninhados no mesmo SELECT dos itens."""
+        return queryset.select_related("product", "temporary_product", "color_catalogue")
+
 
 class ServiceOrderSerializer(serializers.ModelSerializer):
     renter = PersonSerializer(read_only=True)
@@ -48,26 +53,52 @@ class ServiceOrderSerializer(serializers.ModelSerializer):
     attendant = PersonSerializer(read_only=True)
     items = ServiceOrderItemSerializer(many=True, read_only=True)
     service_order_phase = ServiceOrderPhaseSerializer(read_only=True)
-    event_date = serializers.SerializerMethodField(help_text="Data do evento vinculado")
-    event_name = serializers.SerializerMethodField(help_text="Nome do evento vinculado")
+    # Event.event_date é DateField: leitura direta do evento (select_related),
+    # None quando a OS não tem evento
+    event_date = serializers.DateField(
+        source="event.event_date",
+        read_only=True,
+        allow_null=True,
+        help_text="Data do evento vinculado",
+    )
+    event_name = serializers.CharField(
+        source="event.name",
+        read_only=True,
+        allow_null=True,
+        help_text="Nome do evento vinculado",
+    )
 
     class Meta:
         model = ServiceOrder
         fields = "__all__"
 
-    @extend_schema_field(OpenApiTypes.DATE)
-    def get_event_date(self, obj):
-        """Retorna a data do evento vinculado"""
-        if obj.event and obj.event.event_date:
-            if hasattr(obj.event.event_date, "date"):
-                return obj.event.event_date.date()
-            return obj.event.event_date
-        return None
+    # Contatos aninhados pelo PersonSerializer de cada pessoa
+    person_prefetches = ("renter__contacts", "employee__contacts", "attendant__contacts")
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """Carrega de uma vez tudo o que o serializer aninha, sem N+1 por OS."""
+        return queryset.select_related(
+            "event", "renter", "employee", "attendant", "service_order_phase"
+        ).prefetch_related(
+            *cls.person_prefetches,
+            models.Prefetch(
+                "items",
+                queryset=ServiceOrderItemSerializer.setup_eager_loading(
+                    ServiceOrderItem.objects.all()
+                ),
+            ),
+        )
+
+
+class ServiceOrderListSerializer(ServiceOrderSerializer):
+    """OS para listagens: pessoas resumidas, sem contatos aninhados."""
 
-    @extend_schema_field(OpenApiTypes.STR)
-    def get_event_name(self, obj):
-        """Retorna o nome do evento vinculado"""
-        return obj.event.name if obj.event else None
+    renter = PersonSummarySerializer(read_only=True)
+    employee = PersonSummarySerializer(read_only=True)
+    attendant = PersonSummarySerializer(read_only=True)
+
+    person_prefetches = ()
 
 
 # ========== SERIALIZERS PARA DASHBOARD ESTILO LOOKER ==========
@@ -77,10 +108,16 @@ class DashboardKPISerializer(serializers.Serializer):
     """KPIs principais do dashboard (cards superiores)"""
 
     total_recebido = serializers.DecimalField(
-        max_digits=14, decimal_places=2, help_text="Total recebido (sinal + restante pago)"
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Total recebido (sinal + restante pago)",
     )
     total_vendido = serializers.DecimalField(
-        max_digits=14, decimal_places=2, help_text="Total vendido (valor das OS confirmadas)"
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Total vendido (valor das OS confirmadas)",
     )
     total_atendimentos = serializers.IntegerField(help_text="Total de atendimentos")
     atendimentos_fechados = serializers.IntegerField(
@@ -108,7 +145,10 @@ class AtendenteTotalVendidoSerializer(serializers.Serializer):
     id = serializers.IntegerField(help_text="ID do atendente")
     nome = serializers.CharField(help_text="Nome do atendente")
     total_vendido = serializers.DecimalField(
-        max_digits=14, decimal_places=2, help_text="Total vendido pelo atendente"
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Total vendido pelo atendente",
     )
     num_atendimentos = serializers.IntegerField(help_text="Número de atendimentos fechados")
 
@@ -119,7 +159,10 @@ class TipoClienteChartSerializer(serializers.Serializer):
     tipo = serializers.CharField(help_text="Tipo de cliente (PADRINHO, NOIVO, etc.)")
     atendimentos_fechados = serializers.IntegerField(help_text="Atendimentos fechados")
     total_vendido = serializers.DecimalField(
-        max_digits=14, decimal_places=2, help_text="Total vendido para esse tipo"
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Total vendido para esse tipo",
     )
 
 
@@ -162,6 +205,8 @@ class DashboardPeriodoSerializer(serializers.Serializer):
     data_fim = serializers.DateField(help_text="Data final do período (YYYY-MM-DD)")
 
 
+# Só documenta o schema (drf-spectacular): a view monta o payload como dict de
+# valores JSON e devolve direto no Response, sem passar por este serializer
 class ServiceOrderDashboardResponseSerializer(serializers.Serializer):
     """Serializer para resposta completa do dashboard analítico estilo Looker"""
 
@@ -285,16 +330,25 @@ class ServiceOrderListByPhaseSerializer(serializers.Serializer):
     # Dados da OS
     id = serializers.IntegerField(help_text="ID da ordem de serviço")
     total_value = serializers.DecimalField(
-        max_digits=10, decimal_places=2, help_text="Valor total"
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor total",
     )
     advance_payment = serializers.DecimalField(
-        max_digits=10, decimal_places=2, help_text="Valor pago"
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor pago",
     )
     esta_atrasada = serializers.BooleanField(
         help_text="Flag indicando se a OS está atrasada (retirada ou devolução)"
     )
     remaining_payment = serializers.DecimalField(
-        max_digits=10, decimal_places=2, help_text="Valor restante"
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor restante",
     )
     employee_name = serializers.CharField(help_text="Nome do atendente")
     attendant_name = serializers.CharField(help_text="Nome do recepcionista")
@@ -607,7 +661,11 @@ class ServiceOrderFinanceTransactionSerializer(serializers.Serializer):
     transaction_type = serializers.CharField(
         help_text="Tipo da transação (sinal/restante/indenizacao)")
     amount = serializers.DecimalField(
-        max_digits=10, decimal_places=2, help_text="Valor da transação")
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor da transação",
+    )
     payment_method = serializers.CharField(
         allow_null=True, required=False, help_text="Forma de pagamento")
     date = serializers.DateField(allow_null=True, required=False, help_text="Data da transação")
@@ -625,10 +683,16 @@ class ServiceOrderFinanceSummarySerializer(serializers.Serializer):
     total_pages = serializers.IntegerField(help_text="Total de páginas disponíveis")
     total_transactions = serializers.IntegerField(help_text="Número total de transações")
     total_amount = serializers.DecimalField(
-        max_digits=14, decimal_places=2, help_text="Valor total somado de TODAS as transações (não paginado)")
+        max_digits=14,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor total somado de TODAS as transações (não paginado)",
+    )
     transactions = ServiceOrderFinanceTransactionSerializer(many=True, help_text="Lista de transações da página atual")
     totals_by_method = serializers.DictField(
-        child=serializers.DecimalField(max_digits=14, decimal_places=2),
+        child=serializers.DecimalField(
+            max_digits=14, decimal_places=2, coerce_to_string=False
+        ),
         help_text="Totais agrupados por forma de pagamento (de TODAS as transações)",
     )
 
@@ -651,6 +715,20 @@ class EventSerializer(serializers.ModelSerializer):
         model = Event
         fields = "__all__"
 
+    @classmethod
+    def participants_prefetch(cls):
+        """Participantes com a pessoa no mesmo SELECT e os contatos numa query."""
+        return models.Prefetch(
+            "participants",
+            queryset=EventParticipant.objects.select_related("person").prefetch_related(
+                "person__contacts"
+            ),
+        )
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.prefetch_related(cls.participants_prefetch())
+
 
 class EventCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255, help_text="Nome do evento")
@@ -724,7 +802,10 @@ class EventServiceOrderSerializer(serializers.Serializer):
         help_text="Fase atual da OS (PENDENTE, EM_PRODUCAO, AGUARDANDO_RETIRADA, etc.)",
     )
     total_value = serializers.DecimalField(
-        max_digits=10, decimal_places=2, help_text="Valor total da OS"
+        max_digits=10,
+        decimal_places=2,
+        coerce_to_string=False,
+        help_text="Valor total da OS",
     )
     client_name = serializers.CharField(
         allow_null=True, help_text="Nome do cliente da ordem de serviço"
@@ -39,7 +39,8 @@ def advance_service_order_phases():
         service_order_phase__name__in=["PENDENTE", "EM ANDAMENTO", "FINALIZADO"]
     ).select_related("service_order_phase")
 
-    for os in service_orders:
+    # iterator(): percorre em blocos em vez de carregar todas as OS na memória
+    for os in service_orders.iterator(chunk_size=500):
         # Lógica de avanço baseada em datas
         if os.devolucao_date and os.devolucao_date < today:
             # OS em atraso - mudar para "EM ATRASO"
@@ -67,6 +68,70 @@ def advance_service_order_phases():
                 pass
 
 
+# Intervalo mínimo entre duas execuções da recusa automática (segundos)
+REFUSED_SWEEP_INTERVAL = 300
+
+
+def move_overdue_orders_to_refused(today=None):
+    """
+    Move para RECUSADA as OS PENDENTE/EM_PRODUCAO cujo evento já passou
+    sem que o cliente tenha retirado o produto. `today` permite reusar a
+    data já calculada pela requisição
+    """
+    from datetime import date
+
+    from .models import (
+        ServiceOrder,
+        bump_service_order_list_version,
+        phase_by_name,
+    )
+
+    if today is None:
+        today = date.today()
+
+    refused_phase = phase_by_name("RECUSADA")
+    if not refused_phase:
+        return 0
+
+    # Apenas recusar PENDENTE e EM_PRODUCAO — ordens já retiradas ou finalizadas não devem ser auto-recusadas
+    moved = (
+        ServiceOrder.objects.filter(
+            event__event_date__lt=today,
+            data_retirado__isnull=True,
+            service_order_phase__name__in=["PENDENTE", "EM_PRODUCAO"],
+            event__isnull=False,
+        )
+        .exclude(service_order_phase__name="RECUSADA")
+        .update(
+            service_order_phase=refused_phase,
+            justification_refusal="Cliente não retirou o produto",
+        )
+    )
+    if moved:
+        # update() não dispara post_save: invalidar os counts das listagens
+        bump_service_order_list_version()
+    return moved
+
+
+def move_overdue_orders_to_refused_throttled(today=None):
+    """
+    Executa move_overdue_orders_to_refused no máximo uma vez a cada
+    REFUSED_SWEEP_INTERVAL segundos (lock no cache), em vez de a cada GET
+    """
+    import logging
+
+    from django.core.cache import cache
+
+    if not cache.add("refused_sweep_lock", True, timeout=REFUSED_SWEEP_INTERVAL):
+        return
+    moved = move_overdue_orders_to_refused(today)
+    if moved:
+        logging.getLogger(__name__).info(
+            "%s OS movidas automaticamente para RECUSADA - Cliente não retirou o produto",
+            moved,
+        )
+
+
 # Todas as funcionalidades agora estão disponíveis via API REST:
 # - /api/v1/service-orders/dashboard/
 # - /api/v1/service-orders/
@@ -11,9 +11,23 @@ Tests run against in-memory SQLite via roupadegala.settings_test.
 """
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
-from accounts.models import Person, PersonType
+from accounts.models import Person, PersonType, clear_person_type_cache
+from service_control.models import clear_phase_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache (throttle locks, cached lookups)."""
+    cache.clear()
+    clear_phase_cache()
+    clear_person_type_cache()
+    yield
+    cache.clear()
+    clear_phase_cache()
+    clear_person_type_cache()
 
 
 @pytest.fixture
@@ -0,0 +1,83 @@
+"""
+BDD tests for the attendant metrics endpoint (/service-orders/attendant-metrics/).
+
+Given an ATENDENTE with a mix of confirmed and refused OS today
+When the metrics endpoint is queried
+Then the per-period counts and financial totals match the fixtures.
+"""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from service_control.models import ServiceOrder, ServiceOrderPhase
+
+URL = "/api/v1/service-orders/attendant-metrics/"
+
+
+@pytest.fixture
+def attendant_orders(db, client_person, attendant_user):
+    """One FINALIZADO (R$500, sinal R$200) and one RECUSADA (R$300, sem sinal) today."""
+    finalizado, _ = ServiceOrderPhase.objects.get_or_create(name="FINALIZADO")
+    recusada, _ = ServiceOrderPhase.objects.get_or_create(name="RECUSADA")
+    today = date.today()
+    ServiceOrder.objects.create(
+        renter=client_person,
+        employee=attendant_user,
+        order_date=today,
+        service_order_phase=finalizado,
+        total_value=Decimal("500.00"),
+        advance_payment=Decimal("200.00"),
+        came_from="INSTAGRAM",
+    )
+    ServiceOrder.objects.create(
+        renter=client_person,
+        employee=attendant_user,
+        order_date=today,
+        service_order_phase=recusada,
+        total_value=Decimal("300.00"),
+        advance_payment=None,
+        came_from="INSTAGRAM",
+    )
+    return attendant_user
+
+
+@pytest.mark.django_db
+class TestAttendantMetrics:
+    def test_day_totals(self, admin_client, attendant_orders):
+        """
+        Given 1 FINALIZADO and 1 RECUSADA today for the attendant
+        When fetching attendant metrics
+        Then the 'dia' block reports 2 atendimentos, 50% conversion and summed values
+        """
+        response = admin_client.get(URL)
+        assert response.status_code == 200
+
+        atendentes = {a["atendente_id"]: a for a in response.json()["atendentes"]}
+        dia = atendentes[attendant_orders.id]["dia"]
+
+        assert dia["atendimentos"]["total_atendimentos"] == 2
+        assert dia["atendimentos"]["finalizados"] == 1
+        assert dia["atendimentos"]["cancelados"] == 1
+        assert dia["conversao"]["concluidos_sucesso"] == 1
+        assert dia["conversao"]["taxa_conversao"] == 50.0
+        assert dia["financeiro"]["total_vendido"] == 800.0
+        assert dia["financeiro"]["total_recebido"] == 200.0
+        assert dia["canais"]["INSTAGRAM"] == {"total": 2, "percentual": 100.0}
+
+    def test_attendant_without_orders_reports_zeros(self, admin_client, attendant_user):
+        """
+        Given an attendant with no OS
+        When fetching attendant metrics
+        Then every period is present with zeroed totals
+        """
+        response = admin_client.get(URL)
+        assert response.status_code == 200
+
+        atendentes = {a["atendente_id"]: a for a in response.json()["atendentes"]}
+        mes = atendentes[attendant_user.id]["mes"]
+
+        assert mes["atendimentos"]["total_atendimentos"] == 0
+        assert mes["conversao"]["taxa_conversao"] == 0.0
+        assert mes["financeiro"] == {"total_vendido": 0.0, "total_recebido": 0.0}
+        assert mes["canais"] == {}
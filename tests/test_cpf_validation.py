@@ -6,7 +6,7 @@ digits computed via weighted sums of the preceding digits.
 """
 import pytest
 
-from accounts.utils import validate_cpf
+from accounts.utils import clean_cpf, validate_cpf
 
 
 class TestValidateCPF:
@@ -45,3 +45,14 @@ class TestValidateCPF:
 
     def test_none_rejected(self):
         assert validate_cpf(None) is False
+
+
+class TestCleanCPF:
+    @pytest.mark.parametrize("raw, expected", [
+        ("529.982.247-25", "52998224725"),
+        (" 52998224725 ", "52998224725"),
+        ("", ""),
+        (None, ""),
+    ])
+    def test_mask_and_whitespace_removed(self, raw, expected):
+        assert clean_cpf(raw) == expected
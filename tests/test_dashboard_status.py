@@ -0,0 +1,88 @@
+"""
+BDD tests for the dashboard agenda block (data.status) and filter options.
+
+Given OS with prova/retirada/devolução dates around today
+When the dashboard is fetched
+Then em_atraso / hoje / proximos_10_dias count each OS in the right bucket.
+"""
+from datetime import date, timedelta
+
+import pytest
+
+from service_control.api_views import ServiceOrderDashboardAPIView
+from service_control.models import ServiceOrder, ServiceOrderPhase
+
+URL = "/api/v1/service-orders/dashboard/"
+
+
+@pytest.fixture
+def agenda_orders(db, client_person, admin_user):
+    pendente, _ = ServiceOrderPhase.objects.get_or_create(name="PENDENTE")
+    aguardando, _ = ServiceOrderPhase.objects.get_or_create(name="AGUARDANDO_DEVOLUCAO")
+    recusada, _ = ServiceOrderPhase.objects.get_or_create(name="RECUSADA")
+    today = date.today()
+
+    def make(phase, **dates):
+        return ServiceOrder.objects.create(
+            renter=client_person,
+            employee=admin_user,
+            order_date=today,
+            service_order_phase=phase,
+            **dates,
+        )
+
+    make(pendente, prova_date=today)
+    make(pendente, retirada_date=today + timedelta(days=3))
+    make(aguardando, devolucao_date=today + timedelta(days=20))
+    make(aguardando, devolucao_date=today - timedelta(days=2), esta_atrasada=True)
+    make(recusada, prova_date=today - timedelta(days=5), retirada_date=today - timedelta(days=1))
+    return today
+
+
+@pytest.mark.django_db
+class TestDashboardStatus:
+    def test_agenda_buckets(self, admin_client, agenda_orders):
+        response = admin_client.get(URL)
+        assert response.status_code == 200
+        status = response.json()["data"]["status"]
+
+        assert status["hoje"] == {"provas": 1, "retiradas": 0, "devolucoes": 0}
+        assert status["proximos_10_dias"] == {"provas": 0, "retiradas": 1, "devolucoes": 0}
+        # RECUSADA com prova+retirada conta nas duas; a flag esta_atrasada soma uma devolução
+        assert status["em_atraso"] == {"provas": 1, "retiradas": 1, "devolucoes": 1}
+
+
+@pytest.mark.django_db
+class TestDashboardFilters:
+    def test_filter_options(self, admin_client, agenda_orders, admin_user):
+        ServiceOrder.objects.update(came_from="instagram", payment_method="pix")
+        ServiceOrder.objects.filter(prova_date=agenda_orders).update(renter_role="noivo")
+
+        filtros = admin_client.get(URL).json()["data"]["filtros_disponiveis"]
+        assert filtros == {
+            "atendentes": [{"id": admin_user.id, "nome": "ADMIN TEST"}],
+            "tipos_cliente": ["NOIVO"],
+            "formas_pagamento": ["PIX"],
+            "canais_origem": ["INSTAGRAM"],
+        }
+
+    def test_options_are_cached_until_an_order_changes(
+        self, agenda_orders, client_person, django_assert_num_queries
+    ):
+        view = ServiceOrderDashboardAPIView()
+        view._get_available_filters()
+        with django_assert_num_queries(0):
+            view._get_available_filters()
+
+        ServiceOrder.objects.create(
+            renter=client_person, order_date=agenda_orders, came_from="FACEBOOK"
+        )
+        assert view._get_available_filters()["canais_origem"] == ["FACEBOOK"]
+
+    def test_options_are_dropped_when_an_attendant_is_renamed(self, agenda_orders, admin_user):
+        view = ServiceOrderDashboardAPIView()
+        view._get_available_filters()
+
+        admin_user.name = "ADMIN RENOMEADO"
+        admin_user.save()
+        assert view._get_available_filters()["atendentes"][0]["nome"] == "ADMIN RENOMEADO"
@@ -0,0 +1,248 @@
+"""
+BDD tests for the event listings (/events/list-with-status/ and /events/<id>/detail/).
+
+Given events in the past, in the future and without date, with OS in
+different phases
+When the events are listed or detailed
+Then each event carries its OS count and the status derived from them.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from service_control.models import Event, EventParticipant, ServiceOrder, ServiceOrderPhase
+
+LIST_URL = "/api/v1/events/list-with-status/"
+
+
+def _detail_url(event):
+    return f"/api/v1/events/{event.id}/detail/"
+
+
+@pytest.fixture
+def events(db, client_person):
+    today = date.today()
+    past = today - timedelta(days=10)
+    phases = {
+        name: ServiceOrderPhase.objects.get_or_create(name=name)[0]
+        for name in ("FINALIZADO", "PENDENTE", "RECUSADA")
+    }
+
+    def _event(name, event_date, *phase_names):
+        event = Event.objects.create(name=name, event_date=event_date)
+        for phase_name in phase_names:
+            ServiceOrder.objects.create(
+                renter=client_person,
+                order_date=past,
+                event=event,
+                service_order_phase=phases[phase_name],
+                total_value=Decimal("100.00"),
+            )
+        return event
+
+    return {
+        "sem_data": _event("SEM DATA", None, "PENDENTE"),
+        "agendado": _event("FUTURO", today + timedelta(days=5), "PENDENTE"),
+        "sem_os": _event("PASSADO SEM OS", past),
+        "finalizado": _event("PASSADO FINALIZADO", past, "FINALIZADO", "FINALIZADO"),
+        "pendencias": _event("PASSADO PENDENTE", past, "FINALIZADO", "PENDENTE"),
+        "recusado": _event("PASSADO RECUSADO", past, "RECUSADA"),
+    }
+
+
+EXPECTED_STATUS = {
+    "sem_data": ("N/A", 1),
+    "agendado": ("AGENDADO", 1),
+    "sem_os": ("CANCELADO", 0),
+    "finalizado": ("FINALIZADO", 2),
+    "pendencias": ("POSSUI PENDÊNCIAS", 2),
+    "recusado": ("CANCELADO", 1),
+}
+
+
+@pytest.mark.django_db
+class TestEventListWithStatus:
+    def test_status_and_count_per_event(self, admin_client, events):
+        body = admin_client.get(LIST_URL).json()
+        by_id = {e["id"]: e for e in body["events"]}
+
+        assert body["count"] == len(events)
+        for key, (expected_status, expected_count) in EXPECTED_STATUS.items():
+            payload = by_id[events[key].id]
+            assert payload["status"] == expected_status, key
+            assert payload["service_orders_count"] == expected_count, key
+
+    def test_pagination_and_search(self, admin_client, events):
+        first = admin_client.get(f"{LIST_URL}?page_size=4").json()
+        second = admin_client.get(f"{LIST_URL}?page_size=4&page=2").json()
+        assert first["count"] == second["count"] == 6
+        assert first["total_pages"] == 2
+        assert len(first["events"]) == 4
+        assert len(second["events"]) == 2
+        # Mais recentes primeiro
+        assert first["events"][0]["id"] == events["recusado"].id
+
+        body = admin_client.get(f"{LIST_URL}?search=passado").json()
+        assert body["count"] == 4
+
+    def test_date_filters(self, admin_client, events):
+        today = date.today()
+        body = admin_client.get(f"{LIST_URL}?start_date={today.isoformat()}").json()
+        assert [e["id"] for e in body["events"]] == [events["agendado"].id]
+
+        body = admin_client.get(f"{LIST_URL}?end_date={today.isoformat()}").json()
+        assert body["count"] == 4
+
+    def test_invalid_date_is_rejected(self, admin_client, events):
+        response = admin_client.get(f"{LIST_URL}?start_date=31/12/2024")
+        assert response.status_code == 400
+
+    def test_query_count_does_not_grow_with_events(
+        self, admin_client, events, django_assert_max_num_queries
+    ):
+        with django_assert_max_num_queries(2):
+            assert admin_client.get(LIST_URL).status_code == 200
+
+    def test_repeated_request_is_served_from_cache(
+        self, admin_client, events, django_assert_num_queries
+    ):
+        first = admin_client.get(LIST_URL).json()
+        with django_assert_num_queries(0):
+            assert admin_client.get(LIST_URL).json() == first
+
+    def test_cache_is_invalidated_when_orders_or_events_change(self, admin_client, events):
+        event = events["pendencias"]
+        admin_client.get(LIST_URL)
+
+        finalizado = ServiceOrderPhase.objects.get(name="FINALIZADO")
+        for order in event.service_orders.all():
+            order.service_order_phase = finalizado
+            order.save()
+        by_id = {e["id"]: e for e in admin_client.get(LIST_URL).json()["events"]}
+        assert by_id[event.id]["status"] == "FINALIZADO"
+
+        event.name = "RENOMEADO"
+        event.save()
+        by_id = {e["id"]: e for e in admin_client.get(LIST_URL).json()["events"]}
+        assert by_id[event.id]["name"] == "RENOMEADO"
+
+
+@pytest.mark.django_db
+class TestEventDetail:
+    def test_status_count_and_orders(self, admin_client, events):
+        for key, (expected_status, expected_count) in EXPECTED_STATUS.items():
+            body = admin_client.get(_detail_url(events[key])).json()
+            assert body["status"] == expected_status, key
+            assert body["service_orders_count"] == expected_count, key
+            assert len(body["service_orders"]) == expected_count, key
+
+    def test_detail_loads_orders_once(
+        self, admin_client, events, django_assert_max_num_queries
+    ):
+        # Evento + OS (com fase e cliente)
+        with django_assert_max_num_queries(2):
+            assert admin_client.get(_detail_url(events["pendencias"])).status_code == 200
+
+    def test_date_updated_is_most_recent_among_event_and_orders(self, admin_client, events):
+        event = events["pendencias"]
+        order = event.service_orders.first()
+        order.date_updated = event.date_created + timedelta(days=1)
+        order.save()
+
+        body = admin_client.get(_detail_url(event)).json()
+        assert body["date_updated"].startswith(order.date_updated.isoformat()[:19])
+
+    def test_date_updated_of_event_without_orders(self, admin_client, events):
+        event = events["sem_os"]
+        body = admin_client.get(_detail_url(event)).json()
+        assert body["date_updated"].startswith(event.date_created.isoformat()[:19])
+
+
+@pytest.mark.django_db
+class TestEventAddParticipants:
+    def test_adds_only_new_existing_people(self, admin_client, admin_user, client_person):
+        event = Event.objects.create(name="CASAMENTO")
+        url = f"/api/v1/events/{event.id}/add-participants/"
+
+        body = admin_client.post(
+            url, {"participant_ids": [client_person.id, 999999]}, format="json"
+        ).json()
+        assert [p["person"]["id"] for p in body["participants"]] == [client_person.id]
+
+        # Repetir quem já participa não duplica nem falha
+        response = admin_client.post(
+            url, {"participant_ids": [client_person.id, admin_user.id]}, format="json"
+        )
+        assert response.status_code == 200
+        assert sorted(p["person"]["id"] for p in response.json()["participants"]) == sorted(
+            [client_person.id, admin_user.id]
+        )
+
+
+@pytest.mark.django_db
+class TestEventOpenList:
+    def test_lists_events_with_open_orders(self, admin_client, events):
+        body = admin_client.get("/api/v1/events/open/").json()
+        assert {e["id"] for e in body} == {
+            events[key].id for key in ("sem_data", "agendado", "pendencias")
+        }
+
+    def test_query_count_does_not_grow_with_participants(
+        self, admin_client, admin_user, client_person, events, django_assert_max_num_queries
+    ):
+        for key in ("sem_data", "agendado", "pendencias"):
+            for person in (admin_user, client_person):
+                EventParticipant.objects.create(event=events[key], person=person)
+
+        # Eventos (EXISTS) + participantes (com pessoas) + contatos
+        with django_assert_max_num_queries(3):
+            assert admin_client.get("/api/v1/events/open/").status_code == 200
+
+    def test_response_does_not_grow_with_participants(
+        self, admin_client, admin_user, attendant_user, client_person,
+        django_assert_max_num_queries,
+    ):
+        event = Event.objects.create(name="FORMATURA")
+        ids = [admin_user.id, attendant_user.id, client_person.id]
+
+        # Evento, ids válidos, INSERT, participantes (com pessoas) e contatos
+        with django_assert_max_num_queries(5):
+            response = admin_client.post(
+                f"/api/v1/events/{event.id}/add-participants/",
+                {"participant_ids": ids},
+                format="json",
+            )
+        assert len(response.json()["participants"]) == 3
+
+
+@pytest.mark.django_db
+class TestEventUpdate:
+    def test_updates_only_given_fields(self, admin_client):
+        event = Event.objects.create(
+            name="BAILE", description="Salão", event_date=date(2030, 1, 10)
+        )
+        response = admin_client.put(
+            f"/api/v1/events/{event.id}/update/", {"name": "baile de gala"}, format="json"
+        )
+        assert response.status_code == 200
+
+        event.refresh_from_db()
+        assert event.name == "BAILE DE GALA"
+        assert event.description == "Salão"
+        assert event.event_date == date(2030, 1, 10)
+        assert event.date_updated is not None
+
+    def test_response_does_not_grow_with_participants(
+        self, admin_client, admin_user, client_person, django_assert_max_num_queries
+    ):
+        event = Event.objects.create(name="BAILE")
+        for person in (admin_user, client_person):
+            EventParticipant.objects.create(event=event, person=person)
+
+        # Evento, UPDATE, participantes (com pessoas) e contatos
+        with django_assert_max_num_queries(4):
+            response = admin_client.put(
+                f"/api/v1/events/{event.id}/update/", {"name": "gala"}, format="json"
+            )
+        assert len(response.json()["participants"]) == 2
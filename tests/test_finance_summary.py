@@ -0,0 +1,177 @@
+"""
+BDD tests for the Financeiro summary (/service-orders/finance/).
+
+Given OS paid through payment_details entries and legacy OS that only have
+advance_payment / remaining_payment
+When the finance summary is fetched
+Then every payment becomes one transaction, estornos subtract, totals cover
+all transactions and only the requested page is returned.
+"""
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+
+from service_control.models import ServiceOrder, ServiceOrderPhase
+
+URL = "/api/v1/service-orders/finance/"
+
+
+@pytest.fixture
+def finance_orders(db, client_person):
+    pendente, _ = ServiceOrderPhase.objects.get_or_create(name="PENDENTE")
+    finalizado, _ = ServiceOrderPhase.objects.get_or_create(name="FINALIZADO")
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+
+    detailed = ServiceOrder.objects.create(
+        renter=client_person,
+        order_date=yesterday,
+        service_order_phase=pendente,
+        total_value=Decimal("500.00"),
+        advance_payment=Decimal("250.00"),
+        payment_method="pix",
+        payment_details=[
+            {"id": "a", "amount": 300.0, "forma_pagamento": "pix", "tipo": "sinal",
+             "data": f"{yesterday.isoformat()}T15:30:00+00:00"},
+            {"id": "b", "amount": 50.0, "forma_pagamento": "pix", "tipo": "estorno",
+             "data": f"{today.isoformat()}T00:00:00+00:00"},
+        ],
+        observations="OS detalhada",
+    )
+    legacy = ServiceOrder.objects.create(
+        client_name="Avulso",
+        order_date=today,
+        service_order_phase=finalizado,
+        total_value=Decimal("250.00"),
+        advance_payment=Decimal("150.00"),
+        payment_method="debito",
+    )
+    return {"detailed": detailed, "legacy": legacy, "today": today, "yesterday": yesterday}
+
+
+@pytest.mark.django_db
+class TestFinanceSummary:
+    def test_transactions_and_totals(self, admin_client, finance_orders):
+        body = admin_client.get(URL).json()
+        detailed = finance_orders["detailed"]
+        legacy = finance_orders["legacy"]
+
+        tx = {(t["order_id"], t["transaction_type"]): t for t in body["transactions"]}
+        assert set(tx) == {
+            (detailed.id, "sinal"),
+            (detailed.id, "estorno"),
+            (legacy.id, "sinal"),
+            (legacy.id, "restante"),
+        }
+        assert float(tx[(detailed.id, "sinal")]["amount"]) == 300.0
+        assert tx[(detailed.id, "sinal")]["time"] == "15:30:00"
+        assert tx[(detailed.id, "sinal")]["entry_id"] == "a"
+        assert float(tx[(detailed.id, "estorno")]["amount"]) == -50.0
+        assert tx[(detailed.id, "estorno")]["time"] is None
+        assert float(tx[(legacy.id, "sinal")]["amount"]) == 150.0
+        assert float(tx[(legacy.id, "restante")]["amount"]) == 100.0
+        assert tx[(legacy.id, "restante")]["client_name"] is None
+        assert tx[(legacy.id, "sinal")]["client_name"] == "Avulso"
+
+        assert body["total_transactions"] == 4
+        assert float(body["total_amount"]) == 500.0
+        assert {k: float(v) for k, v in body["totals_by_method"].items()} == {
+            "pix": 250.0,
+            "debito": 250.0,
+        }
+
+    def test_date_filter_applies_to_payment_date(self, admin_client, finance_orders):
+        today = finance_orders["today"].isoformat()
+        body = admin_client.get(f"{URL}?start_date={today}&end_date={today}").json()
+        types = sorted(t["transaction_type"] for t in body["transactions"])
+        assert types == ["estorno", "restante", "sinal"]
+        assert float(body["total_amount"]) == 200.0
+
+    def test_pagination_keeps_totals_over_all_transactions(self, admin_client, finance_orders):
+        first = admin_client.get(f"{URL}?page_size=3").json()
+        second = admin_client.get(f"{URL}?page_size=3&page=2").json()
+
+        assert first["count"] == second["count"] == 4
+        assert first["total_pages"] == 2
+        assert len(first["transactions"]) == 3
+        assert len(second["transactions"]) == 1
+        assert float(second["total_amount"]) == 500.0
+
+        # Mais recentes primeiro (data, depois hora)
+        dates = [t["date"] for t in first["transactions"] + second["transactions"]]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_query_count_does_not_grow_with_orders(
+        self, admin_client, finance_orders, client_person, django_assert_max_num_queries
+    ):
+        # OS detalhadas, restante legado, totais legados (GROUP BY) e página
+        # legada: linhas via values(), sem nenhuma query extra por OS
+        with django_assert_max_num_queries(4):
+            assert admin_client.get(URL).status_code == 200
+
+        phase = finance_orders["legacy"].service_order_phase
+        for _ in range(5):
+            ServiceOrder.objects.create(
+                renter=client_person,
+                order_date=finance_orders["yesterday"],
+                service_order_phase=phase,
+                total_value=Decimal("80.00"),
+                advance_payment=Decimal("80.00"),
+                payment_method="pix",
+            )
+        with django_assert_max_num_queries(4):
+            assert admin_client.get(URL).status_code == 200
+
+    def test_legacy_totals_are_aggregated_over_all_orders(
+        self, admin_client, finance_orders, client_person
+    ):
+        # payment_details vazio conta como OS legada; totais não dependem da página
+        ServiceOrder.objects.create(
+            renter=client_person,
+            order_date=finance_orders["yesterday"],
+            service_order_phase=finance_orders["legacy"].service_order_phase,
+            total_value=Decimal("70.00"),
+            advance_payment=Decimal("70.00"),
+            payment_details=[],
+        )
+        first = admin_client.get(f"{URL}?page_size=1").json()
+        assert first["total_transactions"] == 5
+        assert float(first["total_amount"]) == 570.0
+        assert float(first["totals_by_method"]["NÃO INFORMADO"]) == 70.0
+
+        pages = [
+            admin_client.get(f"{URL}?page_size=1&page={n}").json()["transactions"][0]
+            for n in range(1, 6)
+        ]
+        assert sorted(t["transaction_type"] for t in pages) == [
+            "estorno", "restante", "sinal", "sinal", "sinal"
+        ]
+
+    def test_returned_remaining_is_filtered_by_return_day(self, admin_client, finance_orders):
+        # data_devolvido é DateTime: o restante devolvido ontem entra no filtro de ontem
+        legacy = finance_orders["legacy"]
+        yesterday = finance_orders["yesterday"]
+        legacy.data_devolvido = datetime.combine(yesterday, time(10, 0), tzinfo=dt_timezone.utc)
+        legacy.save()
+
+        day = yesterday.isoformat()
+        body = admin_client.get(f"{URL}?start_date={day}&end_date={day}").json()
+        types = [t["transaction_type"] for t in body["transactions"] if t["order_id"] == legacy.id]
+        assert types == ["restante"]
+
+    def test_totals_are_rounded_to_cents(self, admin_client, finance_orders):
+        ServiceOrder.objects.create(
+            client_name="Avulso",
+            order_date=finance_orders["today"],
+            service_order_phase=finance_orders["legacy"].service_order_phase,
+            payment_details=[
+                {"id": "c", "amount": 0.1, "forma_pagamento": "pix", "tipo": "sinal"},
+                {"id": "d", "amount": 0.2, "forma_pagamento": "pix", "tipo": "sinal"},
+            ],
+        )
+        body = admin_client.get(URL).json()
+        assert body["total_amount"] == 500.3
+        assert body["totals_by_method"]["pix"] == 250.3
+
@@ -0,0 +1,289 @@
+"""
+BDD tests for the phase listings (/service-orders/phase/ and /service-orders/v2/phase/).
+
+Given a PENDENTE OS with client contact, address, event and items
+When the OS is listed by phase (V1 and V2)
+Then the payload carries the latest contact/address, the event data and
+the items split into roupas (itens) and acessórios.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import City, PersonsAdresses, PersonsContacts
+from products.models import Product, TemporaryProduct
+from service_control.models import (
+    Event,
+    ServiceOrder,
+    ServiceOrderItem,
+    ServiceOrderPhase,
+    bump_service_order_list_version,
+)
+
+
+@pytest.fixture
+def pending_order(db, client_person, admin_user):
+    pendente, _ = ServiceOrderPhase.objects.get_or_create(name="PENDENTE")
+    city = City.objects.create(code="3106200", name="Belo Horizonte", uf="MG")
+    PersonsContacts.objects.create(person=client_person, phone="31999990000", email="old@example.com")
+    PersonsContacts.objects.create(person=client_person, phone="31988887777", email="new@example.com")
+    PersonsAdresses.objects.create(
+        person=client_person, city=city, street="Rua A", number="10", cep="30000000", neighborhood="Centro"
+    )
+    event = Event.objects.create(name="Casamento Silva", event_date=date.today() + timedelta(days=30))
+    order = ServiceOrder.objects.create(
+        renter=client_person,
+        employee=admin_user,
+        attendant=admin_user,
+        order_date=date.today(),
+        event=event,
+        service_order_phase=pendente,
+        total_value=Decimal("400.00"),
+        advance_payment=Decimal("100.00"),
+        service_type="Aluguel",
+        payment_method="PIX",
+    )
+    paleto = TemporaryProduct.objects.create(product_type="paleto", size="50", color="Preto", brand="RG")
+    gravata = TemporaryProduct.objects.create(product_type="gravata", color="Azul", description="Seda")
+    calca = Product.objects.create(tipo="Calça", id_produto="P000001", nome_produto="Calça Slim", tamanho=42)
+    ServiceOrderItem.objects.create(service_order=order, temporary_product=paleto, adjustment_notes="Encurtar")
+    ServiceOrderItem.objects.create(service_order=order, temporary_product=gravata)
+    ServiceOrderItem.objects.create(service_order=order, product=calca)
+    return order
+
+
+def _assert_order_payload(payload, order):
+    assert payload["id"] == order.id
+    assert payload["event_name"] == "Casamento Silva"
+    assert payload["event_date"] == str(order.event.event_date)
+
+    client = payload["client"]
+    assert client["name"] == "CLIENTE TESTE"
+    assert client["person_type"]["type"] == "CLIENTE"
+    assert [c["email"] for c in client["contacts"]] == ["new@example.com"]
+    assert client["addresses"][0]["cidade"]["name"] == "Belo Horizonte"
+
+    ordem = payload["ordem_servico"]
+    itens = {i["tipo"]: i for i in ordem["itens"]}
+    assert itens["paleto"]["numero"] == "50"
+    assert itens["paleto"]["ajuste"] == "Encurtar"
+    assert itens["calça"]["numero"] == "42.00"
+    assert itens["calça"]["extras"] == "Calça Slim"
+    assert [a["tipo"] for a in ordem["acessorios"]] == ["gravata"]
+    assert ordem["pagamento"]["total"] == 400.0
+    assert ordem["pagamento"]["restante"] == 300.0
+
+
+@pytest.mark.django_db
+class TestListByPhase:
+    def test_v1_payload(self, admin_client, pending_order):
+        response = admin_client.get("/api/v1/service-orders/phase/PENDENTE/")
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body) == 1
+        _assert_order_payload(body[0], pending_order)
+
+    def test_v2_payload(self, admin_client, pending_order):
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["count"] == 1
+        assert body["total_pages"] == 1
+        _assert_order_payload(body["results"][0], pending_order)
+        assert body["results"][0]["ordem_servico"]["pagamento"]["forma_pagamento"] == "PIX"
+
+    def test_v2_search_matches_item_brand(self, admin_client, pending_order):
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/?search=RG")
+        assert response.status_code == 200
+        assert [o["id"] for o in response.json()["results"]] == [pending_order.id]
+
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/?search=inexistente")
+        assert response.json()["count"] == 0
+
+    def test_v2_search_by_contact_lists_order_once(self, admin_client, pending_order):
+        # Dois contatos com o mesmo domínio e três itens não duplicam a OS
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/?search=example.com")
+        body = response.json()
+        assert body["count"] == 1
+        assert [o["id"] for o in body["results"]] == [pending_order.id]
+
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/?search=Slim")
+        assert [o["id"] for o in response.json()["results"]] == [pending_order.id]
+
+    def test_orders_of_the_same_client_share_client_data(self, admin_client, pending_order):
+        ServiceOrder.objects.create(
+            renter=pending_order.renter,
+            order_date=date.today(),
+            service_order_phase=pending_order.service_order_phase,
+        )
+        v1 = admin_client.get("/api/v1/service-orders/phase/PENDENTE/").json()
+        v2 = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/").json()["results"]
+        for body in (v1, v2):
+            assert len(body) == 2
+            assert body[0]["client"] == body[1]["client"]
+            assert [c["email"] for c in body[1]["client"]["contacts"]] == ["new@example.com"]
+
+    def test_v2_empty_phase_short_circuits(self, admin_client, pending_order, django_assert_max_num_queries):
+        url = "/api/v1/service-orders/v2/phase/PENDENTE/"
+        admin_client.get(url)  # aquece o lock da recusa automática
+        with django_assert_max_num_queries(1):
+            body = admin_client.get(url + "?search=inexistente").json()
+        assert body == {
+            "count": 0,
+            "page": 1,
+            "page_size": 20,
+            "total_pages": 1,
+            "ordering": ["-order_date"],
+            "results": [],
+        }
+        assert admin_client.get(url + "?search=inexistente&page=2").status_code == 404
+
+    def test_v2_first_load_runs_count_and_page_only(self, admin_client, pending_order):
+        url = "/api/v1/service-orders/v2/phase/PENDENTE/"
+        admin_client.get(url)  # aquece o lock da recusa automática
+        bump_service_order_list_version()
+
+        # Sem cache: COUNT e página, sem um EXISTS (SELECT 1 ... LIMIT 1) antes
+        with CaptureQueriesContext(connection) as ctx:
+            assert admin_client.get(url).json()["count"] == 1
+        order_queries = [q["sql"] for q in ctx.captured_queries if 'FROM "service_orders"' in q["sql"]]
+        assert len(order_queries) == 2
+        assert "COUNT(" in order_queries[0]
+
+    @pytest.mark.parametrize("page_size", [20, 100])
+    def test_v2_row_error_is_a_json_500(self, admin_client, pending_order, page_size):
+        # OS sem cliente quebra a montagem da linha: o erro precisa virar o
+        # 500 JSON da view em qualquer tamanho de página, nunca um corpo truncado
+        ServiceOrder.objects.create(
+            renter=None,
+            order_date=date.today(),
+            service_order_phase=pending_order.service_order_phase,
+        )
+        response = admin_client.get(f"/api/v1/service-orders/v2/phase/PENDENTE/?page_size={page_size}")
+
+        assert response.status_code == 500
+        assert not response.streaming
+        assert response.json()["error"].startswith("Erro ao listar OS (v2)")
+
+    def test_v2_ordering_keeps_only_allowed_fields(self, admin_client, pending_order):
+        url = "/api/v1/service-orders/v2/phase/PENDENTE/"
+        body = admin_client.get(url + "?ordering=-total_value, renter__cpf,id").json()
+        assert body["ordering"] == ["-total_value", "id"]
+
+        body = admin_client.get(url + "?ordering=--order_date").json()
+        assert body["ordering"] == ["-order_date"]
+        assert body["count"] == 1
+
+    def test_v2_query_count_does_not_grow_with_orders(self, admin_client, pending_order):
+        """Sem lazy load de campos adiados (only) nem N+1 por OS."""
+        url = "/api/v1/service-orders/v2/phase/PENDENTE/"
+        admin_client.get(url)  # aquece o lock da recusa automática
+        bump_service_order_list_version()  # força o COUNT nas duas medições
+        with CaptureQueriesContext(connection) as one_order:
+            admin_client.get(url)
+
+        extra = ServiceOrder.objects.get(pk=pending_order.pk)
+        extra.pk = None
+        extra.save()
+        for item in pending_order.items.all():
+            ServiceOrderItem.objects.create(
+                service_order=extra,
+                temporary_product=item.temporary_product,
+                product=item.product,
+            )
+
+        with CaptureQueriesContext(connection) as two_orders:
+            response = admin_client.get(url)
+        assert response.json()["count"] == 2
+        assert len(two_orders) == len(one_order)
+
+    def test_v2_count_is_cached_until_an_order_changes(self, admin_client, pending_order):
+        url = "/api/v1/service-orders/v2/phase/PENDENTE/"
+        assert admin_client.get(url).json()["count"] == 1
+
+        # update() em massa não invalida: o count cacheado é reaproveitado
+        ServiceOrder.objects.filter(pk=pending_order.pk).update(is_virtual=True)
+        assert admin_client.get(url).json()["count"] == 1
+
+        # save() troca a versão das listagens e o COUNT é refeito
+        pending_order.refresh_from_db()
+        pending_order.save()
+        assert admin_client.get(url).json()["count"] == 0
+
+    def test_v2_cached_count_depends_on_the_date_field(self, admin_client, pending_order):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+        # Nome fora do mapa de campos de data: filter_date não filtra
+        body = admin_client.get(f"/api/v1/service-orders/v2/phase/pendente/?filter_date={yesterday}").json()
+        assert body["count"] == 1
+
+        # Mesma fase e filter_date, mas filtrando order_date: outro count
+        body = admin_client.get(f"/api/v1/service-orders/v2/phase/PENDENTE/?filter_date={yesterday}").json()
+        assert body["count"] == 0
+
+    def test_detail_and_client_listing_build_the_same_items(self, admin_client, pending_order):
+        listed = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/").json()
+        expected = listed["results"][0]["ordem_servico"]
+
+        detail = admin_client.get(f"/api/v1/service-orders/{pending_order.id}/").json()
+        by_client = admin_client.get(
+            f"/api/v1/service-orders/renter/{pending_order.renter_id}/"
+        ).json()
+
+        for ordem in (detail["ordem_servico"], by_client[0]["ordem_servico"]):
+            assert ordem["itens"] == expected["itens"]
+            assert ordem["acessorios"] == expected["acessorios"]
+
+
+@pytest.mark.django_db
+class TestPhaseSweeps:
+    def test_aguardando_retirada_flags_are_synced(self, admin_client, client_person):
+        """
+        Given AGUARDANDO_RETIRADA orders with stale esta_atrasada flags
+        When the phase is listed
+        Then late orders are flagged and on-time ones are cleared
+        """
+        fase, _ = ServiceOrderPhase.objects.get_or_create(name="AGUARDANDO_RETIRADA")
+        today = date.today()
+        passed_event = Event.objects.create(name="Formatura", event_date=today - timedelta(days=1))
+        late_by_date = ServiceOrder.objects.create(
+            renter=client_person, order_date=today, service_order_phase=fase,
+            retirada_date=today - timedelta(days=1),
+        )
+        late_by_event = ServiceOrder.objects.create(
+            renter=client_person, order_date=today, service_order_phase=fase, event=passed_event,
+        )
+        on_time = ServiceOrder.objects.create(
+            renter=client_person, order_date=today, service_order_phase=fase,
+            retirada_date=today + timedelta(days=2), esta_atrasada=True,
+        )
+
+        response = admin_client.get("/api/v1/service-orders/v2/phase/AGUARDANDO_RETIRADA/")
+        assert response.status_code == 200
+
+        flags = dict(ServiceOrder.objects.values_list("id", "esta_atrasada"))
+        assert flags == {late_by_date.id: True, late_by_event.id: True, on_time.id: False}
+
+    def test_pending_order_with_past_event_is_refused(self, admin_client, client_person):
+        """
+        Given a PENDENTE order whose event already happened and was never picked up
+        When any phase listing runs
+        Then the order is moved to RECUSADA with the automatic justification
+        """
+        pendente, _ = ServiceOrderPhase.objects.get_or_create(name="PENDENTE")
+        recusada, _ = ServiceOrderPhase.objects.get_or_create(name="RECUSADA")
+        event = Event.objects.create(name="Baile", event_date=date.today() - timedelta(days=3))
+        order = ServiceOrder.objects.create(
+            renter=client_person, order_date=date.today(), service_order_phase=pendente, event=event,
+        )
+
+        response = admin_client.get("/api/v1/service-orders/v2/phase/PENDENTE/")
+        assert response.status_code == 200
+        assert response.json()["count"] == 0
+
+        order.refresh_from_db()
+        assert order.service_order_phase == recusada
+        assert order.justification_refusal == "Cliente não retirou o produto"
@@ -10,6 +10,11 @@ Item #6: Edit OS date cascades to ALL payment entries
     Given an OS with sinal and restante in payment_details
     When user edits data_pedido
     Then ALL payment entries' `data` field move to the new date
+
+remaining_payment on partial saves
+    Given an OS saved with update_fields
+    When advance_payment is among the fields
+    Then remaining_payment is recomputed and written too
 """
 from datetime import date, timedelta
 from decimal import Decimal
@@ -173,3 +178,25 @@ class TestOrderDateCascadesToPayments:
             assert entry["data"].startswith("2026-03-20"), (
                 f"Entry {entry} didn't move to 2026-03-20"
             )
+
+
+@pytest.mark.django_db
+class TestRemainingPayment:
+    def test_remaining_follows_partial_saves(self, client_person):
+        order = ServiceOrder.objects.create(
+            renter=client_person,
+            order_date=date(2026, 3, 10),
+            total_value=500,
+            advance_payment=100,
+        )
+        assert order.remaining_payment == 400
+
+        order.advance_payment = 300
+        order.save(update_fields=["advance_payment"])
+        order.refresh_from_db()
+        assert order.remaining_payment == 200
+
+        order.observations = "sem mudança de valores"
+        order.save(update_fields=["observations"])
+        order.refresh_from_db()
+        assert order.remaining_payment == 200
@@ -0,0 +1,121 @@
+"""
+BDD tests for the reception triage (/service-orders/pre-triage/).
+
+Given a client arriving at the store with contact and address data
+When the reception creates the pre-OS
+Then the client, contact, address and a PENDENTE order are created.
+"""
+import warnings
+
+import pytest
+from django.core.cache import CacheKeyWarning
+from django.db import transaction
+
+from accounts.models import City, Person, PersonsAdresses, PersonType, person_type_by_name
+from service_control.api_views import _city_id_by_name
+from service_control.models import ServiceOrder, ServiceOrderPhase
+
+URL = "/api/v1/service-orders/pre-triage/"
+
+
+@pytest.fixture
+def city(db):
+    return City.objects.create(code="3106200", name="BELO HORIZONTE", uf="MG")
+
+
+def _payload(**overrides):
+    payload = {
+        "cliente_nome": "Maria Teste",
+        "cpf": "111.444.777-35",
+        "telefone": "31999990000",
+        "email": "maria@example.com",
+        "endereco": {"cidade": "Belo Horizonte", "rua": "Rua A", "numero": "10"},
+        "papel_evento": "noiva",
+        "origem": "instagram",
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.django_db
+class TestPreTriage:
+    def test_creates_pending_order_with_address(self, admin_client, city):
+        ServiceOrderPhase.objects.create(name="PENDENTE")
+
+        response = admin_client.post(URL, _payload(), format="json")
+        assert response.status_code == 201, response.json()
+
+        order = ServiceOrder.objects.get(id=response.json()["order_id"])
+        assert order.service_order_phase.name == "PENDENTE"
+        assert order.renter.cpf == "11144477735"
+        assert PersonsAdresses.objects.get(person=order.renter).city_id == city.id
+
+    def test_city_lookup_is_cached(
+        self, admin_client, city, django_assert_num_queries
+    ):
+        ServiceOrderPhase.objects.create(name="PENDENTE")
+        admin_client.post(URL, _payload(), format="json")
+
+        with django_assert_num_queries(0):
+            assert _city_id_by_name("belo horizonte ") == city.id
+
+    def test_city_cache_key_is_backend_safe(self, city):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            assert _city_id_by_name("Belo Horizonte") == city.id
+
+    def test_invalid_event_writes_nothing(self, admin_client, city):
+        response = admin_client.post(URL, _payload(event_id=999999), format="json")
+
+        assert response.status_code == 400
+        assert not Person.objects.filter(cpf="11144477735").exists()
+        assert not ServiceOrder.objects.exists()
+
+    def test_type_and_phase_lookups_are_cached(
+        self, admin_client, attendant_user, city, django_assert_max_num_queries
+    ):
+        ServiceOrderPhase.objects.create(name="PENDENTE")
+        PersonType.objects.create(type="CLIENTE")
+        admin_client.post(URL, _payload(), format="json")
+
+        # Atendente, cliente já existente (busca com lock), contato, endereço,
+        # OS e resposta (contatos de todas as pessoas numa query), sem voltar
+        # a consultar PersonType, fase ou cidade
+        with django_assert_max_num_queries(9):
+            response = admin_client.post(
+                URL, _payload(atendente_id=attendant_user.id), format="json"
+            )
+        assert response.status_code == 201
+        assert ServiceOrder.objects.filter(renter__cpf="11144477735").count() == 2
+
+    def test_new_client_skips_duplicate_checks(
+        self, admin_client, city, django_assert_max_num_queries
+    ):
+        ServiceOrderPhase.objects.create(name="PENDENTE")
+        PersonType.objects.create(type="CLIENTE")
+        admin_client.post(URL, _payload(cpf=""), format="json")
+
+        # Pessoa nova (sem CPF): sem SELECTs de contato/endereço existentes
+        with django_assert_max_num_queries(8):
+            response = admin_client.post(URL, _payload(cpf=""), format="json")
+        assert response.status_code == 201
+        assert PersonsAdresses.objects.count() == 2
+
+
+@pytest.mark.django_db
+class TestPersonTypeCache:
+    def test_type_created_in_a_rolled_back_transaction_is_not_cached(self):
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                person_type_by_name("CLIENTE")
+                raise RuntimeError
+
+        assert not PersonType.objects.filter(type="CLIENTE").exists()
+        person_type = person_type_by_name("CLIENTE")
+        assert PersonType.objects.filter(pk=person_type.pk, type="CLIENTE").exists()
+
+    def test_existing_type_is_cached(self, django_assert_num_queries):
+        PersonType.objects.create(type="CLIENTE")
+        person_type_by_name("CLIENTE")
+        with django_assert_num_queries(0):
+            assert person_type_by_name("CLIENTE").type == "CLIENTE"
@@ -0,0 +1,29 @@
+"""
+Tests for roupadegala.renderers.ORJSONRenderer.
+
+Given a payload with the types the listings return (Decimal, date, aware datetime, None)
+When it is rendered with ORJSONRenderer and with DRF's JSONRenderer
+Then both produce the same bytes.
+"""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+from roupadegala.renderers import ORJSONRenderer
+
+
+def test_orjson_renderer_matches_drf_json_renderer():
+    payload = {
+        "id": 1,
+        "total_value": Decimal("400.00"),
+        "order_date": date(2026, 4, 19),
+        "date_created": datetime(2026, 4, 19, 12, 30, 5, 123456, tzinfo=timezone.utc),
+        "client": {"name": "João", "contacts": []},
+        "data_recusa": None,
+    }
+    assert ORJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+
+def test_orjson_renderer_renders_none_as_empty_body():
+    assert ORJSONRenderer().render(None) == b""
@@ -0,0 +1,29 @@
+"""
+BDD tests for the ServiceOrderItem product constraint.
+
+Given an OS item
+When it points at both a catalogue product and a temporary product
+Then the database rejects it.
+"""
+from datetime import date
+
+import pytest
+from django.db import IntegrityError
+
+from products.models import Product, TemporaryProduct
+from service_control.models import ServiceOrder, ServiceOrderItem
+
+
+@pytest.mark.django_db
+class TestSingleProduct:
+    def test_item_with_both_products_is_rejected(self, client_person):
+        order = ServiceOrder.objects.create(renter=client_person, order_date=date.today())
+        product = Product.objects.create(tipo="Calça", id_produto="P000001")
+        temporary = TemporaryProduct.objects.create(product_type="calca")
+
+        ServiceOrderItem.objects.create(service_order=order, product=product)
+        ServiceOrderItem.objects.create(service_order=order, temporary_product=temporary)
+        with pytest.raises(IntegrityError):
+            ServiceOrderItem.objects.create(
+                service_order=order, product=product, temporary_product=temporary
+            )
@@ -0,0 +1,74 @@
+"""
+BDD tests for the plain service-order listing (/service-orders/).
+
+Given several orders, each with event, people and items
+When the orders are listed
+Then the nested data comes from a fixed number of queries.
+"""
+from datetime import date
+
+import pytest
+
+from products.models import Product, TemporaryProduct
+from service_control.models import Event, ServiceOrder, ServiceOrderItem, ServiceOrderPhase
+
+URL = "/api/v1/service-orders/"
+
+
+@pytest.fixture
+def orders(db, client_person, admin_user, attendant_user):
+    pendente = ServiceOrderPhase.objects.create(name="PENDENTE")
+    event = Event.objects.create(name="CASAMENTO", event_date=date(2030, 5, 4))
+    created = []
+    for i in range(3):
+        order = ServiceOrder.objects.create(
+            renter=client_person,
+            employee=attendant_user,
+            attendant=admin_user,
+            order_date=date.today(),
+            event=event if i else None,
+            service_order_phase=pendente,
+        )
+        ServiceOrderItem.objects.create(
+            service_order=order,
+            product=Product.objects.create(tipo="Calça", id_produto=f"P00000{i}"),
+        )
+        ServiceOrderItem.objects.create(
+            service_order=order,
+            temporary_product=TemporaryProduct.objects.create(product_type="paleto"),
+        )
+        created.append(order)
+    return created
+
+
+@pytest.mark.django_db
+class TestServiceOrderList:
+    def test_event_fields(self, admin_client, orders):
+        by_id = {o["id"]: o for o in admin_client.get(URL).json()["results"]}
+
+        assert by_id[orders[0].id]["event_date"] is None
+        assert by_id[orders[0].id]["event_name"] is None
+        assert by_id[orders[1].id]["event_date"] == "2030-05-04"
+        assert by_id[orders[1].id]["event_name"] == "CASAMENTO"
+        assert len(by_id[orders[1].id]["items"]) == 2
+
+    def test_query_count_does_not_grow_with_orders(
+        self, admin_client, orders, django_assert_max_num_queries
+    ):
+        # Contagem, OS (com evento, pessoas e fase) e itens (com produtos e
+        # cores no mesmo SELECT)
+        with django_assert_max_num_queries(3):
+            assert admin_client.get(URL).status_code == 200
+
+    def test_phase_is_rendered_as_id_and_name(self, admin_client, orders):
+        payload = admin_client.get(URL).json()["results"][0]
+        phase = orders[0].service_order_phase
+        assert payload["service_order_phase"] == {"id": phase.id, "name": "PENDENTE"}
+
+    def test_people_are_summarized(self, admin_client, orders, client_person):
+        payload = admin_client.get(URL).json()["results"][0]
+        assert payload["renter"] == {
+            "id": client_person.id,
+            "name": "CLIENTE TESTE",
+            "cpf": "52998224725",
+        }
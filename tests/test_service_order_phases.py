@@ -4,7 +4,7 @@ Tests for service order phase transitions (see ADR-0003).
 import pytest
 
 from accounts.models import PersonType, Person
-from service_control.models import ServiceOrder, ServiceOrderPhase
+from service_control.models import ServiceOrder, ServiceOrderPhase, phase_by_name
 
 
 @pytest.mark.django_db
@@ -44,3 +44,21 @@ class TestPhaseTransitions:
         """TODO: create a Venda OS in AGUARDANDO_RETIRADA, call mark-retrieved,
         verify phase becomes FINALIZADO (not AGUARDANDO_DEVOLUCAO)."""
         pytest.skip("scaffold — fixture setup needed")
+
+
+@pytest.mark.django_db
+class TestPhaseCache:
+    def test_lookup_is_cached_until_phases_change(self, django_assert_num_queries):
+        phase = ServiceOrderPhase.objects.create(name="PENDENTE")
+        assert phase_by_name("PENDENTE") == phase
+        with django_assert_num_queries(0):
+            assert phase_by_name("PENDENTE") == phase
+
+        phase.name = "PENDENTE_OLD"
+        phase.save()
+        assert phase_by_name("PENDENTE") is None
+
+    def test_missing_phase_is_not_cached(self):
+        assert phase_by_name("RECUSADA") is None
+        recusada = ServiceOrderPhase.objects.create(name="RECUSADA")
+        assert phase_by_name("RECUSADA") == recusada
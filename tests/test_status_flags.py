@@ -0,0 +1,123 @@
+"""
+BDD tests for the ServiceOrder model helpers (status predicates, __str__).
+
+Given OS with prova/retirada/devolução dates around today in open and
+closed phases
+When the flags are annotated in SQL with with_status_flags()
+Then they match the per-instance is_atrasada / is_hoje /
+is_proximos_10_dias / tipo_evento results, and the stored esta_atrasada
+flag is recomputed in bulk.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from service_control.models import ServiceOrder, ServiceOrderPhase
+
+
+@pytest.fixture
+def orders(db, client_person):
+    today = timezone.now().date()
+    pendente, _ = ServiceOrderPhase.objects.get_or_create(name="PENDENTE")
+    finalizado, _ = ServiceOrderPhase.objects.get_or_create(name="FINALIZADO")
+
+    def _order(phase, **dates):
+        return ServiceOrder.objects.create(
+            renter=client_person, order_date=today, service_order_phase=phase, **dates
+        )
+
+    return [
+        _order(pendente, devolucao_date=today - timedelta(days=1)),
+        _order(finalizado, devolucao_date=today - timedelta(days=1)),
+        _order(pendente, prova_date=today),
+        _order(pendente, retirada_date=today, devolucao_date=today + timedelta(days=3)),
+        _order(pendente, devolucao_date=today + timedelta(days=11)),
+        _order(None, devolucao_date=today - timedelta(days=1)),
+        _order(pendente),
+    ]
+
+
+def _plain_flags(order):
+    return (
+        bool(order.is_atrasada()),
+        bool(order.is_hoje()),
+        bool(order.is_proximos_10_dias()),
+        order.tipo_evento(),
+    )
+
+
+@pytest.mark.django_db
+class TestStatusFlags:
+    def test_annotated_flags_match_instance_methods(self, orders):
+        expected = {
+            order.id: _plain_flags(ServiceOrder.objects.get(id=order.id))
+            for order in orders
+        }
+        annotated = ServiceOrder.objects.with_status_flags()
+
+        assert {order.id: _plain_flags(order) for order in annotated} == expected
+        assert [expected[order.id] for order in orders] == [
+            (True, False, False, "devolucao"),
+            (False, False, False, "devolucao"),
+            (False, True, False, "prova"),
+            (False, True, True, "retirada"),
+            (False, False, False, "devolucao"),
+            (False, False, False, "devolucao"),
+            (False, False, False, "outro"),
+        ]
+
+    def test_annotated_flags_need_no_extra_queries(
+        self, orders, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            flags = [_plain_flags(order) for order in ServiceOrder.objects.with_status_flags()]
+        assert len(flags) == len(orders)
+
+    def test_today_can_be_passed_in(self, orders):
+        order = ServiceOrder.objects.get(id=orders[0].id)
+        yesterday = order.devolucao_date
+        assert order.is_atrasada()
+        assert not order.is_atrasada(today=yesterday)
+        assert order.is_hoje(today=yesterday)
+
+
+
+@pytest.mark.django_db
+class TestSyncEstaAtrasada:
+    def test_flag_follows_retirada_and_event_dates(
+        self, client_person, django_assert_num_queries
+    ):
+        today = timezone.now().date()
+        phase, _ = ServiceOrderPhase.objects.get_or_create(name="AGUARDANDO_RETIRADA")
+
+        def _order(**fields):
+            return ServiceOrder.objects.create(
+                renter=client_person, order_date=today, service_order_phase=phase, **fields
+            )
+
+        late = _order(retirada_date=today - timedelta(days=1))
+        stale_flag = _order(retirada_date=today + timedelta(days=1), esta_atrasada=True)
+        on_time = _order(retirada_date=today)
+
+        # Duas UPDATEs, sem SELECT/save por OS
+        with django_assert_num_queries(2):
+            ServiceOrder.objects.filter(service_order_phase=phase).sync_esta_atrasada(today)
+
+        flags = dict(ServiceOrder.objects.values_list("id", "esta_atrasada"))
+        assert flags == {late.id: True, stale_flag.id: False, on_time.id: False}
+
+
+@pytest.mark.django_db
+class TestServiceOrderStr:
+    def test_virtual_order_without_renter_uses_client_name(self, django_assert_num_queries):
+        order = ServiceOrder.objects.create(
+            order_date=timezone.now().date(), client_name="Avulso", is_virtual=True
+        )
+        with django_assert_num_queries(0):
+            assert str(order) == f"OS {order.id} - Avulso"
+
+    def test_selected_renter_is_not_fetched_again(self, orders, django_assert_num_queries):
+        order = ServiceOrder.objects.select_related("renter").get(id=orders[0].id)
+        with django_assert_num_queries(0):
+            assert str(order) == f"OS {order.id} - CLIENTE TESTE"
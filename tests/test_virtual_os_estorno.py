@@ -74,3 +74,20 @@ class TestVirtualOSEstorno:
         ]
         assert len(estorno_txs) >= 1
         assert float(estorno_txs[0]["amount"]) == -50.0
+
+    def test_payment_method_lists_each_form_once_in_launch_order(self, admin_client):
+        payload = {
+            "client_name": "CLIENTE TESTE",
+            "total_value": 300,
+            "sinal": {"amount": 100.0, "forma_pagamento": "PIX"},
+            "restante": {"amount": 200.0, "forma_pagamento": "DEBITO"},
+            "estorno": {"amount": 20.0, "forma_pagamento": "PIX"},
+        }
+        response = admin_client.post(
+            "/api/v1/service-orders/virtual/", payload, format="json"
+        )
+        assert response.status_code == 201, response.content
+
+        os = ServiceOrder.objects.get(id=response.json()["service_order_id"])
+        assert os.payment_method == "PIX, DEBITO"
+        assert os.advance_payment == Decimal("280.00")